@@ -0,0 +1,255 @@
+#######################################################################################################################
+#######################################################################################################################
+# Title:        Python Electric Vehicle Power Toolkit (PyEVPowerKit)
+# Topic:        EV Modeling
+# File:         catalog
+# Date:         18.03.2024
+# Author:       Dr. Pascal A. Schirmer
+# Version:      V.0.1
+# Copyright:    Pascal Schirmer
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+# Function Description
+#######################################################################################################################
+"""
+These functions implement the run catalog, a local SQLite file (results/catalog.db) indexing the saved results. At
+save time every run is added with the hash of its setup, the names of the inputs (simulation, mission profile, setup
+file, architecture), the key performance indicators (KPI) of dataTime and dataLife, and the names of the result files,
+such that runs can be filtered and ranked without loading the result files. Every KPI is a column of the table 'runs'
+(new KPIs are added as columns on first use, missing values are NULL).
+
+KPIs:
+- Mission profile:  duration 'T' (sec), distance 's' (km), HVS energy 'E' (kWh), consumption 'eta' (kWh/100km), final
+                    'SOC' (p.u.), losses 'Pv_<comp>' (kWh), and peak temperatures 'Tmax_<comp>' (degC)
+- Lifetime:         lifetime 'L_<comp>_<model>' (hrs or cycles) and damage 'D_<comp>_<model>' (p.u.) of the worst axle
+- Performance:      top speed 'Vmax' (km/h) and acceleration times 't_<v>' (sec)
+- Forward:          maximum and rms speed error 'err_max' and 'err_rms' (km/h)
+
+Fnc:
+1)  getKey:     hash of the setup (identical inputs have identical hashes)
+2)  getKpi:     key performance indicators of a run
+3)  addRun:     adds a run to the catalog
+4)  queryRun:   filters and ranks the runs of the catalog
+
+"""
+
+#######################################################################################################################
+# Import libs
+#######################################################################################################################
+# ==============================================================================
+# Internal
+# ==============================================================================
+from src.model.classRec import getTs
+
+# ==============================================================================
+# External
+# ==============================================================================
+from os.path import join as pjoin
+from datetime import datetime
+import pandas as pd
+import numpy as np
+import hashlib
+import sqlite3
+import json
+import re
+
+
+#######################################################################################################################
+# Additional Functions
+#######################################################################################################################
+def getKey(setup):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function returns the hash of the setup (parameters, data, and experiment without the name of the simulation
+    and the plotting and saving options).
+    """
+
+    Exp = {x: setup['Exp'][x] for x in setup['Exp'] if x not in ['name', 'plot', 'plotAxis', 'save']}
+    key = json.dumps({'Par': setup['Par'], 'Dat': setup['Dat'], 'Exp': Exp}, sort_keys=True,
+                     default=lambda x: x.tolist() if hasattr(x, 'tolist') else str(x))
+
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def getKpi(dataTime, dataLife, setup):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function returns the key performance indicators of a run (see above). The time dependent variables can be at
+    the sampling rate or decimated (classRec), the window means are weighted with the length of the windows.
+    """
+
+    # ==============================================================================
+    # Initialisation
+    # ==============================================================================
+    kpi = {}
+    K = len(dataTime['VEH']['v'])
+    w = getTs(dataTime, setup)
+    peak = dataTime['REC']['max'] if 'REC' in dataTime else dataTime
+
+    # ==============================================================================
+    # Mission Profile
+    # ==============================================================================
+    if K > 0:
+        kpi['T'] = np.sum(w)
+        kpi['s'] = dataTime['VEH']['s'][-1] / 1000
+        kpi['E'] = np.sum(dataTime['HVS']['Pin'] * w) / 3.6e6
+        kpi['eta'] = kpi['E'] / kpi['s'] * 100 if kpi['s'] > 0 else np.nan
+        kpi['SOC'] = dataTime['HVS']['SOC'][-1]
+        for comp in ['GBX', 'EMA', 'INV', 'HVS']:
+            val = dataTime[comp] if comp == 'HVS' else dataTime[comp]['T']
+            kpi['Pv_' + comp] = np.sum(val['Pv'] * w) / 3.6e6
+            kpi['Tmax_' + comp] = np.max(peak[comp]['T'] if comp == 'HVS' else peak[comp]['T']['T'])
+
+    # ==============================================================================
+    # Lifetime
+    # ==============================================================================
+    for comp in ['GBX', 'EMA', 'INV', 'HVS']:
+        if comp not in dataLife:
+            continue
+        for model in ['Arr', 'Cof', 'Pro']:
+            res = [dataLife[comp][model]] if comp == 'HVS' else [dataLife[comp][ax][model] for ax in ['F', 'R']]
+            res = [x for x in res if x]
+            if res:
+                kpi['L_' + comp + '_' + model] = min(x['L'] for x in res)
+                kpi['D_' + comp + '_' + model] = max(x['D'] for x in res)
+
+    # ==============================================================================
+    # Performance and Forward Simulation
+    # ==============================================================================
+    if 'PERF' in dataTime:
+        kpi['Vmax'] = dataTime['PERF']['Vmax']
+        for v, t in zip(dataTime['PERF']['v'], dataTime['PERF']['t']):
+            kpi['t_' + str(int(v))] = t
+    if 'FWD' in dataTime:
+        kpi['err_max'] = dataTime['FWD']['err']['max']
+        kpi['err_rms'] = dataTime['FWD']['err']['rms']
+
+    # ==============================================================================
+    # Return
+    # ==============================================================================
+    return {x: float(kpi[x]) for x in kpi}
+
+
+#######################################################################################################################
+# Adding
+#######################################################################################################################
+def addRun(dataTime, dataLife, files, path, setup):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function adds a run to the catalog under results/catalog.db.
+
+    Input:
+    1) dataTime:    time dependent data
+    2) dataLife:    lifetime data
+    3) files:       names of the result files (time and lifetime)
+    4) path:        all path variables
+    5) setup:       includes all simulation variables
+
+    Output:
+    1) id:          id of the run in the catalog
+    """
+
+    # ==============================================================================
+    # Initialisation
+    # ==============================================================================
+    row = {'date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"), 'key': getKey(setup), 'name': setup['Exp']['name'],
+           'dat': setup['Dat']['name'], 'par': setup['Par']['name'], 'xwd': setup['Par']['xwd'],
+           'fid': setup['Exp']['fid'], 'fs': setup['Dat']['fs'], 'fileTime': files[0], 'fileLife': files[1]}
+    row.update(getKpi(dataTime, dataLife, setup))
+
+    # ==============================================================================
+    # Calculation
+    # ==============================================================================
+    con = sqlite3.connect(pjoin(path['resPath'], 'catalog.db'))
+    with con:
+        con.execute("CREATE TABLE IF NOT EXISTS runs (id INTEGER PRIMARY KEY AUTOINCREMENT, date TEXT, key TEXT, "
+                    "name TEXT, dat TEXT, par TEXT, xwd TEXT, fid INTEGER, fs REAL, fileTime TEXT, fileLife TEXT)")
+        col = [x[1] for x in con.execute("PRAGMA table_info(runs)")]
+        for x in row:
+            if x not in col:
+                con.execute('ALTER TABLE runs ADD COLUMN "' + x + '" REAL')
+        cur = con.execute('INSERT INTO runs (' + ', '.join('"' + x + '"' for x in row) + ') VALUES (' +
+                          ', '.join('?' * len(row)) + ')', list(row.values()))
+    con.close()
+
+    # ==============================================================================
+    # Return
+    # ==============================================================================
+    print("INFO: Run added to the catalog (id ", cur.lastrowid, ")")
+
+    return cur.lastrowid
+
+
+#######################################################################################################################
+# Query
+#######################################################################################################################
+def queryRun(path, where=None, order=None, limit=None, col=None):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function filters and ranks the runs of the catalog without loading the result files.
+
+    Input:
+    1) path:    all path variables
+    2) where:   filter as dict of column: value or column: (operator, value), e.g. {'xwd': 'RWD', 'eta': ('<', 16)}
+    3) order:   ranking as column name, descending with a leading '-', e.g. '-L_INV_Cof'
+    4) limit:   maximum number of runs
+    5) col:     columns to return (all if None)
+
+    Output:
+    1) runs:    DataFrame of the runs
+    """
+
+    # ==============================================================================
+    # Initialisation
+    # ==============================================================================
+    for x in list(col or []) + ([order.lstrip('-')] if order else []):
+        if not re.fullmatch(r'\w+', x):
+            raise ValueError("ERROR: Invalid column " + str(x))
+    sql = 'SELECT ' + (', '.join('"' + x + '"' for x in col) if col else '*') + ' FROM runs'
+    arg = []
+
+    # ==============================================================================
+    # Filter and Ranking
+    # ==============================================================================
+    if where:
+        cond = []
+        for x, val in where.items():
+            [op, val] = val if isinstance(val, tuple) else ('=', val)
+            if not re.fullmatch(r'\w+', x) or op not in ['=', '!=', '<', '<=', '>', '>=', 'LIKE']:
+                raise ValueError("ERROR: Invalid filter " + str(x) + " " + str(op))
+            cond.append('"' + x + '" ' + op + ' ?')
+            arg.append(val)
+        sql = sql + ' WHERE ' + ' AND '.join(cond)
+    if order:
+        sql = sql + ' ORDER BY "' + order.lstrip('-') + '"' + (' DESC' if order.startswith('-') else ' ASC')
+    if limit:
+        sql = sql + ' LIMIT ' + str(int(limit))
+
+    # ==============================================================================
+    # Calculation
+    # ==============================================================================
+    con = sqlite3.connect(pjoin(path['resPath'], 'catalog.db'))
+    runs = pd.read_sql_query(sql, con, params=arg)
+    con.close()
+
+    # ==============================================================================
+    # Return
+    # ==============================================================================
+    return runs
+
+#######################################################################################################################
+# References
+#######################################################################################################################
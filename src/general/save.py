@@ -17,7 +17,7 @@
 # Function Description
 #######################################################################################################################
 """
-This function saves the results to a .mat file under /results.
+This function saves the results to a .mat file under /results and adds the run to the run catalog (see catalog).
 Inputs:     1) dataTime:    time dependent data
             2) path:        all path variables
             3) setup:       includes all simulation variables
@@ -30,6 +30,7 @@ Outputs:    None
 # ==============================================================================
 # Internal
 # ==============================================================================
+from src.general.catalog import addRun
 
 # ==============================================================================
 # External
@@ -86,6 +87,11 @@ def save(dataTime, dataLife, path, setup):
     # ==============================================================================
     os.chdir(path['basePath'])
 
+    # ==============================================================================
+    # Catalog
+    # ==============================================================================
+    addRun(dataTime, dataLife, [resultTime, resultLife], path, setup)
+
     ###################################################################################################################
     # MSG Out
     ###################################################################################################################
@@ -83,54 +83,191 @@ def getCycles(data, setup):
     return setup
 
 
+#######################################################################################################################
+# Get drive-train topology
+#######################################################################################################################
+def getTopo(setup):
+    print("INFO: Calculating drive-train topology")
+
+    # ==============================================================================
+    # Driven axles
+    # ==============================================================================
+    if setup['Par']['xwd'] == 'RWD':
+        axle = ['R']
+    elif setup['Par']['xwd'] == 'FWD':
+        axle = ['F']
+    else:
+        axle = ['F', 'R']
+
+    # ==============================================================================
+    # Motor units
+    # ==============================================================================
+    # ------------------------------------------
+    # Default (one unit per driven axle)
+    # ------------------------------------------
+    if not setup['Par'].get('Mot'):
+        setup['Par']['Mot'] = [{'axle': x} for x in axle]
+
+    # ------------------------------------------
+    # Completing units
+    # ------------------------------------------
+    Mot = []
+    for unit in setup['Par']['Mot']:
+        nAxle = len([x for x in setup['Par']['Mot'] if x['axle'] == unit['axle']])
+        iAxle = len([x for x in Mot if x['axle'] == unit['axle']]) + 1
+        name = unit['axle'] if nAxle == 1 else unit['axle'] + str(iAxle)
+        Mot.append({'name': unit.get('name', name), 'axle': unit['axle'], 'share': unit.get('share', 1 / nAxle),
+                    **{comp: {**setup['Par'][comp], **unit.get(comp, {})} for comp in ['GBX', 'EMA', 'INV']}})
+        if unit['axle'] not in axle:
+            print("WARN: Motor unit on non-driven axle ", unit['axle'], " receives no wheel torque")
+
+    # ------------------------------------------
+    # Torque shares
+    # ------------------------------------------
+    for ax in set(unit['axle'] for unit in Mot):
+        share = sum(unit['share'] for unit in Mot if unit['axle'] == ax)
+        if abs(share - 1) > 1e-6:
+            raise ValueError("ERROR: Torque shares of the motor units on axle " + ax + " sum to " + str(share))
+
+    setup['Par']['Mot'] = Mot
+    setup['Par']['axle'] = [x for x in ['F', 'R'] if any(unit['axle'] == x for unit in Mot)]
+    setup['Par']['axleIdle'] = [x for x in ['F', 'R'] if x not in setup['Par']['axle']]
+
+    print("DONE: Motor units are: ", [unit['name'] for unit in Mot])
+
+    return setup
+
+
+#######################################################################################################################
+# Init Output Channels
+#######################################################################################################################
+def initChan():
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    Aggregation of the motor unit channels onto the axles (F, R) and the total (T) values. 'sum' is used for extensive
+    quantities (torque, power, losses, currents) and 'max' for the hotspot temperature, both reduced over all motor
+    units. 'drv' is used for intensive quantities (speed, efficiency, voltage) averaging the units on each axle and the
+    driven axles for the total. Axles without motor units hold the idle values (zero, eta=1, lam=Psi, T=Tc).
+    """
+
+    chan = {'GBX': {'T': 'max', 'M': 'sum', 'n': 'drv', 'Pin': 'sum', 'Pout': 'sum', 'Pv': 'sum', 'Pv_B': 'sum',
+                    'Pv_M': 'sum', 'Pv_W': 'sum', 'eta': 'drv'},
+            'EMA': {'T': 'max', 'M': 'sum', 'n': 'drv', 'Pm': 'sum', 'Pin': 'sum', 'Pout': 'sum', 'Pv': 'sum',
+                    'Pv_m': 'sum', 'Pv_s': 'sum', 'Pv_r': 'sum', 'eta': 'drv', 'PF': 'drv', 'Id': 'sum', 'Iq': 'sum',
+                    'Is': 'sum', 'Vd': 'drv', 'Vq': 'drv', 'Vs': 'drv', 'lam': 'drv', 'Min': 'sum', 'Msh': 'sum'},
+            'INV': {'T': 'max', 'Pin': 'sum', 'Pout': 'sum', 'Pv': 'sum', 'Pv_sw': 'sum', 'Pv_cap': 'sum',
+                    'Pv_ac': 'sum', 'Pv_dc': 'sum', 'eta': 'drv', 'Idc': 'sum', 'Ic': 'sum', 'Is': 'sum',
+                    'Mi': 'drv'}}
+
+    return chan
+
+
 #######################################################################################################################
 # Init Output Variables
 #######################################################################################################################
-def initOutVar(N, Tinit):
+def initOutVar(N, Tinit, nMot=2, K=None):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function initialises the time dependent variables. The vehicle level (VEH, WHE) has the N samples of the
+    mission profile, the HVS and the components (GBX, EMA, INV) have K samples, i.e. all samples (K = N) or a ring
+    buffer of the decimated recording (see classRec).
+    """
+
+    # ==============================================================================
+    # Init
+    # ==============================================================================
+    K = N if K is None else K
+
+    # ==============================================================================
+    # Vehicle and HVS
+    # ==============================================================================
     dataTime = {'VEH': {'Vdc': np.zeros(N), 'Tc': np.zeros(N), 'SOC': np.zeros(N), 'dQ': np.zeros(N),
                         'F': {}, 'P': {}, 'E': {}, 'eta': {}, 'a': np.zeros(N), 'v': np.zeros(N), 's': np.zeros(N)},
                 'WHE': {'F': {}, 'R': {}},
-                'GBX': {'F': {'T': Tinit * np.ones(N), 'M': np.zeros(N), 'n': np.zeros(N), 'Pin': np.zeros(N),
-                              'Pout': np.zeros(N), 'Pv': np.zeros(N), 'Pv_B': np.zeros(N), 'Pv_M': np.zeros(N),
-                              'Pv_W': np.zeros(N), 'eta': np.zeros(N)},
-                        'R': {'T': Tinit * np.ones(N), 'M': np.zeros(N), 'n': np.zeros(N), 'Pin': np.zeros(N),
-                              'Pout': np.zeros(N), 'Pv': np.zeros(N), 'Pv_B': np.zeros(N), 'Pv_M': np.zeros(N),
-                              'Pv_W': np.zeros(N), 'eta': np.zeros(N)},
-                        'T': {'T': Tinit * np.ones(N), 'M': np.zeros(N), 'n': np.zeros(N), 'Pin': np.zeros(N),
-                              'Pout': np.zeros(N), 'Pv': np.zeros(N), 'Pv_B': np.zeros(N), 'Pv_M': np.zeros(N),
-                              'Pv_W': np.zeros(N), 'eta': np.zeros(N)}},
-                'EMA': {'F': {'T': Tinit * np.ones(N), 'M': np.zeros(N), 'n': np.zeros(N), 'Pm': np.zeros(N),
-                              'Pin': np.zeros(N), 'Pout': np.zeros(N), 'Pv': np.zeros(N), 'Pv_m': np.zeros(N),
-                              'Pv_s': np.zeros(N), 'Pv_r': np.zeros(N), 'eta': np.zeros(N), 'PF': np.zeros(N),
-                              'Id': np.zeros(N), 'Iq': np.zeros(N), 'Is': np.zeros(N), 'Vd': np.zeros(N),
-                              'Vq': np.zeros(N), 'Vs': np.zeros(N), 'lam': np.zeros(N), 'Min': np.zeros(N),
-                              'Msh': np.zeros(N)},
-                        'R': {'T': Tinit * np.ones(N), 'M': np.zeros(N), 'n': np.zeros(N), 'Pm': np.zeros(N),
-                              'Pin': np.zeros(N), 'Pout': np.zeros(N), 'Pv': np.zeros(N), 'Pv_m': np.zeros(N),
-                              'Pv_s': np.zeros(N), 'Pv_r': np.zeros(N), 'eta': np.zeros(N), 'PF': np.zeros(N),
-                              'Id': np.zeros(N), 'Iq': np.zeros(N), 'Is': np.zeros(N), 'Vd': np.zeros(N),
-                              'Vq': np.zeros(N), 'Vs': np.zeros(N), 'lam': np.zeros(N), 'Min': np.zeros(N),
-                              'Msh': np.zeros(N)},
-                        'T': {'T': Tinit * np.ones(N), 'M': np.zeros(N), 'n': np.zeros(N), 'Pm': np.zeros(N),
-                              'Pin': np.zeros(N), 'Pout': np.zeros(N), 'Pv': np.zeros(N), 'Pv_m': np.zeros(N),
-                              'Pv_s': np.zeros(N), 'Pv_r': np.zeros(N), 'eta': np.zeros(N), 'PF': np.zeros(N),
-                              'Id': np.zeros(N), 'Iq': np.zeros(N), 'Is': np.zeros(N), 'Vd': np.zeros(N),
-                              'Vq': np.zeros(N), 'Vs': np.zeros(N), 'lam': np.zeros(N), 'Min': np.zeros(N),
-                              'Msh': np.zeros(N)}},
-                'INV': {'F': {'T': Tinit * np.ones(N), 'Pin': np.zeros(N), 'Pout': np.zeros(N), 'Pv': np.zeros(N),
-                              'Pv_sw': np.zeros(N), 'Pv_cap': np.zeros(N), 'Pv_ac': np.zeros(N), 'Pv_dc': np.zeros(N),
-                              'eta': np.zeros(N), 'Idc': np.zeros(N), 'Ic': np.zeros(N), 'Is': np.zeros(N),
-                              'Mi': np.zeros(N)},
-                        'R': {'T': Tinit * np.ones(N), 'Pin': np.zeros(N), 'Pout': np.zeros(N), 'Pv': np.zeros(N),
-                              'Pv_sw': np.zeros(N), 'Pv_cap': np.zeros(N), 'Pv_ac': np.zeros(N), 'Pv_dc': np.zeros(N),
-                              'eta': np.zeros(N), 'Idc': np.zeros(N), 'Ic': np.zeros(N), 'Is': np.zeros(N),
-                              'Mi': np.zeros(N)},
-                        'T': {'T': Tinit * np.ones(N), 'Pin': np.zeros(N), 'Pout': np.zeros(N), 'Pv': np.zeros(N),
-                              'Pv_sw': np.zeros(N), 'Pv_cap': np.zeros(N), 'Pv_ac': np.zeros(N), 'Pv_dc': np.zeros(N),
-                              'eta': np.zeros(N), 'Idc': np.zeros(N), 'Ic': np.zeros(N), 'Is': np.zeros(N),
-                              'Mi': np.zeros(N)}},
-                'HVS': {'T': Tinit * np.ones(N), 'dQ': np.zeros(N), 'SOC': np.zeros(N), 'Vdc': np.zeros(N),
-                        'Pin': np.zeros(N), 'Pout': np.zeros(N), 'Pv': np.zeros(N), 'eta': np.zeros(N),
-                        'Idc': np.zeros(N)}}
+                'HVS': {'T': Tinit * np.ones(K), 'dQ': np.zeros(K), 'SOC': np.zeros(K), 'Vdc': np.zeros(K),
+                        'Pin': np.zeros(K), 'Pout': np.zeros(K), 'Pv': np.zeros(K), 'eta': np.zeros(K),
+                        'Idc': np.zeros(K)}}
+
+    # ==============================================================================
+    # GBX, EMA, and INV
+    # ==============================================================================
+    # ------------------------------------------
+    # Axles (F, R) and Total (T)
+    # ------------------------------------------
+    chan = initChan()
+    for comp in chan:
+        dataTime[comp] = {}
+        for ax in ['F', 'R', 'T']:
+            dataTime[comp][ax] = {name: (Tinit * np.ones(K) if name == 'T' else np.zeros(K)) for name in chan[comp]}
+
+        # ------------------------------------------
+        # Motor Units (U)
+        # ------------------------------------------
+        dataTime[comp]['U'] = {name: (Tinit * np.ones((K, nMot)) if name == 'T' else np.zeros((K, nMot)))
+                               for name in chan[comp]}
+
+    return dataTime
+
+
+#######################################################################################################################
+# Aggregate Motor Units
+#######################################################################################################################
+def calcAxle(dataTime, setup, idx=slice(None), idxVeh=None):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function derives the axle (F, R) and total (T) channels from the motor unit channels (U) using the reductions
+    of initChan(), i.e. the reduction per axle and the basis of the total (all motor units 'U' or the driven axles). It
+    is evaluated once after the mission profile (idx covers all samples) as vectorized reductions over the motor unit
+    axis, a single sample or a slice can be passed as well. For a ring buffer (see classRec) idxVeh are the samples of
+    the vehicle level (coolant temperature of idle axles) corresponding to idx.
+    """
+
+    # ==============================================================================
+    # Init
+    # ==============================================================================
+    chan = initChan()
+    Mot = setup['Par']['Mot']
+    axle = setup['Par']['axle']
+    idle = setup['Par']['axleIdle']
+    units = {ax: [u for u in range(len(Mot)) if Mot[u]['axle'] == ax] for ax in axle}
+    fnc = {'sum': (np.sum, 'U'), 'max': (np.max, 'U'), 'drv': (np.mean, 'axle')}
+    idxVeh = idx if idxVeh is None else idxVeh
+
+    # ==============================================================================
+    # Calculation
+    # ==============================================================================
+    for comp in chan:
+        for name, agg in chan[comp].items():
+            val = dataTime[comp]['U'][name][idx]
+
+            # ------------------------------------------
+            # Axles
+            # ------------------------------------------
+            for ax in axle:
+                dataTime[comp][ax][name][idx] = fnc[agg][0](val[..., units[ax]], axis=-1)
+
+            # ------------------------------------------
+            # Idle Axles
+            # ------------------------------------------
+            for ax in idle:
+                if name == 'T':
+                    dataTime[comp][ax][name][idx] = dataTime['VEH']['Tc'][idxVeh]
+                elif name == 'eta':
+                    dataTime[comp][ax][name][idx] = 1
+                elif name == 'lam':
+                    dataTime[comp][ax][name][idx] = setup['Par']['EMA']['Psi_pm']
+
+            # ------------------------------------------
+            # Total
+            # ------------------------------------------
+            if fnc[agg][1] == 'axle':
+                val = np.stack([dataTime[comp][ax][name][idx] for ax in axle], axis=-1)
+            dataTime[comp]['T'][name][idx] = fnc[agg][0](val, axis=-1)
 
     return dataTime
@@ -31,26 +31,21 @@ from src.data.loadData import loadData
 from src.data.loadSetup import loadSetup
 from src.data.sampleData import sampleData
 from src.general.mechVehPara import mechVehPara
-from src.general.smallFnc import initOutVar
-from src.model.Veh.mechVeh import mechVeh
-from src.model.Veh.mechWhe import mechWhe
-from src.model.Veh.elecVeh import elecVeh
-from src.model.Veh.therVeh import therVeh
-from src.model.initComp import initComp
-from src.model.mechSim import mechSim
+from src.general.smallFnc import getCycles
+from src.general.smallFnc import getTopo
+from src.model.cycSim import initVeh
+from src.model.runSim import runSim
+from src.model.classRec import getData
 from src.plot.plotting import plotting
-from src.model.elecSim import elecSim
-from src.model.therSim import therSim
-from src.model.vehSim import vehSim
 from src.general.save import save
-from src.general.smallFnc import getCycles
+from src.model.classHist import getHist
 from src.model.reliaSim import reliaSim
-
+from src.model.reliaSys import reliaSys
+from src.model.reliaMix import saveDmg
 
 # ==============================================================================
 # External
 # ==============================================================================
-from tqdm import tqdm
 
 
 #######################################################################################################################
@@ -143,6 +138,11 @@ def main(setup, path):
     # ------------------------------------------
     setup = mechVehPara(setup)
 
+    # ------------------------------------------
+    # Architecture
+    # ------------------------------------------
+    setup = getTopo(setup)
+
     # ==============================================================================
     # MSG OUT
     # ==============================================================================
@@ -161,11 +161,6 @@ def main(setup, path):
     print("START: Driving Simulation")
     print("=======================================================================")
 
-    # ==============================================================================
-    # Init
-    # ==============================================================================
-    dataTime = initOutVar(len(data['t']), data['T_C'][0])
-
     # ==============================================================================
     # Vehicle
     # ==============================================================================
@@ -177,23 +172,9 @@ def main(setup, path):
     print("------------------------------------------")
 
     # ------------------------------------------
-    # Mechanical
+    # Mechanical, Electrical, and Thermal
     # ------------------------------------------
-    # Vehicle
-    dataTime = mechVeh(data, dataTime, setup)
-
-    # Wheels
-    dataTime = mechWhe(data, dataTime, setup)
-
-    # ------------------------------------------
-    # Electrical
-    # ------------------------------------------
-    [data, dataTime] = elecVeh(data, dataTime, setup)
-
-    # ------------------------------------------
-    # Thermal
-    # ------------------------------------------
-    [data, dataTime] = therVeh(data, dataTime, setup)
+    [data, dataTime] = initVeh(data, setup)
 
     # ==============================================================================
     # Components
@@ -206,25 +187,9 @@ def main(setup, path):
     print("------------------------------------------")
 
     # ------------------------------------------
-    # Init Components
-    # ------------------------------------------
-    [GBX, EMA, INV, HVS, VEH] = initComp(setup)
-
-    # ------------------------------------------
-    # Iterative Simulation
+    # Start
     # ------------------------------------------
-    for iter in tqdm(range(len(data['t'])), desc='Mission Profile'):
-        # Mechanical
-        dataTime = mechSim(iter, GBX, EMA, dataTime, setup)
-
-        # Electrical
-        dataTime = elecSim(iter, EMA, INV, HVS, dataTime, setup)
-
-        # Thermal
-        dataTime = therSim(iter, GBX, EMA, INV, HVS, VEH, data, dataTime, setup)
-
-        # Vehicle
-        dataTime = vehSim(iter, VEH, data, dataTime, setup)
+    [data, dataTime, [GBX, EMA, INV, HVS, VEH], dataHist, dataDmg] = runSim(data, dataTime, path, setup)
 
     # ==============================================================================
     # MSG OUT
@@ -255,9 +220,40 @@ def main(setup, path):
     print("------------------------------------------")
 
     # ------------------------------------------
-    # Start
+    # Map-Based, Performance, and Forward Simulation (no temperatures)
     # ------------------------------------------
-    dataLife = reliaSim(GBX, EMA, INV, HVS, dataTime, setup)
+    if setup['Exp']['fid'] != 2:
+        dataLife = {}
+        print("INFO: Reliability disabled for the map-based, performance, and forward simulation")
+
+    # ------------------------------------------
+    # Time-Domain Simulation
+    # ------------------------------------------
+    else:
+        # ------------------------------------------
+        # Start
+        # ------------------------------------------
+        [dataLife, dataDmg] = reliaSim(GBX, EMA, INV, HVS, dataTime, setup, dataDmg)
+
+        # ------------------------------------------
+        # System (Monte-Carlo)
+        # ------------------------------------------
+        if setup['Exp']['mc'] == 1:
+            dataLife['SYS'] = reliaSys(dataLife, dataTime, setup)
+        else:
+            print("INFO: System Monte-Carlo disabled")
+
+        # ------------------------------------------
+        # Load Spectra
+        # ------------------------------------------
+        if dataHist is not None:
+            dataLife['HIST'] = getHist(dataHist)
+
+        # ------------------------------------------
+        # Caching (mission mix)
+        # ------------------------------------------
+        if setup['Exp']['cache'] == 1:
+            saveDmg(dataDmg, data, path, setup)
 
     # ==============================================================================
     # Saving
@@ -291,7 +287,7 @@ def main(setup, path):
     # Start
     # ------------------------------------------
     if setup['Exp']['plot'] != 0:
-        plotting(data, dataTime, dataLife, setup)
+        plotting(getData(data, dataTime), dataTime, dataLife, setup)
     else:
         print("INFO: Plotting disabled")
 
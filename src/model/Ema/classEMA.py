@@ -21,6 +21,8 @@ Fnc:
 2)  calc_loss:  calculates the losses based on the mechanical and electrical parameters
 3)  calc_elec:  calculates the electrical parameters of the machine
 4)  calc_ther:  calculates the self-heating based on the thermal parameters and the losses
+5)  calc_env:   calculates the full-load torque envelope (motoring and generating) of the machine
+6)  calc_lim:   limits the torque to the full-load torque envelope
 
 """
 
@@ -30,6 +32,7 @@ Fnc:
 # ==============================================================================
 # Internal
 # ==============================================================================
+from src.model.calcTher import calcTher
 
 # ==============================================================================
 # External
@@ -84,6 +87,7 @@ class classPSM:
         self.beta = beta
         self.CL = CL
         self.Bx = Bx
+        self.env = {}
 
     ###################################################################################################################
     # Mechanics
@@ -706,6 +710,143 @@ class classPSM:
         # ==============================================================================
         return erg
 
+    ###################################################################################################################
+    # Envelope
+    ###################################################################################################################
+    def calc_env(self, Vdc, T, setup):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function calculates the full-load torque envelope (inner torque) of the machine over the speed for a
+        DC-link voltage and temperature. For each current angle in the field-weakening half plane (id <= 0) the feasible
+        current magnitudes (current limit and voltage limit of calcEMA_MTPA_num) form an interval that is calculated in
+        closed form, and the torque is maximised (motoring) or minimised (generating) on it. The optimal current angle
+        is first located on a grid and then refined by golden-section search between the neighbouring grid angles, such
+        that the envelope is exact up to the tolerance of the search.
+
+        Input:
+        1) Vdc:     DC-link voltage (V)
+        2) T:       Hotspot temperature of the machine (degC)
+        3) setup:   Setup variables
+
+        Output:
+        1) env:     speed nodes (1/s), motoring and generating torque (Nm)
+        """
+
+        # ==============================================================================
+        # Init
+        # ==============================================================================
+        Rs = self.R_s * (1 + 0.00393 * (T - 20))
+        v_max = Vdc / np.sqrt(3) - Rs * self.I_max
+        n = np.linspace(0, self.n_max, setup['Exp']['envN'])
+        w_e = 2 * np.pi * n[:, None] * self.p
+        phi = np.linspace(np.pi / 2, 3 * np.pi / 2, 181)
+        dphi = phi[1] - phi[0]
+        g = (np.sqrt(5) - 1) / 2
+
+        # ==============================================================================
+        # Torque on the boundary of the feasible currents (per speed and current angle)
+        # ==============================================================================
+        def calcM(phi, sign):
+            # ------------------------------------------
+            # Feasible current magnitudes |v(r)| <= v_max, r <= I_max
+            # ------------------------------------------
+            c = np.cos(phi)
+            s = np.sin(phi)
+            A = Rs * c - w_e * self.L_q * s
+            B = Rs * s + w_e * self.L_d * c
+            a = A ** 2 + B ** 2
+            b = B * w_e * self.Psi
+            d = b ** 2 - a * ((w_e * self.Psi) ** 2 - v_max ** 2)
+            r1 = np.maximum((-b - np.sqrt(np.maximum(d, 0))) / a, 0)
+            r2 = np.minimum((-b + np.sqrt(np.maximum(d, 0))) / a, self.I_max)
+            ok = (d >= 0) & (r1 <= r2)
+
+            # ------------------------------------------
+            # Torque at the interval limits and at the vertex of M(r)
+            # ------------------------------------------
+            k = (self.L_d - self.L_q) * c
+            rv = np.clip(-self.Psi / (2 * np.where(k != 0, k, np.inf)), r1, r2)
+            M = [3 / 2 * self.p * s * (self.Psi * r + k * r ** 2) * sign for r in [r1, r2, rv]]
+
+            return np.where(ok, np.max(M, axis=0), 0)
+
+        # ==============================================================================
+        # Calculation
+        # ==============================================================================
+        out = {}
+        for sign in [1, -1]:
+            # ------------------------------------------
+            # Grid of current angles
+            # ------------------------------------------
+            x = phi[np.argmax(calcM(phi[None, :], sign), axis=1)][:, None]
+            lo = x - dphi
+            hi = x + dphi
+
+            # ------------------------------------------
+            # Golden-section refinement (the grid angle is kept if the search does not improve it)
+            # ------------------------------------------
+            for _ in range(40):
+                x1 = hi - g * (hi - lo)
+                x2 = lo + g * (hi - lo)
+                up = calcM(x1, sign) < calcM(x2, sign)
+                lo = np.where(up, x1, lo)
+                hi = np.where(up, hi, x2)
+            out[sign] = sign * np.maximum(calcM(0.5 * (lo + hi), sign), calcM(x, sign)).ravel()
+
+        # ==============================================================================
+        # Return
+        # ==============================================================================
+        return {'n': n, 'Mmot': out[1], 'Mgen': out[-1]}
+
+    def calc_lim(self, n_Ema, M_Ema, Vdc, T, setup):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function limits the inner torque of the machine to the full-load torque envelope. The envelopes are
+        calculated on first use and stored on a grid of DC-link voltages (step setup['Exp']['envDv']) and temperatures
+        (step setup['Exp']['envDt']), the limit is interpolated bilinearly between the four neighbouring envelopes.
+
+        Input:
+        1) n_Ema:   Rotational speed of the machine (1/s)
+        2) M_Ema:   Inner torque of the machine (Nm)
+        3) Vdc:     DC-link voltage (V)
+        4) T:       Hotspot temperature of the machine (degC)
+        5) setup:   Setup variables
+
+        Output:
+        1) M_Ema:   Limited inner torque of the machine (Nm)
+        """
+
+        # ==============================================================================
+        # Init
+        # ==============================================================================
+        [dv, dt] = [setup['Exp']['envDv'], setup['Exp']['envDt']]
+        [iv, it] = [int(np.floor(Vdc / dv)), int(np.floor(T / dt))]
+        [wv, wt] = [Vdc / dv - iv, T / dt - it]
+
+        # ==============================================================================
+        # Calculation
+        # ==============================================================================
+        Mmot = 0
+        Mgen = 0
+        for (kv, kt, w) in [(0, 0, (1 - wv) * (1 - wt)), (1, 0, wv * (1 - wt)), (0, 1, (1 - wv) * wt),
+                            (1, 1, wv * wt)]:
+            if w == 0:
+                continue
+            key = (iv + kv, it + kt)
+            if key not in self.env:
+                self.env[key] = self.calc_env(key[0] * dv, key[1] * dt, setup)
+            Mmot = Mmot + w * np.interp(abs(n_Ema), self.env[key]['n'], self.env[key]['Mmot'])
+            Mgen = Mgen + w * np.interp(abs(n_Ema), self.env[key]['n'], self.env[key]['Mgen'])
+
+        # ==============================================================================
+        # Return
+        # ==============================================================================
+        return min(Mmot, max(Mgen, M_Ema))
+
     ###################################################################################################################
     # Electrical
     ###################################################################################################################
@@ -790,6 +931,12 @@ class classPSM:
             Pv_fric = 0
             M_in = M_Ema
 
+        # ------------------------------------------
+        # Envelope
+        # ------------------------------------------
+        if setup['Exp']['lim'] == 1 and setup['Exp']['env'] == 1:
+            M_in = self.calc_lim(n_Ema, M_in, Vdc, T, setup)
+
         # ==============================================================================
         # Calculation
         # ==============================================================================
@@ -855,6 +1002,49 @@ class classPSM:
         # ------------------------------------------
         # Power
         # ------------------------------------------
+        [Pin, eta, PF] = self.calc_pow(Pout, Pv, Vs, Is)
+
+        # ------------------------------------------
+        # Torque
+        # ------------------------------------------
+        if n_Ema != 0:
+            Mshaft = Min - Pv_fric / w_m
+        else:
+            Mshaft = Min
+
+        # ==============================================================================
+        # Return
+        # ==============================================================================
+        return [id, iq, Is, vd, vq, Vs, lam_s, Pin, Pout, Pv, eta, PF, Min, Mshaft]
+
+    ###################################################################################################################
+    # Power
+    ###################################################################################################################
+    def calc_pow(self, Pout, Pv, Vs, Is):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function calculates the input power, efficiency, and power factor of the machine.
+
+        Input:
+        1) Pout:    Output power (W)
+        2) Pv:      Total losses (W)
+        3) Vs:      Stator voltage (V)
+        4) Is:      Stator current (A)
+
+        Output:
+        1) Pin:     Input power (W)
+        2) eta:     Efficiency (%)
+        3) PF:      Power factor (-)
+        """
+
+        # ==============================================================================
+        # Calculation
+        # ==============================================================================
+        # ------------------------------------------
+        # Power
+        # ------------------------------------------
         # Driving
         if Pout >= 0:
             Pin = Pout + Pv
@@ -866,14 +1056,6 @@ class classPSM:
             else:
                 Pin = -1e-12
 
-        # ------------------------------------------
-        # Torque
-        # ------------------------------------------
-        if n_Ema != 0:
-            Mshaft = Min - Pv_fric / w_m
-        else:
-            Mshaft = Min
-
         # ------------------------------------------
         # Efficiency
         # ------------------------------------------
@@ -897,7 +1079,7 @@ class classPSM:
         # ==============================================================================
         # Return
         # ==============================================================================
-        return [id, iq, Is, vd, vq, Vs, lam_s, Pin, Pout, Pv, eta, PF, Min, Mshaft]
+        return [Pin, eta, PF]
 
     ###################################################################################################################
     # Losses
@@ -976,7 +1158,7 @@ class classPSM:
     ###################################################################################################################
     # Thermal
     ###################################################################################################################
-    def calc_therm(self, dt, T, Pv1, Pv2):
+    def calc_therm(self, dt, T, Pv1, Pv2, dis=1):
         # ==============================================================================
         # Description
         # ==============================================================================
@@ -988,6 +1170,7 @@ class classPSM:
         2) T:       Temperature of the previous time step (degC)
         3) Pv1:     Losses of the previous time step (W)
         4) Pv2:     Losses of the actual time step (W)
+        5) dis:     Discretization (1: bilinear, 2: exact, see calcTher)
 
         Output:
         1) dT:      Temperature change (K)
@@ -996,13 +1179,12 @@ class classPSM:
         # ==============================================================================
         # Initialisation
         # ==============================================================================
-        tau = self.R_th * self.C_th
-        Rth = self.R_th
+        [a, b1, b2] = calcTher(self.R_th, self.C_th, dt, dis)
 
         # ==============================================================================
         # Calculation
         # ==============================================================================
-        dT = (2 * tau - dt) / (2 * tau + dt) * T + (Rth * dt) / (2 * tau + dt) * (Pv1 + Pv2)
+        dT = a * T + b1 * Pv1 + b2 * Pv2
 
         # ==============================================================================
         # Return
@@ -29,6 +29,7 @@ Fnc:
 # ==============================================================================
 # Internal
 # ==============================================================================
+from src.model.calcTher import calcTher
 
 # ==============================================================================
 # External
@@ -272,7 +273,7 @@ class classB6:
     ###################################################################################################################
     # Thermal
     ###################################################################################################################
-    def calc_therm(self, dt, Tc, Pv1, Pv2):
+    def calc_therm(self, dt, Tc, Pv1, Pv2, dis=1):
         # ==============================================================================
         # Description
         # ==============================================================================
@@ -284,6 +285,7 @@ class classB6:
         2) T:       Temperature of the previous time step (degC)
         3) Pv1:     Losses of the previous time step (W)
         4) Pv2:     Losses of the actual time step (W)
+        5) dis:     Discretization (1: bilinear, 2: exact, see calcTher)
 
         Output:
         1) dT:      Temperature change (K)
@@ -292,13 +294,12 @@ class classB6:
         # ==============================================================================
         # Initialisation
         # ==============================================================================
-        tau = self.R_th * self.C_th
-        Rth = self.R_th
+        [a, b1, b2] = calcTher(self.R_th, self.C_th, dt, dis)
 
         # ==============================================================================
         # Calculation
         # ==============================================================================
-        dT = (2 * tau - dt) / (2 * tau + dt) * Tc + (Rth * dt) / (2 * tau + dt) * (Pv1 + Pv2)
+        dT = a * Tc + b1 * Pv1 + b2 * Pv2
 
         # ==============================================================================
         # Return
@@ -0,0 +1,94 @@
+#######################################################################################################################
+#######################################################################################################################
+# Title:        Python Electric Vehicle Power Toolkit (PyEVPowerKit)
+# Topic:        EV Modeling
+# File:         classDrv
+# Date:         18.03.2024
+# Author:       Dr. Pascal A. Schirmer
+# Version:      V.0.1
+# Copyright:    Pascal Schirmer
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+# Function Description
+#######################################################################################################################
+"""
+Class of the driver model (speed tracking) of the forward simulation. The driver is a PI controller on the speed error
+with a feed-forward of the wheel torque required by the mission profile. The gains are normalised to the vehicle, i.e.
+the proportional and integral parts are accelerations scaled by the equivalent mass and the wheel radius. All states
+are arrays, such that a batch of vehicles and mission profiles is controlled in one step.
+
+Fnc:
+1)  calc_ctrl:  calculates the wheel torque request and updates the integrator (conditional anti-windup)
+
+"""
+
+#######################################################################################################################
+# Import libs
+#######################################################################################################################
+# ==============================================================================
+# Internal
+# ==============================================================================
+
+# ==============================================================================
+# External
+# ==============================================================================
+import numpy as np
+
+
+#######################################################################################################################
+# Class
+#######################################################################################################################
+class classDrv:
+    ###################################################################################################################
+    # Constructor
+    ###################################################################################################################
+    def __init__(self, Kp, Ki, N):
+        self.Kp = Kp
+        self.Ki = Ki
+        self.x = np.zeros(N)
+
+    ###################################################################################################################
+    # Control
+    ###################################################################################################################
+    def calc_ctrl(self, e, M_ff, M_max, k, dt):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function calculates the wheel torque request of the driver. The request is limited to the drivetrain
+        envelope (motoring), braking is not limited (friction brakes). The integrator is only updated if the request
+        is not saturated or the error reduces the request.
+
+        Input:
+        1) e:       Speed error (m/s)
+        2) M_ff:    Feed-forward wheel torque (Nm)
+        3) M_max:   Maximum wheel torque of the drivetrain (Nm)
+        4) k:       Equivalent mass times wheel radius (kg*m)
+        5) dt:      Discrete time step (sec)
+
+        Output:
+        1) M:       Wheel torque (Nm)
+        2) sat:     Saturation of the request (bool)
+        """
+
+        # ==============================================================================
+        # Calculation
+        # ==============================================================================
+        M = M_ff + k * (self.Kp * e + self.Ki * self.x)
+        sat = M > M_max
+
+        # ==============================================================================
+        # Anti-Windup
+        # ==============================================================================
+        self.x = np.where(sat & (e > 0), self.x, self.x + e * dt)
+
+        # ==============================================================================
+        # Return
+        # ==============================================================================
+        return [np.minimum(M, M_max), sat]
+
+#######################################################################################################################
+# References
+#######################################################################################################################
@@ -0,0 +1,94 @@
+#######################################################################################################################
+#######################################################################################################################
+# Title:        Python Electric Vehicle Power Toolkit (PyEVPowerKit)
+# Topic:        EV Modeling
+# File:         calcTher
+# Date:         18.03.2024
+# Author:       Dr. Pascal A. Schirmer
+# Version:      V.0.1
+# Copyright:    Pascal Schirmer
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+# Function Description
+#######################################################################################################################
+"""
+This function calculates the discretization coefficients of the first-order thermal model (R_th, C_th) of a component,
+which is shared by the thermal calculation of all components (calc_therm). The temperature rise is updated as
+
+    dT(k) = a * dT(k-1) + b1 * Pv(k-1) + b2 * Pv(k)
+
+with the bilinear (Tustin) discretization (dis = 1) or the exact discretization for losses varying linearly between
+the samples (first-order hold, dis = 2). The latter is exact for constant and ramped losses and stable for any time
+step, i.e. coarse time steps remain accurate. The coefficients are stored per node and time step.
+
+Inputs:     1) R_th:    thermal resistance (K/W)
+            2) C_th:    thermal capacitance (Ws/K)
+            3) dt:      discrete time step (sec)
+            4) dis:     discretization (1: bilinear, 2: exact)
+Outputs:    1) a:       coefficient of the previous temperature rise
+            2) b1:      coefficient of the losses of the previous sample
+            3) b2:      coefficient of the losses of the current sample
+
+"""
+
+#######################################################################################################################
+# Import libs
+#######################################################################################################################
+# ==============================================================================
+# Internal
+# ==============================================================================
+
+# ==============================================================================
+# External
+# ==============================================================================
+from functools import lru_cache
+import numpy as np
+
+
+#######################################################################################################################
+# Additional Functions
+#######################################################################################################################
+
+
+#######################################################################################################################
+# Main Function
+#######################################################################################################################
+@lru_cache(maxsize=None)
+def calcTher(R_th, C_th, dt, dis=1):
+    ###################################################################################################################
+    # Initialisation
+    ###################################################################################################################
+    tau = R_th * C_th
+
+    ###################################################################################################################
+    # Calculation
+    ###################################################################################################################
+    # ==============================================================================
+    # Exact (first-order hold)
+    # ==============================================================================
+    if dis == 2:
+        a = np.exp(-dt / tau)
+        b1 = R_th * (tau / dt * (1 - a) - a)
+        b2 = R_th * (1 - tau / dt * (1 - a))
+
+    # ==============================================================================
+    # Bilinear (Tustin)
+    # ==============================================================================
+    else:
+        a = (2 * tau - dt) / (2 * tau + dt)
+        b1 = (R_th * dt) / (2 * tau + dt)
+        b2 = b1
+
+    ###################################################################################################################
+    # Return
+    ###################################################################################################################
+    return [a, b1, b2]
+
+#######################################################################################################################
+# References
+#######################################################################################################################
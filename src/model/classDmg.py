@@ -0,0 +1,717 @@
+#######################################################################################################################
+#######################################################################################################################
+# Title:        Python Electric Vehicle Power Toolkit (PyEVPowerKit)
+# Topic:        EV Modeling
+# File:         classDmg
+# Date:         18.03.2024
+# Author:       Dr. Pascal A. Schirmer
+# Version:      V.0.1
+# Copyright:    Pascal Schirmer
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+# Function Description
+#######################################################################################################################
+"""
+Classes of the online damage accumulators. The accumulators consume the temperature and voltage samples as they are
+produced (single samples or chunks) and only store the running damage sum, such that the lifetime can be evaluated in
+streaming or chunked simulations without the full time histories. The Arrhenius and Prokopovic accumulators can be
+initialised with a list of instances to process stacked time series of several components at once.
+
+Cls:
+1)  classRFC:       streaming rainflow counter (ASTM E1049-85) keeping the residue between chunks and accumulating the
+                    cycles into a fixed-size range/mean histogram together with the sum of range^m per bin
+2)  classDmgAcc:    running sum of dt/L (base of the Arrhenius and Prokopovic accumulators, calc_life is the model)
+3)  classDmgArr:    thermal aging (Arrhenius)
+4)  classDmgPro:    voltage-thermal aging (Prokopovic Vaskas)
+5)  classDmgCof:    thermo-mechanical tension (Coffin Manson), evaluated on the rainflow histogram
+6)  classWei:       lifetime results storing the Weibull parameters, pdf and cdf are generated on access
+
+Fnc:
+1)  update:         consumes a sample or a chunk of samples
+2)  calc_life:      lifetime of the samples (Arrhenius and Prokopovic)
+3)  merge:          merges the accumulated damage of another run
+4)  calc_sum:       returns the accumulated damage over the lifetime of the vehicle
+5)  calc:           calculates the lifetime results {L, D, F, beta, L63} from the accumulated damage
+
+"""
+
+#######################################################################################################################
+# Import libs
+#######################################################################################################################
+# ==============================================================================
+# Internal
+# ==============================================================================
+
+# ==============================================================================
+# External
+# ==============================================================================
+import numpy as np
+from scipy.stats import weibull_min
+
+
+#######################################################################################################################
+# Additional Functions
+#######################################################################################################################
+def getPar(COM, name, dim=1):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function returns a lifetime parameter of a component instance or the stacked parameters of a list of instances
+    as array (shape (M, 1) for dim=2 to broadcast against stacked time series).
+    """
+
+    # ==============================================================================
+    # Calculation
+    # ==============================================================================
+    if isinstance(COM, list):
+        par = np.array([getattr(x, name) for x in COM], dtype=float)
+        return par.reshape(-1, 1) if dim == 2 else par
+    else:
+        return getattr(COM, name)
+
+
+def calcWeibull(COM, Tend, D, Lref):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function calculates the lifetime statistics from the damage accumulated over the lifetime of the vehicle. A
+    list of instances can be given with arrays of Tend, D, and Lref to evaluate all of them in one batched call.
+
+    Input:
+    1) COM:     Input instance, e.g. gearbox, or list of instances
+    2) Tend:    Operating time (hrs)
+    3) D:       Accumulated damage (p.u.)
+    4) Lref:    Reference lifetime of the model (hrs or cycles)
+
+    Output:
+    1) L:       Lifetime of the component (hrs)
+    2) D:       Damage of the component (p.u.)
+    3) F:       Failure probability (%)
+    4) beta:    Weibull shape parameter
+    5) L63:     Weibull scale parameter (hrs)
+    """
+
+    # ==============================================================================
+    # Initialisation
+    # ==============================================================================
+    beta = getPar(COM, 'beta')
+    F0 = getPar(COM, 'F0')
+    quantile = 1 - (1 - getPar(COM, 'CL')) / 2
+    quantile95 = 1 - (1 - 0.95) / 2
+
+    # ==============================================================================
+    # Pre-Processing
+    # ==============================================================================
+    L63 = Lref / np.power(-np.log(1 - F0), 1 / beta)
+    cor95 = weibull_min.ppf(quantile95, beta, scale=L63) / weibull_min.ppf(quantile, beta, scale=L63)
+
+    # ==============================================================================
+    # Calculation
+    # ==============================================================================
+    L = Tend / D
+    L63 = L / np.power(-np.log(1 - F0), 1 / beta) / cor95
+
+    # ==============================================================================
+    # Post-Processing
+    # ==============================================================================
+    # ------------------------------------------
+    # Correct Mean Value and Confidence
+    # ------------------------------------------
+    Lx = weibull_min.ppf(getPar(COM, 'Bx'), beta, scale=L63)
+    D = Tend / Lx
+
+    # ------------------------------------------
+    # Calculate Failure Probability
+    # ------------------------------------------
+    F = weibull_min.cdf(Tend, beta, scale=L63)
+
+    # ==============================================================================
+    # Return
+    # ==============================================================================
+    return [Lx, D, F, beta, L63]
+
+
+def calcCurve(beta, L63):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function calculates the pdf and cdf of the Weibull distribution.
+
+    Input:
+    1) beta:    Weibull shape parameter
+    2) L63:     Weibull scale parameter (hrs)
+
+    Output:
+    1) PDF:     Probability density function of the component
+    2) CDF:     Cumulative density function of the component
+    3) x:       Range of the pdf and cdf function
+    """
+
+    # ==============================================================================
+    # Calculation
+    # ==============================================================================
+    x_min = weibull_min.ppf(1.7e-6, beta, scale=L63)
+    x_max = weibull_min.ppf(1 - 1.7e-6, beta, scale=L63)
+    x = np.linspace(x_min, x_max, 1000)
+    pdf = weibull_min.pdf(x, beta, scale=L63)
+    cdf = weibull_min.cdf(x, beta, scale=L63)
+
+    # ==============================================================================
+    # Return
+    # ==============================================================================
+    return [pdf, cdf, x]
+
+
+#######################################################################################################################
+# Lifetime Distribution
+#######################################################################################################################
+class classWei(dict):
+    ###################################################################################################################
+    # Description
+    ###################################################################################################################
+    """
+    Lifetime results of a component (L, D, F) including the Weibull parameters (beta, L63). Only the parameters are
+    stored (and saved), the distribution curves 'pdf', 'cdf', and 'x' are generated on access.
+    """
+
+    ###################################################################################################################
+    # Curves
+    ###################################################################################################################
+    def __missing__(self, key):
+        if key not in ['pdf', 'cdf', 'x']:
+            raise KeyError(key)
+        if not hasattr(self, 'curve'):
+            self.curve = dict(zip(['pdf', 'cdf', 'x'], calcCurve(self['beta'], self['L63'])))
+
+        return self.curve[key]
+
+
+#######################################################################################################################
+# Rainflow Counter
+#######################################################################################################################
+class classRFC:
+    ###################################################################################################################
+    # Constructor
+    ###################################################################################################################
+    def __init__(self, rng=(1e-3, 1e3), mean=(-50, 250), nRng=64, nMean=32, m=1):
+        # ==============================================================================
+        # Histogram (log-spaced range bins, linear mean bins, exponent of the range sum)
+        # ==============================================================================
+        self.m = m
+        self.edgeRng = np.geomspace(rng[0], rng[1], nRng + 1)
+        self.edgeMean = np.linspace(mean[0], mean[1], nMean + 1)
+        self.H = np.zeros((nRng, nMean))
+        self.S = np.zeros((nRng, nMean))
+
+        # ==============================================================================
+        # Turning Points
+        # ==============================================================================
+        self.N = 0
+        self.x_last = None
+        self.x = None
+        self.d_last = 0
+        self.points = []
+
+    ###################################################################################################################
+    # Counting
+    ###################################################################################################################
+    def count(self, points):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function extracts the closed cycles from the reversal stack (three-point rule). The stack is updated in
+        place and keeps the residue.
+
+        Input:
+        1) points:  Stack of reversal points
+
+        Output:
+        1) rf:      Closed cycles as list of [range, mean, count]
+        """
+
+        # ==============================================================================
+        # Calculation
+        # ==============================================================================
+        rf = []
+        while len(points) >= 3:
+            X = abs(points[-1] - points[-2])
+            Y = abs(points[-2] - points[-3])
+            if X < Y:
+                break
+            elif len(points) == 3:
+                rf.append([Y, 0.5 * (points[0] + points[1]), 0.5])
+                points.pop(0)
+            else:
+                rf.append([Y, 0.5 * (points[-2] + points[-3]), 1.0])
+                points[-3:] = [points[-1]]
+
+        # ==============================================================================
+        # Return
+        # ==============================================================================
+        return rf
+
+    ###################################################################################################################
+    # Histogram
+    ###################################################################################################################
+    def hist(self, rf, H, S):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function adds cycles to a range/mean histogram. Cycles outside the limits are assigned to the outer bins,
+        the sum of range^m per bin (S) is kept next to the counts such that power law damage models are evaluated
+        exactly, i.e. independent of the binning.
+
+        Input:
+        1) rf:      Cycles as list of [range, mean, count]
+        2) H:       Cycle count histogram (range x mean)
+        3) S:       Sum of count * range^m (range x mean)
+        """
+
+        # ==============================================================================
+        # Calculation
+        # ==============================================================================
+        if len(rf) == 0:
+            return
+        rf = np.array(rf)
+        iRng = np.clip(np.searchsorted(self.edgeRng, rf[:, 0]) - 1, 0, H.shape[0] - 1)
+        iMean = np.clip(np.searchsorted(self.edgeMean, rf[:, 1]) - 1, 0, H.shape[1] - 1)
+        np.add.at(H, (iRng, iMean), rf[:, 2])
+        np.add.at(S, (iRng, iMean), rf[:, 2] * rf[:, 0] ** self.m)
+
+    ###################################################################################################################
+    # Update
+    ###################################################################################################################
+    def update(self, T):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function consumes a sample or a chunk of samples and adds the cycles closed by them to the histogram.
+
+        Input:
+        1) T:       Temperature sample(s) (degC)
+        """
+
+        # ==============================================================================
+        # Calculation
+        # ==============================================================================
+        rf = []
+        for x in np.atleast_1d(T).tolist():
+            self.N += 1
+
+            # ------------------------------------------
+            # First two samples
+            # ------------------------------------------
+            if self.N == 1:
+                self.x_last = x
+                continue
+            if self.N == 2:
+                self.x = x
+                self.d_last = x - self.x_last
+                self.points.append(self.x_last)
+                continue
+
+            # ------------------------------------------
+            # Reversals
+            # ------------------------------------------
+            if x == self.x:
+                continue
+            d = x - self.x
+            if self.d_last * d < 0:
+                self.points.append(self.x)
+                rf += self.count(self.points)
+            self.x_last = self.x
+            self.x = x
+            self.d_last = d
+
+        # ==============================================================================
+        # Histogram
+        # ==============================================================================
+        self.hist(rf, self.H, self.S)
+
+    ###################################################################################################################
+    # Residue
+    ###################################################################################################################
+    def residue(self):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function returns the histogram including the cycles of the residue (closing the actual sample as last
+        reversal), the residue itself is kept such that further chunks can be consumed afterwards.
+
+        Output:
+        1) H:       Cycle count histogram (range x mean)
+        2) S:       Sum of count * range^m (range x mean)
+        """
+
+        # ==============================================================================
+        # Initialisation
+        # ==============================================================================
+        H = self.H.copy()
+        S = self.S.copy()
+
+        # ==============================================================================
+        # Calculation
+        # ==============================================================================
+        if self.N > 2:
+            points = self.points + [self.x]
+            rf = self.count(points)
+            for i in range(len(points) - 1):
+                rf.append([abs(points[i + 1] - points[i]), 0.5 * (points[i + 1] + points[i]), 0.5])
+            self.hist(rf, H, S)
+
+        # ==============================================================================
+        # Return
+        # ==============================================================================
+        return [H, S]
+
+    ###################################################################################################################
+    # Merge
+    ###################################################################################################################
+    def merge(self, other):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function merges the histogram of another counter (e.g. a different run) including its residue.
+
+        Input:
+        1) other:   classRFC instance with identical bin edges and exponent
+        """
+
+        # ==============================================================================
+        # Calculation
+        # ==============================================================================
+        if other.m != self.m or other.H.shape != self.H.shape:
+            raise ValueError("ERROR: Rainflow histograms with different bins or exponents can not be merged")
+        [H, S] = other.residue()
+        self.H = self.H + H
+        self.S = self.S + S
+
+
+#######################################################################################################################
+# Running Sum of dt/L
+#######################################################################################################################
+class classDmgAcc:
+    ###################################################################################################################
+    # Constructor
+    ###################################################################################################################
+    def __init__(self, COM, dt):
+        self.COM = COM
+        self.dt = dt
+        self.N = 0
+        self.D = 0
+
+    ###################################################################################################################
+    # Update
+    ###################################################################################################################
+    def update(self, T, V=None):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function consumes a sample or a chunk of samples.
+
+        Input:
+        1) T:       Temperature sample(s) (degC), shape (M, N) for a list of instances
+        2) V:       Voltage sample(s) (V), shape (M, N) for a list of instances (voltage dependent models only)
+        """
+
+        # ==============================================================================
+        # Calculation
+        # ==============================================================================
+        T = np.atleast_1d(T)
+        L = self.calc_life(T, V)
+        self.D = self.D + np.sum(self.dt / L, axis=-1)
+        self.N = self.N + T.shape[-1]
+
+    ###################################################################################################################
+    # Merge
+    ###################################################################################################################
+    def merge(self, other):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function merges the accumulated damage of another accumulator (e.g. a different run).
+
+        Input:
+        1) other:   accumulator instance of the same model
+        """
+
+        # ==============================================================================
+        # Calculation
+        # ==============================================================================
+        self.D = self.D + other.D
+        self.N = self.N + other.N
+
+    ###################################################################################################################
+    # Damage
+    ###################################################################################################################
+    def calc_sum(self, N_cyc):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function returns the damage accumulated over the lifetime of the vehicle.
+
+        Input:
+        1) N_cyc:   Number of repetitions of the accumulated samples over the lifetime
+
+        Output:
+        1) Tend:    Operating time (hrs)
+        2) D:       Accumulated damage (p.u.)
+        3) Lref:    Reference lifetime (hrs)
+        """
+
+        # ==============================================================================
+        # Calculation
+        # ==============================================================================
+        Tend = self.dt * self.N * N_cyc / 3600 * np.ones(np.shape(self.D))
+        D = self.D * N_cyc / 3600
+
+        # ==============================================================================
+        # Return
+        # ==============================================================================
+        return [Tend, D, getPar(self.COM, 'L0')]
+
+    ###################################################################################################################
+    # Lifetime
+    ###################################################################################################################
+    def calc(self, setup):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function calculates the lifetime from the accumulated damage.
+
+        Input:
+        1) setup:   Setup variables
+
+        Output:
+        1) res:     Lifetime results {L, D, F, beta, L63} (classWei, curves are generated on access)
+        """
+
+        # ==============================================================================
+        # Return
+        # ==============================================================================
+        return classWei(zip(['L', 'D', 'F', 'beta', 'L63'], calcWeibull(self.COM, *self.calc_sum(setup['Exp']['cyc']))))
+
+
+#######################################################################################################################
+# Arrhenius
+#######################################################################################################################
+class classDmgArr(classDmgAcc):
+    ###################################################################################################################
+    # Lifetime
+    ###################################################################################################################
+    def calc_life(self, T, V=None):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function returns the lifetime at the temperature sample(s) (Arrhenius).
+
+        Input:
+        1) T:       Temperature sample(s) (degC)
+        2) V:       Voltage sample(s) (V), not used
+
+        Output:
+        1) L:       Lifetime (hrs)
+        """
+
+        # ==============================================================================
+        # Calculation
+        # ==============================================================================
+        kB = 8.617e-5
+        L0 = getPar(self.COM, 'L0', 2)
+        Ea = getPar(self.COM, 'Ea', 2)
+        T0 = getPar(self.COM, 'T0', 2)
+
+        return L0 * np.exp((Ea / kB) * (1 / (T + 273.15) - 1 / (T0 + 273.15)))
+
+
+#######################################################################################################################
+# Prokopovic Vaskas
+#######################################################################################################################
+class classDmgPro(classDmgAcc):
+    ###################################################################################################################
+    # Lifetime
+    ###################################################################################################################
+    def calc_life(self, T, V=None):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function returns the lifetime at the temperature and voltage sample(s) (Prokopovic Vaskas), i.e. the
+        Arrhenius lifetime scaled with the voltage term (V/V0)^n.
+
+        Input:
+        1) T:       Temperature sample(s) (degC)
+        2) V:       Voltage sample(s) (V)
+
+        Output:
+        1) L:       Lifetime (hrs)
+        """
+
+        # ==============================================================================
+        # Calculation
+        # ==============================================================================
+        kB = 8.617e-5
+        L0 = getPar(self.COM, 'L0', 2)
+        Ea = getPar(self.COM, 'Ea', 2)
+        T0 = getPar(self.COM, 'T0', 2)
+        V0 = getPar(self.COM, 'V0', 2)
+        n = getPar(self.COM, 'n', 2)
+
+        return L0 * (V / V0) ** n * np.exp((Ea / kB) * (1 / (T + 273.15) - 1 / (T0 + 273.15)))
+
+
+#######################################################################################################################
+# Coffin Manson
+#######################################################################################################################
+class classDmgCof:
+    ###################################################################################################################
+    # Constructor
+    ###################################################################################################################
+    def __init__(self, COM, dt, RFC=None):
+        self.COM = COM
+        self.dt = dt
+        self.N = 0
+        self.RFC = classRFC(m=-COM.k) if RFC is None else RFC
+
+    ###################################################################################################################
+    # Damage
+    ###################################################################################################################
+    def calc_dmg(self, H, S):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function calculates the damage of a cycle histogram (Miner rule). With the histogram exponent m = -k the
+        damage of each cycle (range/dT0)^m / Nf0 is summed exactly from the range sums of the bins.
+
+        Input:
+        1) H:       Cycle count histogram (range x mean)
+        2) S:       Sum of count * range^m (range x mean)
+
+        Output:
+        1) D:       Damage of the cycles (p.u.)
+        """
+
+        # ==============================================================================
+        # Calculation
+        # ==============================================================================
+        if self.RFC.m != -self.COM.k:
+            raise ValueError("ERROR: Rainflow histogram exponent does not match the Coffin Manson exponent")
+        D = np.sum(S) / (self.COM.Nf0 * self.COM.dT0 ** self.RFC.m)
+
+        # ==============================================================================
+        # Return
+        # ==============================================================================
+        return D
+
+    ###################################################################################################################
+    # Update
+    ###################################################################################################################
+    def update(self, T):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function consumes a sample or a chunk of samples.
+
+        Input:
+        1) T:       Temperature sample(s) (degC)
+        """
+
+        # ==============================================================================
+        # Calculation
+        # ==============================================================================
+        self.RFC.update(T)
+        self.N = self.N + len(np.atleast_1d(T))
+
+    ###################################################################################################################
+    # Merge
+    ###################################################################################################################
+    def merge(self, other):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function merges the accumulated cycles of another accumulator (e.g. a different run).
+
+        Input:
+        1) other:   classDmgCof instance
+        """
+
+        # ==============================================================================
+        # Calculation
+        # ==============================================================================
+        self.RFC.merge(other.RFC)
+        self.N = self.N + other.N
+
+    ###################################################################################################################
+    # Damage
+    ###################################################################################################################
+    def calc_sum(self, N_cyc):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function returns the damage of the cycle histogram including the residue half cycles accumulated over
+        the lifetime of the vehicle.
+
+        Input:
+        1) N_cyc:   Number of repetitions of the accumulated samples over the lifetime
+
+        Output:
+        1) Tend:    Operating time (hrs)
+        2) D:       Accumulated damage (p.u.)
+        3) Lref:    Reference lifetime (cycles)
+        """
+
+        # ==============================================================================
+        # Calculation
+        # ==============================================================================
+        Tend = self.dt * self.N * N_cyc / 3600
+        D = self.calc_dmg(*self.RFC.residue()) * N_cyc
+
+        # ==============================================================================
+        # Return
+        # ==============================================================================
+        return [Tend, D, self.COM.Nf0]
+
+    ###################################################################################################################
+    # Lifetime
+    ###################################################################################################################
+    def calc(self, setup):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function calculates the lifetime from the cycle histogram including the residue half cycles.
+
+        Input:
+        1) setup:   Setup variables
+
+        Output:
+        1) res:     Lifetime results {L, D, F, beta, L63} (classWei, curves are generated on access)
+        """
+
+        # ==============================================================================
+        # Return
+        # ==============================================================================
+        return classWei(zip(['L', 'D', 'F', 'beta', 'L63'], calcWeibull(self.COM, *self.calc_sum(setup['Exp']['cyc']))))
+
+#######################################################################################################################
+# References
+#######################################################################################################################
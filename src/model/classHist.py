@@ -0,0 +1,251 @@
+#######################################################################################################################
+#######################################################################################################################
+# Title:        Python Electric Vehicle Power Toolkit (PyEVPowerKit)
+# Topic:        EV Modeling
+# File:         classHist
+# Date:         18.03.2024
+# Author:       Dr. Pascal A. Schirmer
+# Version:      V.0.1
+# Copyright:    Pascal Schirmer
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+# Function Description
+#######################################################################################################################
+"""
+Class of the online residence histograms (load spectra). The histograms accumulate the time spent in fixed bins of one
+(time at level) or two (residence) signals as the samples are produced (single samples or chunks), such that the load
+spectra of long or many mission profiles are collected at constant memory. The bins are linear between fixed limits
+derived from the component ratings, samples outside the limits are assigned to the outer bins. Histograms with
+identical bins are merged by adding the residence times, e.g. over chunks, mission profiles, or worker processes.
+
+The following load spectra are collected per motor unit (residence time in sec over one repetition of the mission
+profile, setup['Exp']['histN'] bins per axis):
+- GBX and EMA:  speed-torque residence (nM) and time at temperature (T)
+- INV:          current-temperature residence (IT) of the phase current
+- HVS:          current-temperature residence (IT) of the DC current
+
+Cls:
+1)  classHist:      fixed-bin 1-D or 2-D residence histogram of one or several motor units
+
+Fnc:
+1)  update:         consumes a sample or a chunk of samples
+2)  merge:          merges the residence times of another histogram with identical bins
+3)  initHist:       initialises the load spectra of the drive train
+4)  calcHist:       feeds the samples of the time dependent variables to the load spectra
+5)  getHist:        returns the load spectra as dict of arrays (bin edges and residence times)
+
+"""
+
+#######################################################################################################################
+# Import libs
+#######################################################################################################################
+# ==============================================================================
+# Internal
+# ==============================================================================
+
+# ==============================================================================
+# External
+# ==============================================================================
+import numpy as np
+
+
+#######################################################################################################################
+# Additional Functions
+#######################################################################################################################
+def getSpec():
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    Signals of the load spectra per component (channel names of dataTime) and the attributes of the component instances
+    defining the limits of the bins ('sym': -x_max to x_max, 'pos': 0 to x_max, 'T': -40 degC to T_max).
+    """
+
+    spec = {'GBX': {'nM': [('n', 'n_max', 'pos'), ('M', 'M_max', 'sym')], 'T': [('T', 'T_max', 'T')]},
+            'EMA': {'nM': [('n', 'n_max', 'pos'), ('M', 'M_max', 'sym')], 'T': [('T', 'T_max', 'T')]},
+            'INV': {'IT': [('Is', 'I_max', 'pos'), ('T', 'T_max', 'T')]},
+            'HVS': {'IT': [('Idc', 'I_max', 'sym'), ('T', 'T_max', 'T')]}}
+
+    return spec
+
+
+#######################################################################################################################
+# Class
+#######################################################################################################################
+class classHist:
+    ###################################################################################################################
+    # Constructor
+    ###################################################################################################################
+    def __init__(self, lo, hi, nBin):
+        # ==============================================================================
+        # Bins (signals x motor units)
+        # ==============================================================================
+        self.lo = np.array(lo, dtype=float)
+        self.hi = np.array(hi, dtype=float)
+        self.nBin = nBin
+
+        # ==============================================================================
+        # Residence Time (motor units x bins per signal)
+        # ==============================================================================
+        self.H = np.zeros((self.lo.shape[1],) + (nBin,) * self.lo.shape[0])
+
+    ###################################################################################################################
+    # Update
+    ###################################################################################################################
+    def update(self, x, dt):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function consumes a sample or a chunk of samples of all motor units.
+
+        Input:
+        1) x:       Samples, shape (signals, motor units) or (signals, motor units, samples)
+        2) dt:      Residence time of each sample (sec)
+        """
+
+        # ==============================================================================
+        # Initialisation
+        # ==============================================================================
+        [D, M] = self.lo.shape
+        x = np.asarray(x, dtype=float).reshape(D, M, -1)
+
+        # ==============================================================================
+        # Calculation
+        # ==============================================================================
+        idx = (x - self.lo[..., None]) / (self.hi - self.lo)[..., None] * self.nBin
+        idx = np.clip(np.floor(np.nan_to_num(idx)).astype(int), 0, self.nBin - 1)
+        u = np.broadcast_to(np.arange(M)[:, None], idx.shape[1:])
+        np.add.at(self.H, (u,) + tuple(idx), dt)
+
+    ###################################################################################################################
+    # Merge
+    ###################################################################################################################
+    def merge(self, other):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function merges the residence times of another histogram (e.g. a different chunk or run).
+
+        Input:
+        1) other:   classHist instance with identical bins
+        """
+
+        # ==============================================================================
+        # Calculation
+        # ==============================================================================
+        if self.nBin != other.nBin or not (np.allclose(self.lo, other.lo) and np.allclose(self.hi, other.hi)):
+            raise ValueError("ERROR: Histograms with different bins can not be merged")
+        self.H = self.H + other.H
+
+    ###################################################################################################################
+    # Edges
+    ###################################################################################################################
+    def edges(self):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function returns the bin edges, shape (signals, motor units, bins + 1).
+        """
+
+        return np.moveaxis(np.linspace(self.lo, self.hi, self.nBin + 1), 0, -1)
+
+
+#######################################################################################################################
+# Initialisation
+#######################################################################################################################
+def initHist(GBX, EMA, INV, HVS, setup):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function initialises the load spectra of the drive train with bins derived from the component ratings.
+
+    Input:
+    1) GBX:     list of GBX instances (one per motor unit)
+    2) EMA:     list of EMA instances (one per motor unit)
+    3) INV:     list of INV instances (one per motor unit)
+    4) HVS:     HVS instance
+    5) setup:   includes all simulation variables
+
+    Output:
+    1) dataHist: load spectra (classHist) per component and histogram
+    """
+
+    # ==============================================================================
+    # Initialisation
+    # ==============================================================================
+    COM = {'GBX': GBX, 'EMA': EMA, 'INV': INV, 'HVS': [HVS]}
+    dataHist = {}
+
+    # ==============================================================================
+    # Calculation
+    # ==============================================================================
+    for comp, hist in getSpec().items():
+        dataHist[comp] = {}
+        for name, sig in hist.items():
+            hi = np.array([[getattr(x, att) for x in COM[comp]] for (_, att, _) in sig], dtype=float)
+            lo = np.array([-hi[i] if sig[i][2] == 'sym' else -40 * np.ones(hi.shape[1]) if sig[i][2] == 'T'
+                           else np.zeros(hi.shape[1]) for i in range(len(sig))])
+            dataHist[comp][name] = classHist(lo, hi, setup['Exp']['histN'])
+
+    # ==============================================================================
+    # Return
+    # ==============================================================================
+    return dataHist
+
+
+#######################################################################################################################
+# Calculation
+#######################################################################################################################
+def calcHist(idx, dataHist, dataTime, setup):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function feeds the samples of the time dependent variables to the load spectra.
+
+    Input:
+    1) idx:         sample (iteration number) or slice of samples
+    2) dataHist:    load spectra (see initHist)
+    3) dataTime:    time dependent variables
+    4) setup:       includes all simulation variables
+    """
+
+    # ==============================================================================
+    # Initialisation
+    # ==============================================================================
+    dt = 1 / setup['Dat']['fs']
+
+    # ==============================================================================
+    # Calculation
+    # ==============================================================================
+    for comp, hist in getSpec().items():
+        val = dataTime[comp] if comp == 'HVS' else dataTime[comp]['U']
+        for name, sig in hist.items():
+            M = dataHist[comp][name].lo.shape[1]
+            x = [np.reshape(val[y][idx], (-1, M)).T for (y, _, _) in sig]
+            dataHist[comp][name].update(x, dt)
+
+
+#######################################################################################################################
+# Output
+#######################################################################################################################
+def getHist(dataHist):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function returns the load spectra as dict of arrays, i.e. the bin edges per signal (signals x motor units x
+    bins + 1) and the residence times (motor units x bins per signal) in sec, such that they can be saved with dataLife.
+    """
+
+    return {comp: {name: {'edges': x.edges(), 'H': x.H} for name, x in hist.items()} for comp, hist in dataHist.items()}
+
+#######################################################################################################################
+# References
+#######################################################################################################################
@@ -0,0 +1,295 @@
+#######################################################################################################################
+#######################################################################################################################
+# Title:        Python Electric Vehicle Power Toolkit (PyEVPowerKit)
+# Topic:        EV Modeling
+# File:         classOpc
+# Date:         18.03.2024
+# Author:       Dr. Pascal A. Schirmer
+# Version:      V.0.1
+# Copyright:    Pascal Schirmer
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+# Function Description
+#######################################################################################################################
+"""
+Class of the operating-point clustering of the electrical machine. The operating points (n, M, Vdc, T) of the mission
+profile are binned on a regular grid. The electrical solution of the machine (calc_elec) is only calculated at the grid
+nodes (cluster representatives) and interpolated bilinearly in speed and torque to every sample, while the DC-link
+voltage and the temperature are assigned to the nearest node. Solved nodes are stored and reused over the mission
+profile, such that the expensive MTPA solver is only called once per representative. Nodes at the current, voltage, or
+torque limits are marked as saturated, samples in a cell touching a saturated node are solved exactly instead of
+interpolating across the limit. The same holds for cells spanning the transition between motoring and generating (sign
+change of the air-gap torque), where the stator current is not smooth. The losses of the machine and the inverter
+(closed-form) are calculated from the interpolated stator quantities for every sample. The output power is exact and the
+input power, efficiency, and power factor are recalculated from the interpolated losses and stator quantities.
+
+Cls:
+1)  classOpc:       grid clustering of the operating points of all motor units
+
+Fnc:
+1)  calc_elec:      interpolated electrical quantities of the machine (same outputs as classPSM.calc_elec)
+2)  init_rep:       restarts the accumulation of the report
+3)  calc_rep:       accumulates the clustered and exact energies of the sampled operating points (all samples at once or
+                    window by window, see classRec)
+4)  report:         energy and loss error of the clustered solution versus the exact solution
+
+"""
+
+#######################################################################################################################
+# Import libs
+#######################################################################################################################
+# ==============================================================================
+# Internal
+# ==============================================================================
+
+# ==============================================================================
+# External
+# ==============================================================================
+from tqdm import tqdm
+import numpy as np
+
+
+#######################################################################################################################
+# Additional Functions
+#######################################################################################################################
+
+
+#######################################################################################################################
+# Class
+#######################################################################################################################
+class classOpc:
+    ###################################################################################################################
+    # Constructor
+    ###################################################################################################################
+    def __init__(self, EMA, setup):
+        self.EMA = EMA
+        self.step = np.array([setup['Exp']['opcDn'], setup['Exp']['opcDm'], setup['Exp']['opcDv'],
+                              setup['Exp']['opcDt']], dtype=float)
+        self.rep = {}
+        self.sat = {}
+        self.N = 0
+        self.nEx = 0
+        self.init_rep()
+
+    ###################################################################################################################
+    # Representative
+    ###################################################################################################################
+    def solve(self, u, idx, setup):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function returns the electrical solution of a grid node and calculates it on first use. The node is
+        saturated if the torque is limited (torque, power, or speed limit, full-load envelope) or the current or the
+        voltage of the solution is at its limit (within 1 %).
+
+        Input:
+        1) u:       Index of the motor unit
+        2) idx:     Grid indices of the node (n, M, Vdc, T)
+        3) setup:   Setup variables
+
+        Output:
+        1) out:     Outputs of classPSM.calc_elec at the node
+        2) sat:     True if the node is saturated
+        """
+
+        # ==============================================================================
+        # Calculation
+        # ==============================================================================
+        key = (u,) + idx
+        if key not in self.rep:
+            # ------------------------------------------
+            # Solution
+            # ------------------------------------------
+            [n, M, Vdc, T] = np.array(idx) * self.step
+            EMA = self.EMA[u]
+            self.rep[key] = np.array(EMA.calc_elec(n, M, Vdc, T, setup), dtype=float)
+
+            # ------------------------------------------
+            # Saturation
+            # ------------------------------------------
+            v_max = Vdc / np.sqrt(3) - EMA.R_s * (1 + 0.00393 * (T - 20)) * EMA.I_max
+            sat = self.rep[key][2] * np.sqrt(2) >= 0.99 * EMA.I_max or self.rep[key][5] * np.sqrt(2) >= 0.99 * v_max
+            if setup['Exp']['lim'] == 1:
+                sat = sat or (abs(n) >= 0.99 * EMA.n_max or abs(M) >= 0.99 * EMA.M_max or
+                              abs(2 * np.pi * n * M) >= 0.99 * EMA.P_max)
+                if setup['Exp']['env'] == 1:
+                    sat = sat or abs(EMA.calc_lim(n, 1.01 * M, Vdc, T, setup)) < abs(1.01 * M)
+            self.sat[key] = bool(sat)
+
+        # ==============================================================================
+        # Return
+        # ==============================================================================
+        return [self.rep[key], self.sat[key]]
+
+    ###################################################################################################################
+    # Electrical
+    ###################################################################################################################
+    def calc_elec(self, u, n_Ema, M_Ema, Vdc, T, setup):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function interpolates the electrical quantities of the machine from the cluster representatives. If a
+        node of the cell is saturated or the cell spans the transition between motoring and generating (sign change of
+        the air-gap torque, kink of the stator current) the operating point is solved exactly.
+
+        Input:
+        1) u:       Index of the motor unit
+        2) n_Ema:   Rotational speed of the machine (1/s)
+        3) M_Ema:   Torque of the machine (Nm)
+        4) Vdc:     DC-link voltage (V)
+        5) T:       Hotspot temperature of the machine (degC)
+        6) setup:   Setup variables
+
+        Output:
+        [id, iq, Is, vd, vq, Vs, lam_s, Pin, Pout, Pv, eta, PF, Min, Mshaft] (see classPSM.calc_elec)
+        """
+
+        # ==============================================================================
+        # Init
+        # ==============================================================================
+        x = np.array([n_Ema, M_Ema]) / self.step[0:2]
+        i0 = np.floor(x).astype(int)
+        w = x - i0
+        k = (int(np.round(Vdc / self.step[2])), int(np.round(T / self.step[3])))
+        out = 0
+        self.N = self.N + 1
+
+        # ==============================================================================
+        # Calculation
+        # ==============================================================================
+        # ------------------------------------------
+        # Nodes of the cell
+        # ------------------------------------------
+        node = []
+        for di in range(2):
+            for dj in range(2):
+                wij = (w[0] if di else 1 - w[0]) * (w[1] if dj else 1 - w[1])
+                if wij != 0:
+                    node.append([wij] + self.solve(u, (int(i0[0]) + di, int(i0[1]) + dj) + k, setup))
+
+        # ------------------------------------------
+        # Exact solution (saturated or non-smooth cell)
+        # ------------------------------------------
+        Min = [x[1][12] for x in node]
+        if any(x[2] for x in node) or min(Min) < 0 < max(Min):
+            self.nEx = self.nEx + 1
+            return self.EMA[u].calc_elec(n_Ema, M_Ema, Vdc, T, setup)
+
+        # ------------------------------------------
+        # Interpolation
+        # ------------------------------------------
+        for [wij, val, _] in node:
+            out = out + wij * val
+
+        # ==============================================================================
+        # Post-Processing
+        # ==============================================================================
+        # ------------------------------------------
+        # Power
+        # ------------------------------------------
+        out[8] = 2 * np.pi * n_Ema * M_Ema
+        [out[7], out[10], out[11]] = self.EMA[u].calc_pow(out[8], out[9], out[5], out[2])
+
+        # ==============================================================================
+        # Return
+        # ==============================================================================
+        return list(out)
+
+    ###################################################################################################################
+    # Report
+    ###################################################################################################################
+    def init_rep(self):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function restarts the accumulation of the report (clustered and exact energies in Ws, number of samples).
+        """
+
+        self.acc = {comp: {x: np.zeros(2) for x in ['Pin', 'Pv']} for comp in ['EMA', 'INV']}
+        self.nRep = 0
+
+    def calc_rep(self, INV, dataTime, idx, setup):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function accumulates the energies of the clustered and the exact solution. The machine and the inverter are
+        solved exactly at the operating points of the simulation (speed, torque, DC-link voltage, and temperatures of
+        the previous sample as in elecSim). All samples are evaluated for setup['Exp']['opcRep'] = 1, otherwise every
+        k-th sample of the mission profile (about 200 samples).
+
+        Input:
+        1) INV:     list of INV instances (one per motor unit)
+        2) dataTime: internal time dependent variables (components in the ring buffer, see classRec)
+        3) idx:     samples of the mission profile
+        4) setup:   Setup variables
+        """
+
+        # ==============================================================================
+        # Init
+        # ==============================================================================
+        Ts = 1 / setup['Dat']['fs']
+        N = len(dataTime['VEH']['Vdc'])
+        [K, nMot] = dataTime['EMA']['U']['n'].shape
+        idx = idx[idx % (1 if setup['Exp']['opcRep'] == 1 else max(1, N // 200)) == 0]
+
+        # ==============================================================================
+        # Calculation
+        # ==============================================================================
+        for iter in tqdm(idx, desc='Operating-Point Report', disable=len(idx) < 100):
+            k = iter % K
+            Vdc = dataTime['VEH']['Vdc'][iter - 1]
+            for u in range(nMot):
+                n_Ema = dataTime['EMA']['U']['n'][k, u]
+                T_Ema = dataTime['EMA']['U']['T'][k - 1, u]
+                T_Inv = dataTime['INV']['U']['T'][k - 1, u]
+                [_, _, Is, _, _, Vs, _, Pin, _, _, _, PF, _, _] = self.EMA[u].calc_elec(
+                    n_Ema, dataTime['EMA']['U']['M'][k, u], Vdc, T_Ema, setup)
+                [Pv, _, _, _] = self.EMA[u].calc_loss(n_Ema, Is, Vs, Vdc, INV[u].fs, T_Ema)
+                [Mi, Idc, Ic, Pin_INV, _, Pv_INV, _] = INV[u].calc_elec(PF, Vs, Is, Vdc, T_Inv, setup)
+                [Pv_INV, _, _, _, _] = INV[u].calc_loss(Mi, PF, Is, Ic, Idc - Pv_INV / Vdc, Vdc, T_Inv)
+                ref = {'EMA': {'Pin': Pin, 'Pv': Pv}, 'INV': {'Pin': Pin_INV, 'Pv': Pv_INV}}
+                for comp in ref:
+                    for x in ref[comp]:
+                        self.acc[comp][x] += np.array([dataTime[comp]['U'][x][k, u], ref[comp][x]]) * Ts
+        self.nRep = self.nRep + len(idx)
+
+    def report(self):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function calculates the energy and loss error of the clustered solution from the accumulated energies of
+        the sampled operating points (see calc_rep).
+
+        Output:
+        1) dataOpc: energies (kWh) of the clustered and exact solution and relative errors (%) per component
+        """
+
+        # ==============================================================================
+        # Errors
+        # ==============================================================================
+        dataOpc = {'N': self.N, 'rep': len(self.rep), 'sat': int(sum(self.sat.values())), 'exact': self.nEx,
+                   'samples': self.nRep}
+        for comp in self.acc:
+            dataOpc[comp] = {}
+            for x in self.acc[comp]:
+                [E, E_ref] = self.acc[comp][x] / 3.6e6
+                err = (E - E_ref) / (abs(E_ref) + 1e-12) * 100
+                dataOpc[comp][x] = {'E': E, 'E_ref': E_ref, 'err': err}
+                print("INFO: Operating-point clustering ", comp, " ", x, " energy ", round(E, 4), " kWh (exact ",
+                      round(E_ref, 4), " kWh, error ", round(err, 3), " %, ", self.nRep, " samples)")
+
+        # ==============================================================================
+        # Return
+        # ==============================================================================
+        return dataOpc
+
+#######################################################################################################################
+# References
+#######################################################################################################################
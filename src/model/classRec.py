@@ -0,0 +1,357 @@
+#######################################################################################################################
+#######################################################################################################################
+# Title:        Python Electric Vehicle Power Toolkit (PyEVPowerKit)
+# Topic:        EV Modeling
+# File:         classRec
+# Date:         18.03.2024
+# Author:       Dr. Pascal A. Schirmer
+# Version:      V.0.1
+# Copyright:    Pascal Schirmer
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+# Function Description
+#######################################################################################################################
+"""
+Class of the decimated recording of the time dependent outputs. The simulation can run at a high sampling rate (e.g.
+100 Hz for the ripple of the junction temperatures) while only the output rate (setup['Exp']['recFs']) is stored. The
+components (GBX, EMA, INV) and the HVS are simulated in a ring buffer of one window of fs/recFs samples (extended to
+the longest thermal macro step, see getRing), the vehicle level (VEH, WHE) is evaluated vectorized before the loop and
+stays at the sampling rate like the mission profile. Whenever a window is completed during the loop, its axle and total
+channels are derived (calcAxle), every signal is aggregated to the window mean, minimum, and maximum, and the window is
+fed to the damage accumulators (calcDmg), the load spectra (calcHist), and the operating-point report (classOpc), such
+that neither the memory nor the saved results scale with the sampling rate. The decimated store has the structure of
+dataTime (window mean), the window minimum and maximum are stored under 'REC'.
+
+Cls:
+1)  classRec:       decimated recording of dataTime
+
+Fnc:
+1)  getRing:        returns the number of samples of the ring buffer
+2)  setRing:        copies the last sample of the mission profile to the end of the ring buffer
+3)  reset:          restarts the recording for a pass over the mission profile
+4)  update:         aggregates the completed window of the loop
+5)  finish:         returns the decimated store
+6)  getData:        returns the mission profile at the output rate of the time dependent variables
+7)  getTs:          returns the residence time of the samples of the time dependent variables
+
+"""
+
+#######################################################################################################################
+# Import libs
+#######################################################################################################################
+# ==============================================================================
+# Internal
+# ==============================================================================
+from src.general.smallFnc import calcAxle
+from src.model.reliaSim import initDmg, calcDmg
+from src.model.classHist import initHist, calcHist
+
+# ==============================================================================
+# External
+# ==============================================================================
+import numpy as np
+
+
+#######################################################################################################################
+# Additional Functions
+#######################################################################################################################
+def getRing(N, setup):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function returns the number of samples of the components and the HVS, i.e. all samples of the mission profile
+    or the ring buffer of the decimated recording. The ring buffer holds a multiple of the window length covering the
+    longest thermal macro step (see therSim) and the previous sample, such that every window is a contiguous slice.
+
+    Input:
+    1) N:       number of samples of the mission profile
+    2) setup:   includes all simulation variables
+
+    Output:
+    1) K:       number of samples of the components and the HVS
+    """
+
+    # ==============================================================================
+    # Full Rate
+    # ==============================================================================
+    if setup['Exp']['fid'] != 2 or setup['Exp']['rec'] != 1:
+        return N
+
+    # ==============================================================================
+    # Ring Buffer
+    # ==============================================================================
+    fs = setup['Dat']['fs']
+    n = max(int(round(fs / setup['Exp']['recFs'])), 1)
+    m = max([max(1, int(round(fs / x))) if x > 0 else 1 for x in setup['Exp']['therFs'].values()])
+
+    return min(n * int(np.ceil((m + 1) / n)), N)
+
+
+def setRing(dataTime, N):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function copies the last sample of the mission profile (N - 1) of the components and the HVS to the end of
+    the ring buffer (sample -1), i.e. the initial state of the next pass. Without ring buffer it has no effect.
+    """
+
+    # ==============================================================================
+    # Calculation
+    # ==============================================================================
+    K = len(dataTime['HVS']['T'])
+    for x in getSig(dataTime, K):
+        if x[0] not in ['VEH', 'WHE']:
+            val = getVal(dataTime, x)
+            val[-1] = val[(N - 1) % K]
+
+    return dataTime
+
+
+def getData(data, dataTime):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function returns the mission profile at the output rate of the time dependent variables, i.e. the window mean
+    for the decimated recording (e.g. for plotting).
+    """
+
+    if 'REC' not in dataTime:
+        return data
+
+    return data.groupby(np.arange(len(data)) // dataTime['REC']['n']).mean(numeric_only=True).reset_index(drop=True)
+
+
+def getTs(dataTime, setup):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function returns the residence time (sec) of each sample of the time dependent variables, i.e. the sampling
+    time or the length of the windows for the decimated recording (the last window can be shorter).
+    """
+
+    K = len(dataTime['VEH']['v'])
+    Ts = np.ones(K) / setup['Dat']['fs']
+    if 'REC' in dataTime and K > 0:
+        Ts = Ts * dataTime['REC']['n']
+        Ts[-1] = (dataTime['REC']['N'] - (K - 1) * dataTime['REC']['n']) / setup['Dat']['fs']
+
+    return Ts
+
+
+def getSig(data, N, path=()):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function returns the paths of all signals (arrays over the N samples of the mission profile) of a nested dict.
+    """
+
+    sig = []
+    for key, val in data.items():
+        if isinstance(val, dict):
+            sig = sig + getSig(val, N, path + (key,))
+        elif isinstance(val, np.ndarray) and val.ndim > 0 and val.shape[0] == N:
+            sig.append(path + (key,))
+
+    return sig
+
+
+def getVal(data, path):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function returns the value of a nested dict at the given path.
+    """
+
+    for key in path:
+        data = data[key]
+
+    return data
+
+
+def setVal(data, path, val):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function sets the value of a nested dict at the given path (creating the intermediate dicts).
+    """
+
+    for key in path[:-1]:
+        data = data.setdefault(key, {})
+    data[path[-1]] = val
+
+
+def getTree(data, rec):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function returns a nested dict with the structure of data, the recorded signals are replaced by rec.
+    """
+
+    out = {}
+    for key, val in data.items():
+        if isinstance(val, dict):
+            out[key] = getTree(val, rec.get(key, {}))
+        else:
+            out[key] = rec.get(key, val)
+
+    return out
+
+
+#######################################################################################################################
+# Class
+#######################################################################################################################
+class classRec:
+    ###################################################################################################################
+    # Constructor
+    ###################################################################################################################
+    def __init__(self, dataTime, N, setup, COM, OPC=None):
+        # ==============================================================================
+        # Windows
+        # ==============================================================================
+        self.N = N
+        self.n = max(int(round(setup['Dat']['fs'] / setup['Exp']['recFs'])), 1)
+        self.K = len(dataTime['HVS']['T'])
+        self.W = int(np.ceil(N / self.n))
+        self.w = 0
+
+        # ==============================================================================
+        # Sinks
+        # ==============================================================================
+        self.setup = setup
+        self.COM = COM
+        self.OPC = OPC
+        self.dmg = None
+        self.hist = None
+
+        # ==============================================================================
+        # Signals
+        # ==============================================================================
+        self.sig = {'ring': [x for x in getSig(dataTime, self.K) if x[0] not in ['VEH', 'WHE']],
+                    'full': [x for x in getSig(dataTime, N) if x[0] in ['VEH', 'WHE']]}
+
+        # ==============================================================================
+        # Store
+        # ==============================================================================
+        self.out = {'mean': {}, 'min': {}, 'max': {}}
+        for x in self.sig['ring'] + self.sig['full']:
+            val = getVal(dataTime, x)
+            for y in self.out:
+                setVal(self.out[y], x, np.zeros((self.W,) + val.shape[1:]))
+
+    ###################################################################################################################
+    # Reset
+    ###################################################################################################################
+    def reset(self):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function restarts the recording for a pass over the mission profile, i.e. the first window and empty
+        damage accumulators, load spectra, and operating-point report (the last pass is recorded).
+        """
+
+        [GBX, EMA, INV, HVS] = self.COM
+        self.w = 0
+        self.dmg = initDmg(GBX, EMA, INV, HVS, self.setup)
+        if self.setup['Exp']['hist'] == 1:
+            self.hist = initHist(GBX, EMA, INV, HVS, self.setup)
+        if self.OPC is not None:
+            self.OPC.init_rep()
+
+    ###################################################################################################################
+    # Loop
+    ###################################################################################################################
+    def update(self, iter, dataTime):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function processes the window once its last sample has been simulated. The window covers the samples
+        idx of the mission profile and the contiguous slice ring of the ring buffer.
+
+        Input:
+        1) iter:        iteration number
+        2) dataTime:    time dependent variables (components and HVS in the ring buffer)
+        """
+
+        # ==============================================================================
+        # Init
+        # ==============================================================================
+        if iter + 1 != min((self.w + 1) * self.n, self.N):
+            return
+        idx = slice(self.w * self.n, iter + 1)
+        ring = slice(idx.start % self.K, idx.start % self.K + idx.stop - idx.start)
+
+        # ==============================================================================
+        # Axles and Total
+        # ==============================================================================
+        calcAxle(dataTime, self.setup, ring, idx)
+
+        # ==============================================================================
+        # Aggregation
+        # ==============================================================================
+        for name, sel in [('ring', ring), ('full', idx)]:
+            for x in self.sig[name]:
+                val = getVal(dataTime, x)[sel]
+                getVal(self.out['mean'], x)[self.w] = np.mean(val, axis=0)
+                getVal(self.out['min'], x)[self.w] = np.min(val, axis=0)
+                getVal(self.out['max'], x)[self.w] = np.max(val, axis=0)
+
+        # ==============================================================================
+        # Damage, Load Spectra, and Operating-Point Report
+        # ==============================================================================
+        calcDmg(self.dmg, dataTime, self.setup, ring)
+        if self.hist is not None:
+            calcHist(ring, self.hist, dataTime, self.setup)
+        if self.OPC is not None:
+            self.OPC.calc_rep(self.COM[2], dataTime, np.arange(idx.start, idx.stop), self.setup)
+        self.w = self.w + 1
+
+    ###################################################################################################################
+    # Finish
+    ###################################################################################################################
+    def finish(self, dataTime):
+        # ==============================================================================
+        # Description
+        # ==============================================================================
+        """
+        This function returns the decimated store of the recorded pass.
+
+        Input:
+        1) dataTime:    time dependent variables (components and HVS in the ring buffer)
+
+        Output:
+        1) dataRec:     time dependent variables (window mean), window minimum and maximum under 'REC'
+        """
+
+        # ==============================================================================
+        # Output
+        # ==============================================================================
+        dataRec = getTree(dataTime, self.out['mean'])
+        dataRec['REC'] = {'fs': self.setup['Exp']['recFs'], 'n': self.n, 'N': self.N, 'min': self.out['min'],
+                          'max': self.out['max']}
+
+        # ==============================================================================
+        # MSG Out
+        # ==============================================================================
+        print("INFO: Recording decimated from ", self.N, " to ", self.W, " samples (", self.n,
+              " samples per window, ring buffer of ", self.K, " samples)")
+
+        # ==============================================================================
+        # Return
+        # ==============================================================================
+        return dataRec
+
+#######################################################################################################################
+# References
+#######################################################################################################################
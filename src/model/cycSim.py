@@ -0,0 +1,173 @@
+#######################################################################################################################
+#######################################################################################################################
+# Title:        Python Electric Vehicle Power Toolkit (PyEVPowerKit)
+# Topic:        EV Modeling
+# File:         cycSim
+# Date:         18.03.2024
+# Author:       Dr. Pascal A. Schirmer
+# Version:      V.0.1
+# Copyright:    Pascal Schirmer
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+# Function Description
+#######################################################################################################################
+"""
+These functions simulate one pass of the mission profile. The vehicle level simulation (initVeh) is evaluated
+vectorized over the mission profile, the component level simulation (cycSim) iterates over the samples of the mission
+profile (mechanical, electrical, thermal, and vehicle) and feeds the load spectra or the decimated recording.
+
+Fnc:
+1)  initVeh:    initialises the time dependent variables and simulates the vehicle level
+2)  cycSim:     simulates one pass of the component level over the mission profile
+
+"""
+
+#######################################################################################################################
+# Import libs
+#######################################################################################################################
+# ==============================================================================
+# Internal
+# ==============================================================================
+from src.general.smallFnc import initOutVar
+from src.model.Veh.mechVeh import mechVeh
+from src.model.Veh.mechWhe import mechWhe
+from src.model.Veh.elecVeh import elecVeh
+from src.model.Veh.therVeh import therVeh
+from src.model.mechSim import mechSim
+from src.model.elecSim import elecSim
+from src.model.therSim import therSim
+from src.model.vehSim import vehSim
+from src.model.classHist import calcHist
+from src.model.classRec import getRing
+
+# ==============================================================================
+# External
+# ==============================================================================
+from tqdm import tqdm
+
+
+#######################################################################################################################
+# Vehicle
+#######################################################################################################################
+def initVeh(data, setup):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function initialises the time dependent variables (all temperatures at the first coolant temperature, the
+    components and the HVS in the ring buffer of the decimated recording, see getRing) and simulates the vehicle level
+    (mechanical vehicle and wheels, electrical, and thermal).
+
+    Input:
+    1) data:        mission profile
+    2) setup:       includes all simulation variables
+
+    Output:
+    1) data:        mission profile
+    2) dataTime:    time dependent variables
+    """
+
+    # ==============================================================================
+    # Init
+    # ==============================================================================
+    N = len(data['t'])
+    dataTime = initOutVar(N, data['T_C'][0], len(setup['Par']['Mot']), getRing(N, setup))
+
+    # ==============================================================================
+    # Mechanical
+    # ==============================================================================
+    # Vehicle
+    dataTime = mechVeh(data, dataTime, setup)
+
+    # Wheels
+    dataTime = mechWhe(data, dataTime, setup)
+
+    # ==============================================================================
+    # Electrical
+    # ==============================================================================
+    [data, dataTime] = elecVeh(data, dataTime, setup)
+
+    # ==============================================================================
+    # Thermal
+    # ==============================================================================
+    [data, dataTime] = therVeh(data, dataTime, setup)
+
+    # ==============================================================================
+    # Return
+    # ==============================================================================
+    return [data, dataTime]
+
+
+#######################################################################################################################
+# Components
+#######################################################################################################################
+def cycSim(GBX, EMA, INV, HVS, VEH, data, dataTime, setup, OPC=None, dataHist=None, REC=None, desc='Mission Profile'):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function simulates one pass of the component level over the mission profile. The state at sample -1 (end of
+    the previous pass or initial state) is the initial state of the pass. The load spectra are fed per sample, for the
+    decimated recording per window (see classRec).
+
+    Input:
+    1) GBX:         list of GBX instances (one per motor unit)
+    2) EMA:         list of EMA instances (one per motor unit)
+    3) INV:         list of INV instances (one per motor unit)
+    4) HVS:         HVS instance
+    5) VEH:         VEH instance
+    6) data:        mission profile
+    7) dataTime:    time dependent variables
+    8) setup:       includes all simulation variables
+    9) OPC:         operating-point clustering (classOpc), None for the exact solution
+    10) dataHist:   load spectra (see initHist), None if disabled
+    11) REC:        decimated recording (classRec), None if disabled
+    12) desc:       description of the progress bar
+
+    Output:
+    1) dataTime:    time dependent variables
+    """
+
+    # ==============================================================================
+    # Init
+    # ==============================================================================
+    if REC is not None:
+        REC.reset()
+
+    # ==============================================================================
+    # Calculation
+    # ==============================================================================
+    for iter in tqdm(range(len(data['t'])), desc=desc):
+        # Mechanical
+        dataTime = mechSim(iter, GBX, EMA, dataTime, setup)
+
+        # Electrical
+        dataTime = elecSim(iter, EMA, INV, HVS, dataTime, setup, OPC)
+
+        # Thermal
+        dataTime = therSim(iter, GBX, EMA, INV, HVS, VEH, data, dataTime, setup)
+
+        # Vehicle
+        dataTime = vehSim(iter, VEH, data, dataTime, setup)
+
+        # Load Spectra
+        if dataHist is not None:
+            calcHist(iter, dataHist, dataTime, setup)
+
+        # Recording
+        if REC is not None:
+            REC.update(iter, dataTime)
+
+    # ==============================================================================
+    # Return
+    # ==============================================================================
+    return dataTime
+
+#######################################################################################################################
+# References
+#######################################################################################################################
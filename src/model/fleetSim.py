@@ -0,0 +1,401 @@
+#######################################################################################################################
+#######################################################################################################################
+# Title:        Python Electric Vehicle Power Toolkit (PyEVPowerKit)
+# Topic:        EV Modeling
+# File:         fleetSim
+# Date:         18.03.2024
+# Author:       Dr. Pascal A. Schirmer
+# Version:      V.0.1
+# Copyright:    Pascal Schirmer
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+# Function Description
+#######################################################################################################################
+"""
+These functions simulate a fleet of logged trips (all mission profiles of a folder) and aggregate them into one fleet
+report. Every trip is simulated by a worker process with the pipeline of the driving simulation (runSim, map-based or
+time-domain fidelity of setup['Exp']['fid']), which only returns a mergeable summary of the run, such that a worker
+never holds more than the time series of one trip and the fleet is aggregated at constant memory. The summaries are
+merged in the order in which the runs finish:
+
+- Duration, driving time, distance, and energies (HVS, wheel, and component losses) are summed.
+- Peak temperatures are the maximum, temperature percentiles are read from quantile sketches (time at temperature
+  histograms with setup['Exp']['fleetDt'] resolution, see classHist), which are merged exactly.
+- Damage accumulators (Arrhenius, Prokopovic, and Coffin-Manson, see classDmg) are merged, and the fleet lifetime is
+  evaluated as if the pooled trips were repeated over the lifetime criteria of getCycles.
+- Load spectra (classHist) are merged if enabled (setup['Exp']['hist']), the decimated recordings of the trips are kept
+  if enabled (setup['Exp']['rec']).
+- Temperatures, damage, load spectra, and recordings are only available for the time-domain simulation.
+
+Fnc:
+1)  calcRun:    time-domain simulation of one trip returning its summary
+2)  mergeRun:   merges the summary of a trip into the fleet summary
+3)  calcQnt:    quantiles of a quantile sketch
+4)  fleetSim:   simulates all trips of a folder and returns the fleet report
+
+"""
+
+#######################################################################################################################
+# Import libs
+#######################################################################################################################
+# ==============================================================================
+# Internal
+# ==============================================================================
+from src.data.loadData import loadData
+from src.data.loadSetup import loadSetup
+from src.data.sampleData import sampleData
+from src.general.mechVehPara import mechVehPara
+from src.general.smallFnc import getCycles, getTopo
+from src.model.cycSim import initVeh
+from src.model.runSim import runSim
+from src.model.classRec import getTs
+from src.model.classHist import classHist, getHist
+from src.model.reliaSim import reliaSim, calcLife
+
+# ==============================================================================
+# External
+# ==============================================================================
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from os.path import join as pjoin
+from datetime import datetime
+from scipy.io import savemat
+from tqdm import tqdm
+import numpy as np
+import copy
+import os
+
+
+#######################################################################################################################
+# Additional Functions
+#######################################################################################################################
+def calcQnt(H, edges, q):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function returns the quantiles q of a quantile sketch (time at level histogram) per motor unit, interpolated
+    linearly within the bins, i.e. the error is below the bin width.
+
+    Input:
+    1) H:       residence times (motor units x bins)
+    2) edges:   bin edges (motor units x bins + 1)
+    3) q:       quantiles (p.u.)
+
+    Output:
+    1) x:       values of the quantiles (motor units x quantiles)
+    """
+
+    # ==============================================================================
+    # Calculation
+    # ==============================================================================
+    x = np.zeros((H.shape[0], len(q)))
+    for u in range(H.shape[0]):
+        cdf = np.concatenate(([0], np.cumsum(H[u])))
+        if cdf[-1] > 0:
+            x[u] = np.interp(q, cdf / cdf[-1], edges[u])
+        else:
+            x[u] = np.nan
+
+    # ==============================================================================
+    # Return
+    # ==============================================================================
+    return x
+
+
+#######################################################################################################################
+# Trip
+#######################################################################################################################
+def calcRun(name, path, setup):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function simulates one trip (vehicle level and runSim, see main) and returns the mergeable summary of the run.
+    The time series are dropped when the function returns, only the decimated recording is kept (setup['Exp']['rec']).
+    For the decimated recording the energies and quantile sketches are weighted with the window lengths, the distance
+    and peak temperatures are taken from the window maxima, and the damage is accumulated during the simulation.
+
+    Input:
+    1) name:    name of the mission profile (data file of the trip)
+    2) path:    includes all path variables (datPath is the folder of the trips)
+    3) setup:   includes all simulation variables
+
+    Output:
+    1) run:     summary of the trip (cycle, energies, and for the time-domain simulation peak temperatures, quantile
+                sketches, damage, load spectra, and decimated recording)
+    """
+
+    # ==============================================================================
+    # Loading
+    # ==============================================================================
+    setup = copy.deepcopy(setup)
+    setup['Dat']['name'] = name
+    setup = loadSetup(setup, path)
+    data = sampleData(loadData(setup, path), setup)
+    setup = getTopo(mechVehPara(getCycles(data, setup)))
+
+    # ==============================================================================
+    # Simulation (see main)
+    # ==============================================================================
+    [data, dataTime] = initVeh(data, setup)
+    E_whe = dataTime['VEH']['E']['t'][-1] / 3.6e6
+    [data, dataTime, [GBX, EMA, INV, HVS, _], dataHist, dataDmg] = runSim(data, dataTime, path, setup)
+
+    # ==============================================================================
+    # Summary
+    # ==============================================================================
+    # ------------------------------------------
+    # Cycle
+    # ------------------------------------------
+    dt = 1 / setup['Dat']['fs']
+    v = data['v'].values
+    peak = dataTime['REC']['max'] if 'REC' in dataTime else dataTime
+    run = {'name': name, 'cyc': {'T': len(v) * dt, 'T_drive': np.sum(v != 0) * dt, 's': peak['VEH']['s'][-1]}}
+
+    # ------------------------------------------
+    # Energies (kWh)
+    # ------------------------------------------
+    Ts = getTs(dataTime, setup)
+    run['E'] = {'HVS': np.sum(dataTime['HVS']['Pin'] * Ts) / 3.6e6, 'WHE': E_whe}
+    for comp in ['GBX', 'EMA', 'INV', 'HVS']:
+        Pv = dataTime[comp]['Pv'] if comp == 'HVS' else dataTime[comp]['T']['Pv']
+        run['E']['Pv_' + comp] = np.sum(Pv * Ts) / 3.6e6
+
+    # ------------------------------------------
+    # Time-Domain Simulation (temperatures, damage, load spectra, and recording)
+    # ------------------------------------------
+    if setup['Exp']['fid'] == 2:
+        # Temperatures (peak and quantile sketch)
+        run['Tmax'] = {}
+        run['qnt'] = {}
+        COM = {'GBX': GBX, 'EMA': EMA, 'INV': INV, 'HVS': [HVS]}
+        for comp in COM:
+            T = dataTime[comp]['T'].reshape(len(Ts), -1) if comp == 'HVS' else dataTime[comp]['U']['T']
+            Tp = peak[comp]['T'].reshape(len(Ts), -1) if comp == 'HVS' else peak[comp]['U']['T']
+            nBin = int(np.ceil((max(x.T_max for x in COM[comp]) + 40) / setup['Exp']['fleetDt']))
+            lo = -40 * np.ones((1, T.shape[1]))
+            run['Tmax'][comp] = np.max(Tp, axis=0)
+            run['qnt'][comp] = classHist(lo, lo + nBin * setup['Exp']['fleetDt'], nBin)
+            run['qnt'][comp].update(T.T[None], Ts)
+
+        # Damage
+        run['dmg'] = reliaSim(GBX, EMA, INV, HVS, dataTime, setup, dataDmg)[1]
+
+        # Load Spectra
+        if dataHist is not None:
+            run['hist'] = dataHist
+
+        # Recording (decimated time series of the trip)
+        if 'REC' in dataTime:
+            run['rec'] = dataTime
+
+    # ==============================================================================
+    # Return
+    # ==============================================================================
+    return run
+
+
+#######################################################################################################################
+# Merging
+#######################################################################################################################
+def mergeRun(fleet, run):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function merges the summary of a trip into the fleet summary (in place). The first trip initialises the fleet
+    summary, per trip only the name, distance, HVS energy, peak temperatures, and decimated recording are kept.
+
+    Input:
+    1) fleet:   fleet summary (empty dict before the first trip)
+    2) run:     summary of the trip (see calcRun)
+    """
+
+    # ==============================================================================
+    # Initialisation
+    # ==============================================================================
+    row = {'name': run['name'], 's': run['cyc']['s'], 'E': run['E']['HVS']}
+    for key in ['Tmax', 'rec']:
+        if key in run:
+            row[key] = run[key]
+    if not fleet:
+        fleet.update(copy.deepcopy({x: run[x] for x in run if x not in ['name', 'rec']}))
+        fleet['runs'] = [row]
+        return
+
+    # ==============================================================================
+    # Calculation
+    # ==============================================================================
+    # ------------------------------------------
+    # Sums
+    # ------------------------------------------
+    for key in ['cyc', 'E']:
+        for x in run[key]:
+            fleet[key][x] = fleet[key][x] + run[key][x]
+
+    # ------------------------------------------
+    # Temperatures
+    # ------------------------------------------
+    for comp in run.get('Tmax', {}):
+        fleet['Tmax'][comp] = np.maximum(fleet['Tmax'][comp], run['Tmax'][comp])
+        fleet['qnt'][comp].merge(run['qnt'][comp])
+
+    # ------------------------------------------
+    # Damage
+    # ------------------------------------------
+    if 'dmg' in run:
+        fleet['dmg']['Arr'].merge(run['dmg']['Arr'])
+        fleet['dmg']['Pro'].merge(run['dmg']['Pro'])
+        for i in range(len(fleet['dmg']['Cof'])):
+            fleet['dmg']['Cof'][i].merge(run['dmg']['Cof'][i])
+
+    # ------------------------------------------
+    # Load Spectra
+    # ------------------------------------------
+    if 'hist' in run:
+        for comp in run['hist']:
+            for name in run['hist'][comp]:
+                fleet['hist'][comp][name].merge(run['hist'][comp][name])
+
+    # ------------------------------------------
+    # Trips
+    # ------------------------------------------
+    fleet['runs'].append(row)
+
+
+#######################################################################################################################
+# Main Function
+#######################################################################################################################
+def fleetSim(setup, path):
+    ###################################################################################################################
+    # MSG IN
+    ###################################################################################################################
+    print("----------------------------------------------------------------------------------------------------------")
+    print("Fleet Simulation")
+    print("----------------------------------------------------------------------------------------------------------")
+
+    ###################################################################################################################
+    # Initialisation
+    ###################################################################################################################
+    # ==============================================================================
+    # Trips
+    # ==============================================================================
+    folder = pjoin(path['datPath'], setup['Exp']['fleetDir'])
+    names = sorted(os.path.splitext(x)[0] for x in os.listdir(folder) if x.endswith('.xlsx') and not x.startswith('~'))
+    path = dict(path, datPath=folder)
+    W = setup['Exp']['fleetWorker']
+    fleet = {}
+    fail = []
+    if setup['Exp']['fid'] not in [1, 2]:
+        raise ValueError("ERROR: The fleet simulation requires the map-based (fid = 1) or time-domain (fid = 2) "
+                         "simulation of the trips")
+    print("INFO: Simulating ", len(names), " trips of ", folder, " on ", W, " worker(s)")
+
+    ###################################################################################################################
+    # Calculation
+    ###################################################################################################################
+    # ==============================================================================
+    # Sequential
+    # ==============================================================================
+    if W <= 1:
+        for name in tqdm(names, desc='Fleet'):
+            try:
+                mergeRun(fleet, calcRun(name, path, setup))
+            except Exception as e:
+                fail.append(name)
+                print("WARN: Trip ", name, " failed (", repr(e), ")")
+
+    # ==============================================================================
+    # Worker Pool (bounded number of pending runs)
+    # ==============================================================================
+    else:
+        with ProcessPoolExecutor(max_workers=W) as pool, tqdm(total=len(names), desc='Fleet') as bar:
+            queue = iter(names)
+            pending = {}
+            while True:
+                for name in queue:
+                    pending[pool.submit(calcRun, name, path, setup)] = name
+                    if len(pending) >= 2 * W:
+                        break
+                if not pending:
+                    break
+                [done, _] = wait(pending, return_when=FIRST_COMPLETED)
+                for f in done:
+                    name = pending.pop(f)
+                    try:
+                        mergeRun(fleet, f.result())
+                    except Exception as e:
+                        fail.append(name)
+                        print("WARN: Trip ", name, " failed (", repr(e), ")")
+                    bar.update(1)
+
+    ###################################################################################################################
+    # Post-Processing
+    ###################################################################################################################
+    if not fleet:
+        print("ERROR: No trip of the fleet could be simulated")
+        return {}
+
+    # ==============================================================================
+    # Lifetime (pooled trips repeated over the lifetime, see getCycles) and Trips (sorted)
+    # ==============================================================================
+    cyc = fleet['cyc']
+    runs = sorted(fleet['runs'], key=lambda x: x['name'])
+    N_cyc = min(setup['Exp']['on'] * 3600 / cyc['T_drive'], setup['Exp']['km'] * 1000 / cyc['s'],
+                setup['Exp']['life'] * 3600 / cyc['T'])
+
+    # ==============================================================================
+    # Report
+    # ==============================================================================
+    q = np.array(setup['Exp']['fleetQ'], dtype=float)
+    dataFleet = {'N': len(fleet['runs']), 'fail': fail, 'T': cyc['T'] / 3600, 'T_drive': cyc['T_drive'] / 3600,
+                 's': cyc['s'] / 1000, 'E': fleet['E'], 'eta': fleet['E']['HVS'] / (cyc['s'] / 1e5), 'q': q,
+                 'cyc': N_cyc, 'Tmax': {}, 'Tq': {}, 'life': {},
+                 'runs': {'name': [x['name'] for x in runs], 's': np.array([x['s'] for x in runs]),
+                          'E': np.array([x['E'] for x in runs])}}
+    if 'dmg' in fleet:
+        dataFleet['Tmax'] = fleet['Tmax']
+        dataFleet['Tq'] = {x: calcQnt(fleet['qnt'][x].H, fleet['qnt'][x].edges()[0], q) for x in fleet['qnt']}
+        dataFleet['life'] = calcLife([fleet['dmg']], [N_cyc])
+        dataFleet['runs']['Tmax'] = {y: np.array([x['Tmax'][y] for x in runs]) for y in fleet['Tmax']}
+    if 'hist' in fleet:
+        dataFleet['HIST'] = getHist(fleet['hist'])
+    if 'rec' in runs[0]:
+        dataFleet['runs']['rec'] = [x['rec'] for x in runs]
+
+    # ==============================================================================
+    # Saving
+    # ==============================================================================
+    if setup['Exp']['save'] == 1:
+        name = 'result_Fleet_' + setup['Exp']['name'] + '_' + datetime.now().strftime("%d_%m_%Y_%H_%M_%S") + '.mat'
+        savemat(pjoin(path['resPath'], name), dataFleet)
+        print("INFO: Fleet report saved")
+
+    ###################################################################################################################
+    # MSG Out
+    ###################################################################################################################
+    print("INFO: Fleet of ", dataFleet['N'], " trips (", len(fail), " failed), ", round(dataFleet['s'], 1), " km, ",
+          round(dataFleet['T'], 2), " h")
+    print("INFO: Energy consumption ", round(dataFleet['E']['HVS'], 3), " kWh (", round(dataFleet['eta'], 2),
+          " kWh/100km)")
+    for comp in dataFleet['Tmax']:
+        print("INFO: ", comp, " peak temperature ", np.round(dataFleet['Tmax'][comp], 1), " degC, percentiles ",
+              dict(zip((q * 100).tolist(), np.round(dataFleet['Tq'][comp].T, 1).tolist())))
+    if dataFleet['life']:
+        print("DONE: Fleet simulation, lifetime evaluated for ", round(N_cyc, 1), " repetitions of the fleet trips")
+    else:
+        print("DONE: Fleet simulation, lifetime disabled for the map-based simulation")
+
+    ###################################################################################################################
+    # Return
+    ###################################################################################################################
+    return dataFleet
+
+#######################################################################################################################
+# References
+#######################################################################################################################
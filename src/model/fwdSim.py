@@ -0,0 +1,276 @@
+#######################################################################################################################
+#######################################################################################################################
+# Title:        Python Electric Vehicle Power Toolkit (PyEVPowerKit)
+# Topic:        EV Modeling
+# File:         fwdSim
+# Date:         18.03.2024
+# Author:       Dr. Pascal A. Schirmer
+# Version:      V.0.1
+# Copyright:    Pascal Schirmer
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+# Function Description
+#######################################################################################################################
+"""
+These functions implement the forward simulation of the vehicle. A driver model (classDrv) tracks the speed of the
+mission profile, the wheel torque request is limited by the wheel torque envelope of the drivetrain (see perfSim), and
+the vehicle speed is integrated from the acceleration (classVEH.calc_acc). The result shows whether a design is able
+to follow a mission profile.
+
+The simulation is batched: the vehicles of the batch are stacked into one classVEH instance with array parameters and
+the envelopes are stored on a normalised speed axis, such that the driver, the drivetrain, and the vehicle of all
+vehicles and mission profiles are evaluated with one vectorized call per time step. Mission profiles of different
+length are padded with their last sample and masked in the evaluation.
+
+Fnc:
+1)  calcFwd:    batched forward simulation
+2)  calcErr:    tracking errors of the batch
+3)  fwdSim:     forward simulation of the mission profile of the setup
+4)  fwdBatch:   forward simulation of a batch of setups (vehicles and mission profiles)
+
+"""
+
+#######################################################################################################################
+# Import libs
+#######################################################################################################################
+# ==============================================================================
+# Internal
+# ==============================================================================
+from src.data.loadData import loadData
+from src.data.loadSetup import loadSetup
+from src.data.sampleData import sampleData
+from src.general.mechVehPara import mechVehPara
+from src.general.smallFnc import getTopo
+from src.model.initComp import initComp
+from src.model.perfSim import calcEnv, getVdc
+from src.model.Veh.classDrv import classDrv
+
+# ==============================================================================
+# External
+# ==============================================================================
+from tqdm import tqdm
+import numpy as np
+import copy
+
+
+#######################################################################################################################
+# Additional Functions
+#######################################################################################################################
+def calcErr(v, v_ref, mask, sat, setup):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function calculates the tracking errors (km/h) of the batch. A mission profile is followed if the speed error
+    stays within setup['Exp']['drvTol'].
+    """
+
+    e = np.abs(v - v_ref) * 3.6 * mask
+    N = np.sum(mask, axis=1)
+
+    return {'max': np.max(e, axis=1), 'rms': np.sqrt(np.sum(e ** 2, axis=1) / N),
+            'out': np.sum(e > setup['Exp']['drvTol'], axis=1) / N, 'sat': np.sum(sat * mask, axis=1) / N,
+            'ok': np.max(e, axis=1) <= setup['Exp']['drvTol']}
+
+
+#######################################################################################################################
+# Calculation
+#######################################################################################################################
+def calcFwd(VEH, env, v_ref, ang, dt, par, setup):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function calculates the batched forward simulation. The feed-forward torque is the wheel torque required to
+    reach the speed of the next sample (classVEH.calc_force), the driver corrects the speed error.
+
+    Input:
+    1) VEH:     VEH instance with array parameters (one entry per vehicle of the batch)
+    2) env:     speed limit (m/s) and wheel torque envelope on the normalised speed axis (Nm) of the batch
+    3) v_ref:   speed of the mission profiles (m/s), batch x samples
+    4) ang:     surface angle of the mission profiles (rad), batch x samples
+    5) dt:      discrete time step (sec)
+    6) par:     parameters of the batch (setup['Par'] with array values)
+    7) setup:   includes all simulation variables
+
+    Output:
+    1) out:     speed (m/s), acceleration (m/s2), wheel torque (Nm), and saturation of the driver
+    """
+
+    # ==============================================================================
+    # Initialisation
+    # ==============================================================================
+    [B, N] = v_ref.shape
+    k = (VEH.m + par['Par']['VEH']['m_a']) * par['Par']['VEH']['r_dyn']
+    drv = classDrv(setup['Exp']['drvKp'], setup['Exp']['drvKi'], B)
+    nEnv = env['M'].shape[1]
+    out = {'v': np.zeros((B, N)), 'a': np.zeros((B, N)), 'M': np.zeros((B, N)), 'sat': np.zeros((B, N), dtype=bool)}
+
+    # ==============================================================================
+    # Calculation
+    # ==============================================================================
+    for i in tqdm(range(N), desc='Forward Simulation'):
+        # ------------------------------------------
+        # State
+        # ------------------------------------------
+        v = out['v'][:, i]
+        a_ref = (v_ref[:, min(i + 1, N - 1)] - v_ref[:, i]) / dt
+
+        # ------------------------------------------
+        # Envelope
+        # ------------------------------------------
+        x = np.clip(v / env['v_lim'], 0, 1) * (nEnv - 1)
+        j = np.minimum(np.floor(x).astype(int), nEnv - 2)
+        w = x - j
+        M_max = (1 - w) * env['M'][np.arange(B), j] + w * env['M'][np.arange(B), j + 1]
+        M_max = np.where(v < env['v_lim'], M_max, 0)
+
+        # ------------------------------------------
+        # Driver
+        # ------------------------------------------
+        M_ff = VEH.calc_force(v_ref[:, i], a_ref, ang[:, i], par)[4] * par['Par']['VEH']['r_dyn']
+        [M, sat] = drv.calc_ctrl(v_ref[:, i] - v, M_ff, M_max, k, dt)
+
+        # ------------------------------------------
+        # Vehicle
+        # ------------------------------------------
+        a = VEH.calc_acc(M, v, ang[:, i], par)
+        a = np.maximum(a, -v / dt)
+        out['a'][:, i] = a
+        out['M'][:, i] = M
+        out['sat'][:, i] = sat
+        if i < N - 1:
+            out['v'][:, i + 1] = v + a * dt
+
+    # ==============================================================================
+    # Return
+    # ==============================================================================
+    return out
+
+
+#######################################################################################################################
+# Main Function
+#######################################################################################################################
+def fwdSim(GBX, EMA, VEH, data, dataTime, setup):
+    ###################################################################################################################
+    # MSG IN
+    ###################################################################################################################
+    print("INFO: Calculating forward simulation")
+
+    ###################################################################################################################
+    # Calculation
+    ###################################################################################################################
+    dataFwd = fwdBatch([setup], None, [(GBX, EMA, VEH, data, dataTime['VEH']['Vdc'][0])])[0]
+
+    ###################################################################################################################
+    # MSG Out
+    ###################################################################################################################
+    print("DONE: Forward simulation calculated")
+
+    ###################################################################################################################
+    # Return
+    ###################################################################################################################
+    return dataFwd
+
+
+#######################################################################################################################
+# Batch
+#######################################################################################################################
+def fwdBatch(setups, path, comp=None):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function calculates the forward simulation of a batch of setups. Every setup defines a vehicle (setup['Par'])
+    and a mission profile (setup['Dat']), which are loaded if comp is not given. All setups of the batch must have the
+    same sampling rate.
+
+    Input:
+    1) setups:  list of setups
+    2) path:    includes all path variables
+    3) comp:    list of loaded components and mission profiles (GBX, EMA, VEH, data, Vdc) per setup (optional)
+
+    Output:
+    1) dataFwd: list of forward simulations (speed, reference speed, acceleration, wheel torque, errors)
+    """
+
+    # ==============================================================================
+    # Initialisation
+    # ==============================================================================
+    # ------------------------------------------
+    # Sampling rate
+    # ------------------------------------------
+    fs = [x['Dat']['fs'] for x in setups]
+    if any(x != fs[0] for x in fs):
+        raise ValueError("ERROR: Setups of the forward simulation batch have different sampling rates " + str(fs))
+
+    # ------------------------------------------
+    # Loading
+    # ------------------------------------------
+    if comp is None:
+        comp = []
+        for i in range(len(setups)):
+            setups[i] = loadSetup(copy.deepcopy(setups[i]), path)
+            data = sampleData(loadData(setups[i], path), setups[i])
+            setups[i] = getTopo(mechVehPara(setups[i]))
+            [GBX, EMA, _, _, VEH] = initComp(setups[i])
+            comp.append((GBX, EMA, VEH, data, getVdc(setups[i])))
+
+    # ------------------------------------------
+    # Mission profiles (padded)
+    # ------------------------------------------
+    B = len(setups)
+    dt = 1 / fs[0]
+    L = [len(x[3]['t']) for x in comp]
+    N = max(L)
+    v_ref = np.array([np.pad(np.asarray(x[3]['v'], float).ravel(), (0, N - n), mode='edge') for x, n in zip(comp, L)])
+    ang = np.array([np.pad(np.asarray(x[3]['ang'], float).ravel(), (0, N - n), mode='edge') for x, n in zip(comp, L)])
+    mask = np.arange(N)[None, :] < np.array(L)[:, None]
+
+    # ------------------------------------------
+    # Envelopes
+    # ------------------------------------------
+    env = [calcEnv(x[0], x[1], x[4], s) for x, s in zip(comp, setups)]
+    env = {'v_lim': np.array([x['v_lim'] for x in env]), 'M': np.array([x['M'] for x in env])}
+
+    # ------------------------------------------
+    # Vehicles (stacked)
+    # ------------------------------------------
+    VEH = copy.copy(comp[0][2])
+    for x in vars(VEH):
+        setattr(VEH, x, np.array([getattr(c[2], x) for c in comp]))
+    par = {'Par': {y: np.array([s['Par'][y] for s in setups]) for y in ['p_a', 'v_w']}}
+    par['Par']['VEH'] = {y: np.array([s['Par']['VEH'][y] for s in setups]) for y in ['m_a', 'r_dyn']}
+
+    # ==============================================================================
+    # Calculation
+    # ==============================================================================
+    out = calcFwd(VEH, env, v_ref, ang, dt, par, setups[0])
+    err = calcErr(out['v'], v_ref, mask, out['sat'], setups[0])
+
+    # ==============================================================================
+    # Post-Processing
+    # ==============================================================================
+    dataFwd = []
+    for b in range(B):
+        dataFwd.append({'t': np.arange(L[b]) * dt, 'v': out['v'][b, :L[b]], 'v_ref': v_ref[b, :L[b]],
+                        'a': out['a'][b, :L[b]], 'M': out['M'][b, :L[b]], 'sat': out['sat'][b, :L[b]],
+                        'err': {x: err[x][b] for x in err}})
+        print("INFO: Forward simulation ", setups[b]['Par']['name'], " ", setups[b]['Par']['xwd'], " ",
+              setups[b]['Dat']['name'], " max. speed error ", round(err['max'][b], 2), " km/h, rms ",
+              round(err['rms'][b], 3), " km/h, outside tolerance ", round(err['out'][b] * 100, 2), " %, followed: ",
+              bool(err['ok'][b]))
+
+    # ==============================================================================
+    # Return
+    # ==============================================================================
+    return dataFwd
+
+#######################################################################################################################
+# References
+#######################################################################################################################
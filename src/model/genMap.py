@@ -0,0 +1,430 @@
+#######################################################################################################################
+#######################################################################################################################
+# Title:        Python Electric Vehicle Power Toolkit (PyEVPowerKit)
+# Topic:        EV Modeling
+# File:         genMap
+# Date:         18.03.2024
+# Author:       Dr. Pascal A. Schirmer
+# Version:      V.0.1
+# Copyright:    Pascal Schirmer
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+# Function Description
+#######################################################################################################################
+"""
+These functions generate the efficiency and loss maps of an electric machine and its inverter. The electrical solution
+(classPSM.calc_elec, classB6.calc_elec) and the losses (calc_loss) are evaluated over a speed x torque grid, optionally
+for several DC-link voltages and temperatures. The grid rows (one speed per row) are distributed over a process pool.
+The maps are stored in a compressed binary file (numpy npz) under results/cache, named by the hash of the EMA and INV
+parameters and the grid, such that a map is only calculated once per parameter set.
+
+With adaptive refinement (setup['Exp']['mapRef'] = 1) the speed x torque plane is covered by a quadtree starting
+from a coarse grid. A cell is subdivided if the bilinear interpolation of the EMA or INV input power or losses of its
+corners deviates from the solver by more than setup['Exp']['mapTol'] (relative to the solved value, at least 1 W) at
+the cell centre or the edge midpoints. Only the solved nodes
+and the leaf cells are stored, the remaining nodes of the fine grid (mapN nodes per axis) are interpolated from their
+leaf cell when loading.
+
+Fnc:
+1)  getHash:    hash of the EMA and INV parameters and the grid
+2)  calcRow:    calculates one row (speed) or a list of operating points of the maps
+3)  calcPool:   distributes the rows over the process pool
+4)  calcRef:    adaptive quadtree refinement of the maps
+5)  fillMap:    interpolates the nodes of the fine grid from the leaf cells
+6)  genMap:     loads the maps from the cache or calculates them
+
+Map:
+The axes are 'Vdc' (V), 'T' (degC), 'n' (1/s, machine speed), and 'M' (Nm, shaft torque). The channels EMA ('M_Ema',
+'Pin', 'Pv', 'eta') and INV ('Pin', 'Pv', 'Idc', 'eta') have the shape (Vdc, T, n, M).
+
+"""
+
+#######################################################################################################################
+# Import libs
+#######################################################################################################################
+# ==============================================================================
+# Internal
+# ==============================================================================
+
+# ==============================================================================
+# External
+# ==============================================================================
+from concurrent.futures import ProcessPoolExecutor
+from os.path import join as pjoin
+from tqdm import tqdm
+import numpy as np
+import hashlib
+import json
+import os
+
+
+#######################################################################################################################
+# Additional Functions
+#######################################################################################################################
+def getHash(parEMA, parINV, grid, setup):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function returns the hash of the EMA and INV parameters, the grid, and the solver settings.
+    """
+
+    key = {'EMA': parEMA, 'INV': parINV, 'grid': {x: np.asarray(grid[x]).tolist() for x in grid},
+           'fs': setup['Par']['INV']['fs'], 'lim': setup['Exp']['lim'], 'sol': setup['Par']['sol'],
+           'iterMax': setup['Par']['iterMax'], 'ref': setup['Exp']['mapRef'], 'env': setup['Exp']['env']}
+    if setup['Exp']['mapRef'] == 1:
+        key['tol'] = setup['Exp']['mapTol']
+    if setup['Exp']['env'] == 1:
+        key['envN'] = setup['Exp']['envN']
+        key['envDv'] = setup['Exp']['envDv']
+        key['envDt'] = setup['Exp']['envDt']
+
+    return hashlib.sha1(json.dumps(key, sort_keys=True, default=str).encode()).hexdigest()[0:16]
+
+
+def calcRow(EMA, INV, n, M, Vdc, T, setup):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function calculates one row (one speed) or a list of operating points of the maps at a DC-link voltage and
+    temperature.
+
+    Input:
+    1) EMA:     EMA instance
+    2) INV:     INV instance
+    3) n:       Speed of the row or speed values of the operating points (1/s)
+    4) M:       Shaft torque values (Nm)
+    5) Vdc:     DC-link voltage (V)
+    6) T:       Temperature of the machine and the inverter (degC)
+    7) setup:   includes all simulation variables
+
+    Output:
+    1) out:     channels of the row (EMA: M_Ema, Pin, Pv, eta; INV: Pin, Pv, Idc, eta)
+    """
+
+    # ==============================================================================
+    # Initialisation
+    # ==============================================================================
+    out = np.zeros((8, len(M)))
+    n = np.broadcast_to(n, np.shape(M))
+
+    # ==============================================================================
+    # Calculation
+    # ==============================================================================
+    for j in range(len(M)):
+        # ------------------------------------------
+        # EMA
+        # ------------------------------------------
+        [M_Ema, n_Ema, _, _, _] = EMA.calc_mech(M[j], n[j], setup)
+        [_, _, Is, _, _, Vs, _, Pin, _, _, eta, PF, _, _] = EMA.calc_elec(n_Ema, M_Ema, Vdc, T, setup)
+        [Pv, _, _, _] = EMA.calc_loss(n_Ema, Is, Vs, Vdc, INV.fs, T)
+        out[0:4, j] = [M_Ema, Pin, Pv, eta]
+
+        # ------------------------------------------
+        # INV
+        # ------------------------------------------
+        [Mi, Idc, Ic, Pin, _, Pv, eta] = INV.calc_elec(PF, Vs, Is, Vdc, T, setup)
+        [Pv, _, _, _, _] = INV.calc_loss(Mi, PF, Is, Ic, Idc - Pv / Vdc, Vdc, T)
+        out[4:8, j] = [Pin, Pv, Idc, eta]
+
+    return out
+
+
+def calcPool(arg, setup):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function evaluates calcRow for a list of arguments on setup['Exp']['mapWorker'] processes.
+    """
+
+    if setup['Exp']['mapWorker'] > 1:
+        with ProcessPoolExecutor(max_workers=setup['Exp']['mapWorker']) as pool:
+            return list(tqdm(pool.map(calcRow, *zip(*arg)), total=len(arg), desc='Efficiency Maps'))
+    else:
+        return [calcRow(*x) for x in tqdm(arg, desc='Efficiency Maps')]
+
+
+def calcRef(EMA, INV, grid, setup):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function refines the maps adaptively (quadtree). The coarse grid uses every s0-th node of the fine grid, where
+    s0 is the largest power of two (at most 16) dividing mapN - 1 with at least two coarse cells per axis. The cells
+    of all voltages and temperatures are refined level by level, the new nodes of a level are evaluated together on
+    the process pool.
+
+    Input:
+    1) EMA:     EMA instance
+    2) INV:     INV instance
+    3) grid:    axes of the maps
+    4) setup:   includes all simulation variables
+
+    Output:
+    1) idx:     indices (Vdc, T, n, M) of the solved nodes
+    2) val:     channels of the solved nodes
+    3) leaf:    leaf cells (Vdc, T, n, M, size)
+    """
+
+    # ==============================================================================
+    # Initialisation
+    # ==============================================================================
+    # ------------------------------------------
+    # Coarse grid
+    # ------------------------------------------
+    N = len(grid['n'])
+    s = 1
+    while s < 16 and (N - 1) % (2 * s) == 0 and (N - 1) // (2 * s) >= 2:
+        s = 2 * s
+
+    # ------------------------------------------
+    # Variables
+    # ------------------------------------------
+    shape = (len(grid['Vdc']), len(grid['T']), N, N)
+    val = np.full((8,) + shape, np.nan)
+    done = np.zeros(shape, dtype=bool)
+    pts = [(a, b, i, j) for a in range(shape[0]) for b in range(shape[1]) for i in range(0, N, s)
+           for j in range(0, N, s)]
+    cell = np.array([(a, b, i, j) for a in range(shape[0]) for b in range(shape[1]) for i in range(0, N - 1, s)
+                     for j in range(0, N - 1, s)])
+    leaf = []
+
+    # ==============================================================================
+    # Calculation
+    # ==============================================================================
+    while True:
+        # ------------------------------------------
+        # Evaluation of new nodes
+        # ------------------------------------------
+        pts = sorted(set(x for x in pts if not done[x]))
+        arg = []
+        grp = []
+        for a in range(shape[0]):
+            for b in range(shape[1]):
+                sub = [x for x in pts if x[0] == a and x[1] == b]
+                for k in range(0, len(sub), N):
+                    grp.append(sub[k:k + N])
+                    arg.append((EMA, INV, grid['n'][[x[2] for x in sub[k:k + N]]],
+                                grid['M'][[x[3] for x in sub[k:k + N]]], grid['Vdc'][a], grid['T'][b], setup))
+        if len(arg) > 0:
+            row = calcPool(arg, setup)
+            for k in range(len(grp)):
+                for m, x in enumerate(grp[k]):
+                    val[(slice(None),) + x] = row[k][:, m]
+                    done[x] = True
+
+        # ------------------------------------------
+        # Finest level
+        # ------------------------------------------
+        if s == 1 or len(cell) == 0:
+            leaf += [tuple(x) + (s,) for x in cell]
+            break
+
+        # ------------------------------------------
+        # Test points (centre and edge midpoints)
+        # ------------------------------------------
+        h = s // 2
+        off = [(h, h), (h, 0), (h, s), (0, h), (s, h)]
+        pts = [(a, b, i + p, j + q) for (a, b, i, j) in cell for (p, q) in off]
+        if not all(done[x] for x in pts):
+            continue
+
+        # ------------------------------------------
+        # Interpolation error (input power and losses of the EMA and INV, relative)
+        # ------------------------------------------
+        [a, b, i, j] = cell.T
+        err = np.zeros(len(cell))
+        for (p, q) in off:
+            [wn, wm] = [p / s, q / s]
+            for c in [1, 2, 4, 5]:
+                f = ((1 - wn) * (1 - wm) * val[c][a, b, i, j] + wn * (1 - wm) * val[c][a, b, i + s, j] +
+                     (1 - wn) * wm * val[c][a, b, i, j + s] + wn * wm * val[c][a, b, i + s, j + s])
+                y = val[c][a, b, i + p, j + q]
+                err = np.maximum(err, np.abs(f - y) / np.maximum(np.abs(y), 1))
+
+        # ------------------------------------------
+        # Subdivision
+        # ------------------------------------------
+        ref = err > setup['Exp']['mapTol']
+        leaf += [tuple(x) + (s,) for x in cell[~ref]]
+        cell = np.array([(a, b, i + p, j + q) for (a, b, i, j) in cell[ref] for (p, q) in [(0, 0), (h, 0), (0, h),
+                                                                                           (h, h)]])
+        s = h
+        pts = []
+
+    # ==============================================================================
+    # Return
+    # ==============================================================================
+    idx = np.argwhere(done)
+
+    return [idx, val[(slice(None),) + tuple(idx.T)], np.array(leaf)]
+
+
+def fillMap(idx, val, leaf, shape):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function reconstructs the maps on the fine grid from the solved nodes. Nodes that were not solved are
+    interpolated bilinearly from the corners of their leaf cell, starting with the smallest cells.
+
+    Input:
+    1) idx:     indices (Vdc, T, n, M) of the solved nodes
+    2) val:     channels of the solved nodes
+    3) leaf:    leaf cells (Vdc, T, n, M, size)
+    4) shape:   shape of the maps (Vdc, T, n, M)
+
+    Output:
+    1) out:     channels on the fine grid
+    """
+
+    # ==============================================================================
+    # Initialisation
+    # ==============================================================================
+    out = np.full((val.shape[0],) + tuple(shape), np.nan)
+    out[(slice(None),) + tuple(idx.T)] = val
+
+    # ==============================================================================
+    # Calculation
+    # ==============================================================================
+    for (a, b, i, j, s) in leaf[np.argsort(leaf[:, 4], kind='stable')]:
+        w = np.linspace(0, 1, s + 1)
+        [p, q] = np.meshgrid(w, w, indexing='ij')
+        blk = out[:, a, b, i:i + s + 1, j:j + s + 1]
+        f = ((1 - p) * (1 - q) * blk[:, 0:1, 0:1] + p * (1 - q) * blk[:, -1:, 0:1] + (1 - p) * q * blk[:, 0:1, -1:] +
+             p * q * blk[:, -1:, -1:])
+        out[:, a, b, i:i + s + 1, j:j + s + 1] = np.where(np.isnan(blk), f, blk)
+
+    return out
+
+
+#######################################################################################################################
+# Main Function
+#######################################################################################################################
+def genMap(EMA, INV, parEMA, parINV, path, setup):
+    ###################################################################################################################
+    # Description
+    ###################################################################################################################
+    """
+    This function returns the efficiency maps of a machine and inverter. The grid is defined by setup['Exp']['mapN']
+    (nodes per axis), 'mapVdc' (empty: nominal voltage), and 'mapT' (empty: coolant temperature). The rows are
+    calculated on setup['Exp']['mapWorker'] processes, 'mapRef' selects the uniform grid (0) or the adaptive
+    refinement (1) with tolerance 'mapTol'.
+
+    Input:
+    1) EMA:     EMA instance
+    2) INV:     INV instance
+    3) parEMA:  EMA parameters of the instance (used for the hash)
+    4) parINV:  INV parameters of the instance (used for the hash)
+    5) path:    includes all path variables
+    6) setup:   includes all simulation variables
+
+    Output:
+    1) out:     maps (see module description)
+    """
+
+    ###################################################################################################################
+    # MSG Out
+    ###################################################################################################################
+    print("INFO: Generating efficiency maps")
+
+    ###################################################################################################################
+    # Initialisation
+    ###################################################################################################################
+    # ==============================================================================
+    # Grid
+    # ==============================================================================
+    N = setup['Exp']['mapN']
+    grid = {'Vdc': np.atleast_1d(setup['Exp']['mapVdc'] if len(setup['Exp']['mapVdc']) > 0 else
+                                 setup['Par']['HVS']['V_nom']),
+            'T': np.atleast_1d(setup['Exp']['mapT'] if len(setup['Exp']['mapT']) > 0 else setup['Exp']['Tc']),
+            'n': np.linspace(0, EMA.n_max, N), 'M': np.linspace(-EMA.M_max, EMA.M_max, N)}
+    if setup['Exp']['lim'] == 0:
+        grid['Vdc'] = np.array([1000.0])
+
+    # ==============================================================================
+    # File
+    # ==============================================================================
+    folder = pjoin(path['resPath'], 'cache')
+    file = pjoin(folder, 'map_' + getHash(parEMA, parINV, grid, setup) + '.npz')
+    chan = {'EMA': ['M_Ema', 'Pin', 'Pv', 'eta'], 'INV': ['Pin', 'Pv', 'Idc', 'eta']}
+
+    ###################################################################################################################
+    # Loading
+    ###################################################################################################################
+    if os.path.isfile(file):
+        raw = np.load(file)
+        out = {x: raw[x] for x in grid}
+        if 'leaf' in raw:
+            val = fillMap(raw['idx'], raw['val'], raw['leaf'], [len(grid[x]) for x in grid])
+            out['EMA'] = dict(zip(chan['EMA'], val[0:4]))
+            out['INV'] = dict(zip(chan['INV'], val[4:8]))
+        else:
+            for comp in chan:
+                out[comp] = {x: raw[comp + '_' + x] for x in chan[comp]}
+        print("DONE: Efficiency maps loaded from ", file)
+
+        return out
+
+    ###################################################################################################################
+    # Calculation
+    ###################################################################################################################
+    os.makedirs(folder, exist_ok=True)
+
+    # ==============================================================================
+    # Adaptive refinement
+    # ==============================================================================
+    if setup['Exp']['mapRef'] == 1:
+        [idx, val, leaf] = calcRef(EMA, INV, grid, setup)
+        np.savez_compressed(file, **grid, idx=idx.astype(np.int16), val=val, leaf=leaf.astype(np.int16))
+        print("INFO: Adaptive refinement solved ", len(idx), " of ", len(grid['Vdc']) * len(grid['T']) * N * N,
+              " nodes (", len(leaf), " leaf cells)")
+        val = fillMap(idx, val, leaf, [len(grid[x]) for x in grid])
+
+    # ==============================================================================
+    # Uniform grid
+    # ==============================================================================
+    else:
+        # ------------------------------------------
+        # Rows
+        # ------------------------------------------
+        idx = [(a, b, c) for a in range(len(grid['Vdc'])) for b in range(len(grid['T'])) for c in range(N)]
+        arg = [(EMA, INV, grid['n'][c], grid['M'], grid['Vdc'][a], grid['T'][b], setup) for (a, b, c) in idx]
+        row = calcPool(arg, setup)
+
+        # ------------------------------------------
+        # Assembling
+        # ------------------------------------------
+        val = np.zeros((8, len(grid['Vdc']), len(grid['T']), N, N))
+        for i in range(len(idx)):
+            val[:, idx[i][0], idx[i][1], idx[i][2], :] = row[i]
+        np.savez_compressed(file, **grid, **{comp + '_' + chan[comp][k]: val[k + 4 * i] for i, comp in enumerate(chan)
+                                             for k in range(4)})
+
+    # ==============================================================================
+    # Output
+    # ==============================================================================
+    out = dict(grid)
+    out['EMA'] = dict(zip(chan['EMA'], val[0:4]))
+    out['INV'] = dict(zip(chan['INV'], val[4:8]))
+
+    ###################################################################################################################
+    # MSG Out
+    ###################################################################################################################
+    print("DONE: Efficiency maps saved to ", file)
+
+    ###################################################################################################################
+    # Return
+    ###################################################################################################################
+    return out
+
+#######################################################################################################################
+# References
+#######################################################################################################################
@@ -14,13 +14,15 @@
 # Function Description
 #######################################################################################################################
 """
-A short description of the function goes here.
-Inputs:     1)
-            2)
-            N)
-Outputs:    1)
-            2)
-            M)
+This function initialises the component classes. One GBX, EMA, and INV instance is created for each motor unit of the
+drive-train (setup['Par']['Mot'], completed by getTopo). The limits of the unlimited simulation are applied to copies of
+the parameters, i.e. the setup is not modified and can be reused.
+Inputs:     1) setup:   includes all simulation variables
+Outputs:    1) GBX:     list of GBX instances (one per motor unit)
+            2) EMA:     list of EMA instances (one per motor unit)
+            3) INV:     list of INV instances (one per motor unit)
+            4) HVS:     HVS instance
+            5) VEH:     VEH instance
 """
 
 #######################################################################################################################
@@ -56,98 +58,86 @@ def initComp(setup):
     ###################################################################################################################
     # Pre-Processing
     ###################################################################################################################
+    # ==============================================================================
+    # Limits
+    # ==============================================================================
+    lim = {'GBX': ['M_max', 'n_max', 'P_max'], 'EMA': ['I_max', 'M_max', 'n_max', 'P_max'], 'INV': ['I_max', 'P_max'],
+           'HVS': ['I_max', 'P_max']}
+
+    # ==============================================================================
+    # Parameters (copies, the setup is not modified)
+    # ==============================================================================
+    Mot = [{comp: dict(unit[comp]) for comp in ['GBX', 'EMA', 'INV']} for unit in setup['Par']['Mot']]
+    parHVS = dict(setup['Par']['HVS'])
+
+    # ==============================================================================
+    # Unlimited
+    # ==============================================================================
     if setup['Exp']['lim'] == 0 or setup['Exp']['lim'] == 2:
+        # ------------------------------------------
+        # Units
+        # ------------------------------------------
+        for unit in Mot:
+            for comp in ['GBX', 'EMA', 'INV']:
+                for name in lim[comp]:
+                    unit[comp][name] = unit[comp][name] * 2
+
+        # ------------------------------------------
+        # HVS
+        # ------------------------------------------
+        for name in lim['HVS']:
+            parHVS[name] = parHVS[name] * 2
+        if setup['Exp']['lim'] == 0:
+            parHVS['V_max'] = 1000
+            parHVS['V_min'] = 1000
+            parHVS['V_nom'] = 1000
+
+    ###################################################################################################################
+    # Calculation
+    ###################################################################################################################
+    GBX = []
+    EMA = []
+    INV = []
+    for unit in Mot:
         # ==============================================================================
         # GBX
         # ==============================================================================
-        setup['Par']['GBX']['M_max'] = setup['Par']['GBX']['M_max'] * 2
-        setup['Par']['GBX']['n_max'] = setup['Par']['GBX']['n_max'] * 2
-        setup['Par']['GBX']['P_max'] = setup['Par']['GBX']['P_max'] * 2
+        par = unit['GBX']
+        GBX.append(classGBX(par['i'], par['J_gbx'], par['M_max'], par['T_max'], par['n_max'], par['P_max'], par['c_m'],
+                            par['c_b'], par['c_w'], par['C_th'], par['R_th'], par['h_th'], par['A_th'], par['Ea'],
+                            par['k'], par['n'], par['L0'], par['Nf0'], par['T0'], par['dT0'], par['V0'], par['F0'],
+                            par['beta'], par['CL'], par['Bx']))
 
         # ==============================================================================
         # EMA
         # ==============================================================================
-        setup['Par']['EMA']['I_max'] = setup['Par']['EMA']['I_max'] * 2
-        setup['Par']['EMA']['M_max'] = setup['Par']['EMA']['M_max'] * 2
-        setup['Par']['EMA']['n_max'] = setup['Par']['EMA']['n_max'] * 2
-        setup['Par']['EMA']['P_max'] = setup['Par']['EMA']['P_max'] * 2
+        par = unit['EMA']
+        EMA.append(classPSM(par['Type'], par['Mag'], par['p'], par['n_0'], par['J_rot'], par['M_max'], par['T_max'],
+                            par['n_max'], par['P_max'], par['I_max'], par['Psi_pm'], par['L_d'], par['L_q'],
+                            par['L_sig'], par['R_s'], par['c_b'], par['c_w'], par['K_h'], par['K_f'], par['C_th'],
+                            par['R_th'], par['h_th'], par['A_th'], par['Ea'], par['k'], par['n'], par['L0'],
+                            par['Nf0'], par['T0'], par['dT0'], par['V0'], par['F0'], par['beta'], par['CL'],
+                            par['Bx']))
 
         # ==============================================================================
         # INV
         # ==============================================================================
-        setup['Par']['INV']['I_max'] = setup['Par']['INV']['I_max'] * 2
-        setup['Par']['INV']['P_max'] = setup['Par']['INV']['P_max'] * 2
-
-        # ==============================================================================
-        # HVS
-        # ==============================================================================
-        setup['Par']['HVS']['I_max'] = setup['Par']['HVS']['I_max'] * 2
-        setup['Par']['HVS']['P_max'] = setup['Par']['HVS']['P_max'] * 2
-
-        if setup['Exp']['lim'] == 0:
-            setup['Par']['HVS']['V_max'] = 1000
-            setup['Par']['HVS']['V_min'] = 1000
-            setup['Par']['HVS']['V_nom'] = 1000
-
-    ###################################################################################################################
-    # Calculation
-    ###################################################################################################################
-    # ==============================================================================
-    # GBX
-    # ==============================================================================
-    GBX = classGBX(setup['Par']['GBX']['i'], setup['Par']['GBX']['J_gbx'], setup['Par']['GBX']['M_max'], setup['Par']['GBX']['T_max'],
-                   setup['Par']['GBX']['n_max'], setup['Par']['GBX']['P_max'], setup['Par']['GBX']['c_m'],
-                   setup['Par']['GBX']['c_b'], setup['Par']['GBX']['c_w'], setup['Par']['GBX']['C_th'],
-                   setup['Par']['GBX']['R_th'], setup['Par']['GBX']['h_th'], setup['Par']['GBX']['A_th'],
-                   setup['Par']['GBX']['Ea'], setup['Par']['GBX']['k'], setup['Par']['GBX']['n'],
-                   setup['Par']['GBX']['L0'], setup['Par']['GBX']['Nf0'], setup['Par']['GBX']['T0'],
-                   setup['Par']['GBX']['dT0'], setup['Par']['GBX']['V0'], setup['Par']['GBX']['F0'],
-                   setup['Par']['GBX']['beta'], setup['Par']['GBX']['CL'], setup['Par']['GBX']['Bx'])
-
-    # ==============================================================================
-    # EMA
-    # ==============================================================================
-    EMA = classPSM(setup['Par']['EMA']['Type'], setup['Par']['EMA']['Mag'], setup['Par']['EMA']['p'],
-                   setup['Par']['EMA']['n_0'], setup['Par']['EMA']['J_rot'], setup['Par']['EMA']['M_max'], setup['Par']['EMA']['T_max'],
-                   setup['Par']['EMA']['n_max'], setup['Par']['EMA']['P_max'], setup['Par']['EMA']['I_max'],
-                   setup['Par']['EMA']['Psi_pm'], setup['Par']['EMA']['L_d'], setup['Par']['EMA']['L_q'],
-                   setup['Par']['EMA']['L_sig'], setup['Par']['EMA']['R_s'], setup['Par']['EMA']['c_b'],
-                   setup['Par']['EMA']['c_w'], setup['Par']['EMA']['K_h'], setup['Par']['EMA']['K_f'],
-                   setup['Par']['EMA']['C_th'], setup['Par']['EMA']['R_th'], setup['Par']['EMA']['h_th'],
-                   setup['Par']['EMA']['A_th'], setup['Par']['EMA']['Ea'], setup['Par']['EMA']['k'],
-                   setup['Par']['EMA']['n'], setup['Par']['EMA']['L0'], setup['Par']['EMA']['Nf0'],
-                   setup['Par']['EMA']['T0'], setup['Par']['EMA']['dT0'], setup['Par']['EMA']['V0'],
-                   setup['Par']['EMA']['F0'], setup['Par']['EMA']['beta'], setup['Par']['EMA']['CL'],
-                   setup['Par']['EMA']['Bx'])
-
-    # ==============================================================================
-    # INV
-    # ==============================================================================
-    INV = classB6(setup['Par']['INV']['fs'], setup['Par']['INV']['Sw'], setup['Par']['INV']['nSw'],
-                  setup['Par']['INV']['nCap'], setup['Par']['INV']['V_0'], setup['Par']['INV']['I_0'],
-                  setup['Par']['INV']['T_0'], setup['Par']['INV']['Tj_max'], setup['Par']['INV']['alpha'],
-                  setup['Par']['INV']['P_max'], setup['Par']['INV']['T_max'], setup['Par']['INV']['I_max'], setup['Par']['INV']['V_ce0'],
-                  setup['Par']['INV']['r_T'], setup['Par']['INV']['V_d0'], setup['Par']['INV']['r_D'],
-                  setup['Par']['INV']['E_on'], setup['Par']['INV']['E_off'], setup['Par']['INV']['E_rec'],
-                  setup['Par']['INV']['R_g'], setup['Par']['INV']['R_esr'], setup['Par']['INV']['C_dc'],
-                  setup['Par']['INV']['R_ac'], setup['Par']['INV']['R_dc'], setup['Par']['INV']['C_th'],
-                  setup['Par']['INV']['R_th'], setup['Par']['INV']['h_th'], setup['Par']['INV']['A_th'],
-                  setup['Par']['INV']['Ea'], setup['Par']['INV']['k'], setup['Par']['INV']['n'],
-                  setup['Par']['INV']['L0'], setup['Par']['INV']['Nf0'], setup['Par']['INV']['T0'],
-                  setup['Par']['INV']['dT0'], setup['Par']['INV']['V0'], setup['Par']['INV']['F0'],
-                  setup['Par']['INV']['beta'], setup['Par']['INV']['CL'], setup['Par']['INV']['Bx'])
+        par = unit['INV']
+        INV.append(classB6(par['fs'], par['Sw'], par['nSw'], par['nCap'], par['V_0'], par['I_0'], par['T_0'],
+                           par['Tj_max'], par['alpha'], par['P_max'], par['T_max'], par['I_max'], par['V_ce0'],
+                           par['r_T'], par['V_d0'], par['r_D'], par['E_on'], par['E_off'], par['E_rec'], par['R_g'],
+                           par['R_esr'], par['C_dc'], par['R_ac'], par['R_dc'], par['C_th'], par['R_th'],
+                           par['h_th'], par['A_th'], par['Ea'], par['k'], par['n'], par['L0'], par['Nf0'], par['T0'],
+                           par['dT0'], par['V0'], par['F0'], par['beta'], par['CL'], par['Bx']))
 
     # ==============================================================================
     # HVS
     # ==============================================================================
-    HVS = classBat(setup['Par']['HVS']['P_max'], setup['Par']['INV']['T_max'], setup['Par']['HVS']['I_max'], setup['Par']['HVS']['R_i'],
-                   setup['Par']['HVS']['V_nom'], setup['Par']['HVS']['V_max'], setup['Par']['HVS']['V_min'],
-                   setup['Par']['HVS']['E_a'], setup['Par']['HVS']['E_bat'], setup['Par']['HVS']['C_th'],
-                   setup['Par']['HVS']['R_th'], setup['Par']['HVS']['h_th'], setup['Par']['HVS']['A_th'],
-                   setup['Par']['HVS']['Ea'], setup['Par']['HVS']['k'], setup['Par']['HVS']['n'],
-                   setup['Par']['HVS']['L0'], setup['Par']['HVS']['Nf0'], setup['Par']['HVS']['T0'],
-                   setup['Par']['HVS']['dT0'], setup['Par']['HVS']['V0'], setup['Par']['HVS']['F0'],
-                   setup['Par']['HVS']['beta'], setup['Par']['HVS']['CL'], setup['Par']['HVS']['Bx'])
+    par = parHVS
+    HVS = classBat(par['P_max'], setup['Par']['INV']['T_max'], par['I_max'], par['R_i'], par['V_nom'], par['V_max'],
+                   par['V_min'], par['E_a'], par['E_bat'], par['C_th'], par['R_th'], par['h_th'], par['A_th'],
+                   par['Ea'], par['k'], par['n'], par['L0'], par['Nf0'], par['T0'], par['dT0'], par['V0'], par['F0'],
+                   par['beta'], par['CL'], par['Bx'])
 
     # ==============================================================================
     # VEH
@@ -0,0 +1,262 @@
+#######################################################################################################################
+#######################################################################################################################
+# Title:        Python Electric Vehicle Power Toolkit (PyEVPowerKit)
+# Topic:        EV Modeling
+# File:         mapSim
+# Date:         18.03.2024
+# Author:       Dr. Pascal A. Schirmer
+# Version:      V.0.1
+# Copyright:    Pascal Schirmer
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+# Function Description
+#######################################################################################################################
+"""
+These functions implement the map-based quasi-static simulation tier for energy consumption KPIs. The loss map of the
+GBX (wheel speed and torque) is calculated per motor unit, the efficiency maps of the EMA and INV (machine shaft speed
+and torque, DC-link voltage, and temperature) are generated by genMap and cached under results/cache. The whole mission
+profile is then evaluated with vectorized map lookups bypassing the per-step loop, i.e. the maps are evaluated at the
+coolant temperature and the vehicle speed follows the mission profile. The HVS voltage and SOC are calculated from the
+cumulative charge.
+
+Fnc:
+1)  calcMap:    calculates the GBX map of a motor unit
+2)  mapSim:     calculates the powers, losses, and energy consumption of the mission profile
+
+"""
+
+#######################################################################################################################
+# Import libs
+#######################################################################################################################
+# ==============================================================================
+# Internal
+# ==============================================================================
+from src.model.genMap import genMap
+
+# ==============================================================================
+# External
+# ==============================================================================
+from scipy.interpolate import RegularGridInterpolator
+from scipy import integrate
+import numpy as np
+
+
+#######################################################################################################################
+# Additional Functions
+#######################################################################################################################
+def calcEta(Pout, Pin):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function calculates the efficiency of a time series (recuperation is inverted as in the component models).
+    """
+
+    eta = np.nan_to_num(Pout / (Pin + 1e-12), nan=1)
+    eta[eta >= 1] = 1 / eta[eta >= 1]
+
+    return eta
+
+
+def getLookup(grid, val, x):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function interpolates a map linearly at the operating points x (dict of arrays per axis of the map). Axes with
+    a single node are dropped and operating points outside the map are clipped to the map boundary.
+    """
+
+    axis = [k for k in x if len(grid[k]) > 1]
+    fnc = RegularGridInterpolator(tuple(grid[k] for k in axis), val.reshape([len(grid[k]) for k in axis]))
+    pts = np.stack([np.clip(x[k], grid[k][0], grid[k][-1]) for k in axis], axis=-1)
+
+    return fnc(pts)
+
+
+#######################################################################################################################
+# Maps
+#######################################################################################################################
+def calcMap(GBX, setup):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function calculates the GBX map of a motor unit over the wheel speed and torque of the unit for positive speeds
+    with setup['Exp']['mapN'] nodes per axis.
+
+    Input:
+    1) GBX:     GBX instance of the motor unit
+    2) setup:   includes all simulation variables
+
+    Output:
+    1) out:     map of the motor unit (M_Gbx, Pv)
+    """
+
+    # ==============================================================================
+    # Initialisation
+    # ==============================================================================
+    N = setup['Exp']['mapN']
+    out = {'n': np.linspace(0, GBX.n_max / GBX.i, N), 'M': np.linspace(-GBX.M_max * GBX.i, GBX.M_max * GBX.i, N),
+           'M_Gbx': np.zeros((N, N)), 'Pv': np.zeros((N, N))}
+
+    # ==============================================================================
+    # Calculation
+    # ==============================================================================
+    for i in range(N):
+        for j in range(N):
+            [out['M_Gbx'][i, j], _, _, _, out['Pv'][i, j], _] = GBX.calc_mech(out['M'][j], out['n'][i], setup)
+
+    return out
+
+
+#######################################################################################################################
+# Main Function
+#######################################################################################################################
+def mapSim(GBX, EMA, INV, HVS, data, dataTime, path, setup):
+    ###################################################################################################################
+    # MSG Out
+    ###################################################################################################################
+    print("INFO: Calculating map-based quasi-static simulation")
+
+    ###################################################################################################################
+    # Initialisation
+    ###################################################################################################################
+    # ==============================================================================
+    # Parameters
+    # ==============================================================================
+    Ts = 1 / setup['Dat']['fs']
+    Mot = setup['Par']['Mot']
+    t = data['t'].values
+
+    # ==============================================================================
+    # Variables
+    # ==============================================================================
+    Vdc = dataTime['VEH']['Vdc'].copy()
+    T_HVS = dataTime['HVS']['T']
+
+    ###################################################################################################################
+    # Calculation
+    ###################################################################################################################
+    # ==============================================================================
+    # Motor Units
+    # ==============================================================================
+    for u in range(len(Mot)):
+        # ------------------------------------------
+        # Maps
+        # ------------------------------------------
+        mapGbx = calcMap(GBX[u], setup)
+        mapEma = genMap(EMA[u], INV[u], Mot[u]['EMA'], Mot[u]['INV'], path, setup)
+
+        # ------------------------------------------
+        # GBX
+        # ------------------------------------------
+        x = {'n': np.abs(dataTime['WHE'][Mot[u]['axle']]['n']),
+             'M': dataTime['WHE'][Mot[u]['axle']]['M'] * Mot[u]['share']}
+        M_Gbx = getLookup(mapGbx, mapGbx['M_Gbx'], x)
+        n_Gbx = x['n'] * GBX[u].i
+        dataTime['GBX']['U']['M'][:, u] = M_Gbx
+        dataTime['GBX']['U']['n'][:, u] = n_Gbx
+        dataTime['GBX']['U']['Pv'][:, u] = getLookup(mapGbx, mapGbx['Pv'], x)
+        dataTime['GBX']['U']['Pin'][:, u] = 2 * np.pi * n_Gbx * M_Gbx
+        dataTime['GBX']['U']['Pout'][:, u] = 2 * np.pi * x['n'] * x['M']
+
+        # ------------------------------------------
+        # EMA
+        # ------------------------------------------
+        x = {'Vdc': Vdc, 'T': setup['Exp']['Tc'] * np.ones(len(t)), 'n': n_Gbx, 'M': M_Gbx}
+        M_Ema = getLookup(mapEma, mapEma['EMA']['M_Ema'], x)
+        dataTime['EMA']['U']['M'][:, u] = M_Ema
+        dataTime['EMA']['U']['n'][:, u] = n_Gbx
+        dataTime['EMA']['U']['Pm'][:, u] = 2 * np.pi * n_Gbx * M_Ema
+        dataTime['EMA']['U']['Pout'][:, u] = 2 * np.pi * n_Gbx * M_Ema
+        dataTime['EMA']['U']['Pin'][:, u] = getLookup(mapEma, mapEma['EMA']['Pin'], x)
+        dataTime['EMA']['U']['Pv'][:, u] = getLookup(mapEma, mapEma['EMA']['Pv'], x)
+
+        # ------------------------------------------
+        # INV
+        # ------------------------------------------
+        dataTime['INV']['U']['Pin'][:, u] = getLookup(mapEma, mapEma['INV']['Pin'], x)
+        dataTime['INV']['U']['Pout'][:, u] = dataTime['EMA']['U']['Pin'][:, u]
+        dataTime['INV']['U']['Pv'][:, u] = getLookup(mapEma, mapEma['INV']['Pv'], x)
+
+        # ------------------------------------------
+        # Efficiency
+        # ------------------------------------------
+        for comp in ['GBX', 'EMA', 'INV']:
+            dataTime[comp]['U']['eta'][:, u] = calcEta(dataTime[comp]['U']['Pout'][:, u],
+                                                       dataTime[comp]['U']['Pin'][:, u])
+
+    # ==============================================================================
+    # HVS
+    # ==============================================================================
+    # ------------------------------------------
+    # Output Power
+    # ------------------------------------------
+    Pout = np.sum(dataTime['INV']['U']['Pin'], axis=1)
+
+    # ------------------------------------------
+    # Voltage (fixed-point on cumulative charge)
+    # ------------------------------------------
+    for _ in range(2 if setup['Exp']['Vdc'] != 1 else 1):
+        Idc = Pout / Vdc
+        if setup['Exp']['lim'] == 1:
+            Idc = np.clip(Idc, -HVS.I_max, HVS.I_max)
+            Idc = np.clip(Vdc * Idc, -HVS.P_max, HVS.P_max) / (Vdc + 1e-9)
+        Pv = HVS.calc_loss(Idc, T_HVS)
+        Pin = Vdc * Idc + Pv
+        dQ = Pin * Ts
+        SOC = setup['Exp']['SOC'] - np.cumsum(dQ) / (HVS.E_bat * 3.6e6)
+        V_HVS = HVS.V_max - (HVS.V_max - HVS.V_min) * (1 - SOC)
+        if setup['Exp']['Vdc'] != 1:
+            Vdc = np.concatenate(([Vdc[0]], V_HVS[:-1]))
+
+    # ------------------------------------------
+    # Output
+    # ------------------------------------------
+    dataTime['HVS']['dQ'] = dQ
+    dataTime['HVS']['SOC'] = SOC
+    dataTime['HVS']['Vdc'] = V_HVS
+    dataTime['HVS']['Idc'] = Idc
+    dataTime['HVS']['Pin'] = Pin
+    dataTime['HVS']['Pout'] = Vdc * Idc
+    dataTime['HVS']['Pv'] = Pv
+    dataTime['HVS']['eta'] = calcEta(Vdc * Idc, Pin)
+    for u in range(len(Mot)):
+        dataTime['INV']['U']['Idc'][:, u] = dataTime['INV']['U']['Pin'][:, u] / Vdc
+    if setup['Exp']['Vdc'] != 1:
+        dataTime['VEH']['Vdc'] = V_HVS
+        dataTime['VEH']['SOC'] = SOC
+
+    # ==============================================================================
+    # Energy Consumption
+    # ==============================================================================
+    dataTime['VEH']['v'] = data['v'].values
+    dataTime['VEH']['s'] = data['s'].values
+    dataTime['VEH']['P']['map'] = Pin
+    dataTime['VEH']['E']['map'] = integrate.cumtrapz(Pin, t, initial=0)
+    dataTime['VEH']['eta']['map'] = dataTime['VEH']['E']['map'] / 3.6e6 / (dataTime['VEH']['s'] + 1e-12) * 1e5
+
+    ###################################################################################################################
+    # MSG Out
+    ###################################################################################################################
+    E = {x: [np.sum(np.maximum(dataTime[x]['U'][y], 0)) for y in ['Pin', 'Pout']] for x in ['GBX', 'EMA', 'INV']}
+    print("INFO: Average efficiency (driving) GBX ", round(E['GBX'][1] / (E['GBX'][0] + 1e-12) * 100, 2), " %, EMA ",
+          round(E['EMA'][1] / (E['EMA'][0] + 1e-12) * 100, 2), " %, INV ",
+          round(E['INV'][1] / (E['INV'][0] + 1e-12) * 100, 2), " %")
+    print("DONE: Energy consumption ", round(dataTime['VEH']['E']['map'][-1] / 3.6e6, 3), " kWh (",
+          round(dataTime['VEH']['eta']['map'][-1], 2), " kWh/100km)")
+
+    ###################################################################################################################
+    # Return
+    ###################################################################################################################
+    return dataTime
+
+#######################################################################################################################
+# References
+#######################################################################################################################
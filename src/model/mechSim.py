@@ -20,8 +20,8 @@
 This function calculates the mechanical outputs of the drive train.
 
 Inputs:     1) iter:        iteration number
-            2) GBX:         GBX instance
-            3) EMA:         EMA instance
+            2) GBX:         list of GBX instances (one per motor unit)
+            3) EMA:         list of EMA instances (one per motor unit)
             4) dataTime:    internal time dependent variables
             5) setup:       includes all simulation variables
 Outputs:    1) dataTime:    updated internal time dependent variables
@@ -53,144 +53,68 @@ def mechSim(iter, GBX, EMA, dataTime, setup):
     # Initialisation
     ###################################################################################################################
     # ==============================================================================
-    # Front
+    # Motor Units
     # ==============================================================================
-    M_Whe_F = dataTime['WHE']['F']['M'][iter]
-    n_Whe_F = dataTime['WHE']['F']['n'][iter]
+    Mot = setup['Par']['Mot']
 
     # ==============================================================================
-    # Rear
+    # Sample (components in the ring buffer of the recording, see classRec)
     # ==============================================================================
-    M_Whe_R = dataTime['WHE']['R']['M'][iter]
-    n_Whe_R = dataTime['WHE']['R']['n'][iter]
-
-    ###################################################################################################################
-    # Pre-Processing
-    ###################################################################################################################
-    # ==============================================================================
-    # FWD
-    # ==============================================================================
-    if setup['Par']['xwd'] == 'FWD':
-        M_Whe_R = 0
-        n_Whe_R = 0
-
-    # ==============================================================================
-    # RWD
-    # ==============================================================================
-    if setup['Par']['xwd'] == 'RWD':
-        M_Whe_F = 0
-        n_Whe_F = 0
+    k = iter % len(dataTime['HVS']['T'])
 
     ###################################################################################################################
     # Calculation
     ###################################################################################################################
-    # ==============================================================================
-    # GBX
-    # ==============================================================================
-    # ------------------------------------------
-    # Mechanical
-    # ------------------------------------------
-    [M_Gbx_F, n_Gbx_F, P_Gbx_F, P_Out_F, _, eta_Gbx_F] = GBX.calc_mech(M_Whe_F, n_Whe_F, setup)
-    [M_Gbx_R, n_Gbx_R, P_Gbx_R, P_Out_R, _, eta_Gbx_R] = GBX.calc_mech(M_Whe_R, n_Whe_R, setup)
-
-    # ------------------------------------------
-    # Losses
-    # ------------------------------------------
-    [Pv_Gbx_F, Pv_Gbx_B_F, Pv_Gbx_M_F, Pv_Gbx_W_F] = GBX.calc_loss(n_Gbx_F)
-    [Pv_Gbx_R, Pv_Gbx_B_R, Pv_Gbx_M_R, Pv_Gbx_W_R] = GBX.calc_loss(n_Gbx_R)
-
-    # ==============================================================================
-    # EMA
-    # ==============================================================================
-    [M_Ema_F, n_Ema_F, _, _, _] = EMA.calc_mech(M_Gbx_F, n_Gbx_F, setup)
-    [M_Ema_R, n_Ema_R, _, _, _] = EMA.calc_mech(M_Gbx_R, n_Gbx_R, setup)
-
-    ###################################################################################################################
-    # Post-Processing
-    ###################################################################################################################
-    # ==============================================================================
-    # GBX
-    # ==============================================================================
-    # ------------------------------------------
-    # Front
-    # ------------------------------------------
-    # Mechanical
-    dataTime['GBX']['F']['M'][iter] = M_Gbx_F
-    dataTime['GBX']['F']['n'][iter] = n_Gbx_F
-    dataTime['GBX']['F']['Pin'][iter] = P_Gbx_F
-    dataTime['GBX']['F']['Pout'][iter] = P_Out_F
-    dataTime['GBX']['F']['eta'][iter] = eta_Gbx_F
-
-    # Losses
-    dataTime['GBX']['F']['Pv'][iter] = Pv_Gbx_F
-    dataTime['GBX']['F']['Pv_B'][iter] = Pv_Gbx_B_F
-    dataTime['GBX']['F']['Pv_M'][iter] = Pv_Gbx_M_F
-    dataTime['GBX']['F']['Pv_W'][iter] = Pv_Gbx_W_F
-
-    # ------------------------------------------
-    # Rear
-    # ------------------------------------------
-    # Mechanical
-    dataTime['GBX']['R']['M'][iter] = M_Gbx_R
-    dataTime['GBX']['R']['n'][iter] = n_Gbx_R
-    dataTime['GBX']['R']['Pin'][iter] = P_Gbx_R
-    dataTime['GBX']['R']['Pout'][iter] = P_Out_R
-    dataTime['GBX']['R']['eta'][iter] = eta_Gbx_R
-
-    # Losses
-    dataTime['GBX']['R']['Pv'][iter] = Pv_Gbx_R
-    dataTime['GBX']['R']['Pv_B'][iter] = Pv_Gbx_B_R
-    dataTime['GBX']['R']['Pv_M'][iter] = Pv_Gbx_M_R
-    dataTime['GBX']['R']['Pv_W'][iter] = Pv_Gbx_W_R
-
-    # ------------------------------------------
-    # Total
-    # ------------------------------------------
-    # Efficiency and Speed
-    if setup['Par']['xwd'] == 'FWD':
-        dataTime['GBX']['T']['eta'][iter] = eta_Gbx_F
-        dataTime['GBX']['T']['n'][iter] = n_Gbx_F
-    elif setup['Par']['xwd'] == 'RWD':
-        dataTime['GBX']['T']['eta'][iter] = eta_Gbx_R
-        dataTime['GBX']['T']['n'][iter] = n_Gbx_R
-    else:
-        dataTime['GBX']['T']['eta'][iter] = (eta_Gbx_F + eta_Gbx_R) / 2
-        dataTime['GBX']['T']['n'][iter] = (n_Gbx_F + n_Gbx_R) / 2
-
-    # Mechanical
-    dataTime['GBX']['T']['M'][iter] = M_Gbx_F + M_Gbx_R
-    dataTime['GBX']['T']['Pin'][iter] = P_Gbx_F + P_Gbx_R
-    dataTime['GBX']['T']['Pout'][iter] = P_Out_F + P_Out_R
-
-    # Losses
-    dataTime['GBX']['T']['Pv'][iter] = Pv_Gbx_F + Pv_Gbx_R
-    dataTime['GBX']['T']['Pv_B'][iter] = Pv_Gbx_B_F + Pv_Gbx_B_R
-    dataTime['GBX']['T']['Pv_M'][iter] = Pv_Gbx_M_F + Pv_Gbx_M_R
-    dataTime['GBX']['T']['Pv_W'][iter] = Pv_Gbx_W_F + Pv_Gbx_W_R
-
-    # ==============================================================================
-    # EMA
-    # ==============================================================================
-    # ------------------------------------------
-    # Front
-    # ------------------------------------------
-    dataTime['EMA']['F']['M'][iter] = M_Ema_F
-    dataTime['EMA']['F']['n'][iter] = n_Ema_F
-    dataTime['EMA']['F']['Pm'][iter] = 2 * np.pi * n_Ema_F * M_Ema_F
-
-    # ------------------------------------------
-    # Rear
-    # ------------------------------------------
-    dataTime['EMA']['R']['M'][iter] = M_Ema_R
-    dataTime['EMA']['R']['n'][iter] = n_Ema_R
-    dataTime['EMA']['R']['Pm'][iter] = 2 * np.pi * n_Ema_R * M_Ema_R
-
-    # ------------------------------------------
-    # Total
-    # ------------------------------------------
-    dataTime['EMA']['T']['M'][iter] = M_Ema_F + M_Ema_R
-    dataTime['EMA']['T']['n'][iter] = (n_Ema_F + n_Ema_R) / 2
-    dataTime['EMA']['T']['Pm'][iter] = 2 * np.pi * (n_Ema_R * M_Ema_R + n_Ema_F * M_Ema_F)
+    for u in range(len(Mot)):
+        # ==============================================================================
+        # Wheel
+        # ==============================================================================
+        M_Whe = dataTime['WHE'][Mot[u]['axle']]['M'][iter] * Mot[u]['share']
+        n_Whe = dataTime['WHE'][Mot[u]['axle']]['n'][iter]
+
+        # ==============================================================================
+        # GBX
+        # ==============================================================================
+        # ------------------------------------------
+        # Mechanical
+        # ------------------------------------------
+        [M_Gbx, n_Gbx, P_Gbx, P_Out, _, eta_Gbx] = GBX[u].calc_mech(M_Whe, n_Whe, setup)
+
+        # ------------------------------------------
+        # Losses
+        # ------------------------------------------
+        [Pv_Gbx, Pv_Gbx_B, Pv_Gbx_M, Pv_Gbx_W] = GBX[u].calc_loss(n_Gbx)
+
+        # ==============================================================================
+        # EMA
+        # ==============================================================================
+        [M_Ema, n_Ema, _, _, _] = EMA[u].calc_mech(M_Gbx, n_Gbx, setup)
+
+        # ==============================================================================
+        # Output
+        # ==============================================================================
+        # ------------------------------------------
+        # GBX
+        # ------------------------------------------
+        # Mechanical
+        dataTime['GBX']['U']['M'][k, u] = M_Gbx
+        dataTime['GBX']['U']['n'][k, u] = n_Gbx
+        dataTime['GBX']['U']['Pin'][k, u] = P_Gbx
+        dataTime['GBX']['U']['Pout'][k, u] = P_Out
+        dataTime['GBX']['U']['eta'][k, u] = eta_Gbx
+
+        # Losses
+        dataTime['GBX']['U']['Pv'][k, u] = Pv_Gbx
+        dataTime['GBX']['U']['Pv_B'][k, u] = Pv_Gbx_B
+        dataTime['GBX']['U']['Pv_M'][k, u] = Pv_Gbx_M
+        dataTime['GBX']['U']['Pv_W'][k, u] = Pv_Gbx_W
+
+        # ------------------------------------------
+        # EMA
+        # ------------------------------------------
+        dataTime['EMA']['U']['M'][k, u] = M_Ema
+        dataTime['EMA']['U']['n'][k, u] = n_Ema
+        dataTime['EMA']['U']['Pm'][k, u] = 2 * np.pi * n_Ema * M_Ema
 
     ###################################################################################################################
     # Return
@@ -0,0 +1,489 @@
+#######################################################################################################################
+#######################################################################################################################
+# Title:        Python Electric Vehicle Power Toolkit (PyEVPowerKit)
+# Topic:        EV Modeling
+# File:         optSim
+# Date:         18.03.2024
+# Author:       Dr. Pascal A. Schirmer
+# Version:      V.0.1
+# Copyright:    Pascal Schirmer
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+# Function Description
+#######################################################################################################################
+"""
+These functions implement the design-space optimisation of the drive train, e.g. of the gear ratio, the battery size,
+and the number of parallel inverter switches. The design parameters of setup['Par'] are varied within absolute bounds
+(continuous or on a grid), e.g. setup['Exp']['optPar'] = {'GBX/i': [7, 11, 0], 'INV/nSw': [1, 3, 1]}, and the
+objectives are KPI names of the run catalog (minimised, maximised with a leading '-') or the cost proxy 'cost', i.e.
+the sum of the design parameters weighted with setup['Exp']['optCost'].
+
+The optimiser is a constrained NSGA-II (non-dominated sorting, crowding distance, simulated binary crossover, and
+polynomial mutation). Designs violating a constraint are dominated by feasible designs and ranked by their violation:
+- KPI limits:       setup['Exp']['optCon'], e.g. {'t_100': ['<', 6.5], 'SOC': ['>', 0.2]}
+- Temperatures:     peak temperatures below the component limits (setup['Exp']['optTher'], time-domain only)
+
+The acceleration times and the top speed (perfSim) are evaluated when used by an objective or constraint. The designs
+of a generation are evaluated in parallel worker processes (map-based or time-domain simulation, stages reused as in
+sensSim). Evaluated designs are cached in results/cache for the setup, keyed by the names and values of the design
+parameters and the requested KPIs, i.e. repeated designs and repeated runs of the optimisation are not simulated again.
+Failed designs are not cached. The result is the Pareto front of all feasible designs evaluated.
+
+Fnc:
+1)  getDes:     pre-processed setup of a design
+2)  calcDes:    evaluates a design (worker)
+3)  calcRank:   constrained non-dominated sorting and crowding distance
+4)  genDes:     offspring designs (crossover and mutation)
+5)  optSim:     design-space optimisation returning the Pareto front
+
+"""
+
+#######################################################################################################################
+# Import libs
+#######################################################################################################################
+# ==============================================================================
+# Internal
+# ==============================================================================
+from src.data.loadData import loadData
+from src.data.loadSetup import loadSetup
+from src.data.sampleData import sampleData
+from src.general.mechVehPara import mechVehPara
+from src.general.smallFnc import getCycles, getTopo
+from src.general.catalog import getKey, getKpi
+from src.model.perfSim import perfSim
+from src.model.reliaSim import reliaSim
+from src.model.sensSim import glob, initSens, calcSim, getPar, setPar
+
+# ==============================================================================
+# External
+# ==============================================================================
+from concurrent.futures import ProcessPoolExecutor
+from os.path import join as pjoin
+from datetime import datetime
+from scipy.io import savemat
+from scipy.stats import qmc
+import numpy as np
+import json
+import copy
+import os
+
+
+#######################################################################################################################
+# Additional Functions
+#######################################################################################################################
+def getDes(base, x):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function returns the pre-processed setup of a design, i.e. the setup with the values x of the design
+    parameters (in the order of setup['Exp']['optPar']).
+    """
+
+    setup = copy.deepcopy(base)
+    for name, val in zip(setup['Exp']['optPar'], x):
+        setPar(setup, name, float(val))
+
+    return getTopo(mechVehPara(setup))
+
+
+def calcDes(x):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function evaluates a design in the worker process (see sensSim.initSens) and returns its KPIs, including
+    the acceleration test if required and the temperature limits of the components ('Tlim_<comp>').
+
+    Input:
+    1) x:       values of the design parameters
+
+    Output:
+    1) kpi:     key performance indicators of the design (see catalog)
+    """
+
+    # ==============================================================================
+    # Initialisation
+    # ==============================================================================
+    setup = getDes(glob['base'], x)
+    name = [x.lstrip('-') for x in setup['Exp']['optObj']] + list(setup['Exp']['optCon'])
+
+    # ==============================================================================
+    # Simulation
+    # ==============================================================================
+    [dataTime, [GBX, EMA, INV, HVS, VEH], dataDmg] = calcSim(setup)
+    if setup['Exp']['fid'] != 3 and any(y == 'Vmax' or y.startswith('t_') for y in name):
+        dataTime['PERF'] = perfSim(GBX, EMA, VEH, dataTime['VEH']['Vdc'][0], setup)
+
+    # ==============================================================================
+    # Reliability
+    # ==============================================================================
+    if setup['Exp']['fid'] == 2:
+        dataLife = reliaSim(GBX, EMA, INV, HVS, dataTime, setup, dataDmg)[0]
+    else:
+        dataLife = {}
+
+    # ==============================================================================
+    # KPIs
+    # ==============================================================================
+    kpi = getKpi(dataTime, dataLife, setup)
+    kpi['Tlim_GBX'] = min(y.T_max for y in GBX)
+    kpi['Tlim_EMA'] = min(y.T_max for y in EMA)
+    kpi['Tlim_INV'] = min(y.Tj_max for y in INV)
+    kpi['Tlim_HVS'] = float(HVS.T_max)
+
+    # ==============================================================================
+    # Return
+    # ==============================================================================
+    return kpi
+
+
+#######################################################################################################################
+# Ranking
+#######################################################################################################################
+def calcRank(F, CV):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function returns the constrained non-dominated rank and the crowding distance of the designs. A feasible
+    design dominates all infeasible designs, infeasible designs are ranked by their violation.
+
+    Input:
+    1) F:       objectives (designs x objectives), minimised
+    2) CV:      constraint violation of the designs (0: feasible)
+
+    Output:
+    1) rank:    non-dominated front of the designs (0: Pareto front)
+    2) dist:    crowding distance of the designs within their front
+    """
+
+    # ==============================================================================
+    # Initialisation
+    # ==============================================================================
+    n = len(F)
+    rank = np.zeros(n, dtype=int)
+    dist = np.zeros(n)
+
+    # ==============================================================================
+    # Domination (i dominates j)
+    # ==============================================================================
+    feas = CV <= 0
+    dom = np.all(F[:, None] <= F[None], axis=2) & np.any(F[:, None] < F[None], axis=2) & feas[:, None] & feas[None]
+    dom = dom | (feas[:, None] & ~feas[None]) | (~feas[:, None] & ~feas[None] & (CV[:, None] < CV[None]))
+
+    # ==============================================================================
+    # Fronts
+    # ==============================================================================
+    cnt = np.sum(dom, axis=0)
+    front = np.flatnonzero(cnt == 0)
+    k = 0
+    while len(front) > 0:
+        rank[front] = k
+        cnt[front] = -1
+        cnt = cnt - np.sum(dom[front], axis=0)
+        front = np.flatnonzero(cnt == 0)
+        k = k + 1
+
+    # ==============================================================================
+    # Crowding
+    # ==============================================================================
+    for k in np.unique(rank):
+        idx = np.flatnonzero(rank == k)
+        for m in range(F.shape[1]):
+            val = F[idx, m]
+            order = np.argsort(val)
+            span = val[order[-1]] - val[order[0]]
+            dist[idx[order[[0, -1]]]] = np.inf
+            if len(idx) > 2 and np.isfinite(span) and span > 0:
+                dist[idx[order[1:-1]]] += (val[order[2:]] - val[order[:-2]]) / span
+
+    # ==============================================================================
+    # Return
+    # ==============================================================================
+    return [rank, dist]
+
+
+#######################################################################################################################
+# Variation
+#######################################################################################################################
+def genDes(U, rank, dist, res, n, rng):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function returns the offspring of a population in the unit hypercube, i.e. binary tournament selection (rank
+    and crowding distance), simulated binary crossover (probability 0.9, index 15), and polynomial mutation
+    (probability 1/d, index 20).
+
+    Input:
+    1) U:       designs of the population (designs x parameters) in the unit hypercube
+    2) rank:    non-dominated front of the designs
+    3) dist:    crowding distance of the designs
+    4) res:     grid step of the parameters in the unit hypercube (0: continuous), a mutation moves at least one step
+    5) n:       number of offspring designs
+    6) rng:     random number generator
+
+    Output:
+    1) V:       offspring designs (designs x parameters) in the unit hypercube
+    """
+
+    # ==============================================================================
+    # Initialisation
+    # ==============================================================================
+    d = U.shape[1]
+    [eta_c, eta_m] = [15, 20]
+
+    # ==============================================================================
+    # Selection
+    # ==============================================================================
+    [a, b] = rng.integers(0, len(U), (2, n + n % 2))
+    win = (rank[a] < rank[b]) | ((rank[a] == rank[b]) & (dist[a] > dist[b]))
+    P = U[np.where(win, a, b)].reshape(-1, 2, d)
+
+    # ==============================================================================
+    # Crossover
+    # ==============================================================================
+    u = rng.random(P.shape[::2])
+    beta = np.where(u <= 0.5, (2 * u) ** (1 / (eta_c + 1)), (1 / (2 * (1 - u))) ** (1 / (eta_c + 1)))
+    beta = np.where((rng.random(P.shape[::2]) < 0.5) & (rng.random((len(P), 1)) < 0.9), beta, 1)
+    V = np.concatenate((0.5 * ((1 + beta) * P[:, 0] + (1 - beta) * P[:, 1]),
+                        0.5 * ((1 - beta) * P[:, 0] + (1 + beta) * P[:, 1])))[:n]
+
+    # ==============================================================================
+    # Mutation
+    # ==============================================================================
+    u = rng.random(V.shape)
+    delta = np.where(u < 0.5, (2 * u) ** (1 / (eta_m + 1)) - 1, 1 - (2 * (1 - u)) ** (1 / (eta_m + 1)))
+    delta = np.sign(u - 0.5) * np.maximum(np.abs(delta), res)
+    V = V + np.where(rng.random(V.shape) < 1 / d, delta, 0)
+
+    # ==============================================================================
+    # Return
+    # ==============================================================================
+    return np.clip(V, 0, 1)
+
+
+#######################################################################################################################
+# Main Function
+#######################################################################################################################
+def optSim(setup, path):
+    ###################################################################################################################
+    # MSG IN
+    ###################################################################################################################
+    print("----------------------------------------------------------------------------------------------------------")
+    print("Design-Space Optimisation")
+    print("----------------------------------------------------------------------------------------------------------")
+
+    ###################################################################################################################
+    # Initialisation
+    ###################################################################################################################
+    # ==============================================================================
+    # Loading (once)
+    # ==============================================================================
+    setup = loadSetup(copy.deepcopy(setup), path)
+    data = sampleData(loadData(setup, path), setup)
+    base = getCycles(data, setup)
+
+    # ==============================================================================
+    # Design Parameters and Objectives
+    # ==============================================================================
+    par = list(base['Exp']['optPar'])
+    obj = list(base['Exp']['optObj'])
+    lim = np.array([list(base['Exp']['optPar'][x]) + [0] * (3 - len(base['Exp']['optPar'][x])) for x in par],
+                   dtype=float).reshape(-1, 3)
+    sign = np.array([-1 if x.startswith('-') else 1 for x in obj])
+    res = lim[:, 2] / np.where(lim[:, 1] > lim[:, 0], lim[:, 1] - lim[:, 0], 1)
+    cost = np.array([base['Exp']['optCost'].get(x, 0) for x in par], dtype=float)
+    [W, P, G] = [base['Exp']['optWorker'], base['Exp']['optPop'], base['Exp']['optGen']]
+    if len(par) == 0 or len(obj) == 0:
+        raise ValueError("ERROR: No design parameters or objectives of the optimisation defined")
+    for x in par:
+        if not np.isscalar(getPar(base, x)):
+            raise ValueError("ERROR: Design parameter " + x + " of the optimisation is not a scalar")
+    if np.any(lim[:, 1] < lim[:, 0]) or np.any(lim[:, 2] < 0):
+        raise ValueError("ERROR: Invalid bounds of the design parameters (lower, upper, step)")
+    for x, y in base['Exp']['optCon'].items():
+        if y[0] not in ['<', '>']:
+            raise ValueError("ERROR: Invalid constraint " + str(x) + " " + str(y[0]))
+
+    # ==============================================================================
+    # Cache (evaluated designs of the setup, keyed by the design parameters and the requested KPIs)
+    # ==============================================================================
+    req = sorted(set(x.lstrip('-') for x in obj) | set(base['Exp']['optCon']))
+    Exp = {x: base['Exp'][x] for x in base['Exp'] if not x.startswith('opt')}
+    file = pjoin(path['resPath'], 'cache', 'opt_' + getKey(dict(base, Exp=Exp)) + '.json')
+    if os.path.isfile(file):
+        with open(file) as f:
+            cache = json.load(f)
+        print("INFO: ", len(cache), " evaluated designs loaded from ", file)
+    else:
+        cache = {}
+
+    ###################################################################################################################
+    # Additional Functions
+    ###################################################################################################################
+    # ==============================================================================
+    # Design Values (unit hypercube to grid)
+    # ==============================================================================
+    def getVal(U):
+        X = lim[:, 0] + U * (lim[:, 1] - lim[:, 0])
+        grid = lim[:, 2] > 0
+        X[:, grid] = lim[grid, 0] + np.round((X[:, grid] - lim[grid, 0]) / lim[grid, 2]) * lim[grid, 2]
+        X = np.minimum(X, lim[:, 1])
+        return X, (X - lim[:, 0]) / np.where(lim[:, 1] > lim[:, 0], lim[:, 1] - lim[:, 0], 1)
+
+    # ==============================================================================
+    # Design Key (parameter names and values, requested KPIs)
+    # ==============================================================================
+    def getId(x):
+        return json.dumps({'par': dict(zip(par, np.round(x, 9).tolist())), 'kpi': req}, sort_keys=True)
+
+    # ==============================================================================
+    # Evaluation (new designs only, failed designs are not cached)
+    # ==============================================================================
+    def calcEval(X, pool):
+        key = [getId(x) for x in X]
+        arch.update(zip(key, X))
+        new = list(dict.fromkeys(x for x in key if x not in cache and x not in fail))
+        fut = [pool.submit(calcDes, arch[x]) for x in new] if pool is not None else [None] * len(new)
+        for (k, f) in zip(new, fut):
+            try:
+                cache[k] = f.result() if f is not None else calcDes(arch[k])
+            except Exception as e:
+                fail[k] = {}
+                print("WARN: Design ", dict(zip(par, arch[k].tolist())), " failed (", repr(e), ")")
+        return [cache.get(x, fail.get(x)) for x in key], len(new)
+
+    # ==============================================================================
+    # Objectives and Constraint Violation
+    # ==============================================================================
+    def calcObj(X, K):
+        F = np.full((len(X), len(obj)), np.inf)
+        CV = np.zeros(len(X))
+        for i, kpi in enumerate(K):
+            kpi['cost'] = float(np.dot(cost, X[i]))
+            val = np.array([kpi.get(x.lstrip('-'), np.nan) for x in obj], dtype=float) * sign
+            F[i] = np.where(np.isfinite(val), val, np.inf)
+            for x, (op, y) in base['Exp']['optCon'].items():
+                z = kpi.get(x, np.nan)
+                CV[i] += np.inf if not np.isfinite(z) else max(0, (z - y if op == '<' else y - z) / max(abs(y), 1e-9))
+            if base['Exp']['optTher'] == 1 and base['Exp']['fid'] == 2:
+                for comp in ['GBX', 'EMA', 'INV', 'HVS']:
+                    z = kpi.get('Tmax_' + comp, np.nan)
+                    CV[i] += np.inf if not np.isfinite(z) else max(0, z / kpi['Tlim_' + comp] - 1)
+        return F, CV
+
+    ###################################################################################################################
+    # Calculation
+    ###################################################################################################################
+    print("INFO: Optimising ", len(par), " design parameters for ", obj, ", population ", P, ", generations ", G,
+          " on ", W, " worker(s)")
+    rng = np.random.default_rng(base['Exp']['optSeed'])
+    arch = {}
+    fail = {}
+    nSim = 0
+    pool = ProcessPoolExecutor(max_workers=W, initializer=initSens, initargs=(data, base, path)) if W > 1 else None
+    if pool is None:
+        initSens(data, base, path)
+    try:
+        # ==============================================================================
+        # Initial Population (Latin hypercube)
+        # ==============================================================================
+        [X, U] = getVal(qmc.LatinHypercube(d=len(par), seed=rng).random(P))
+        [K, n] = calcEval(X, pool)
+        [F, CV] = calcObj(X, K)
+        nSim = nSim + n
+
+        # ==============================================================================
+        # Generations
+        # ==============================================================================
+        for g in range(G + 1):
+            # ------------------------------------------
+            # Ranking
+            # ------------------------------------------
+            [rank, dist] = calcRank(F, CV)
+            print("INFO: Generation ", g, ", ", nSim, " designs simulated, ", int(np.sum(CV <= 0)), " feasible, ",
+                  int(np.sum((rank == 0) & (CV <= 0))), " on the front")
+            if g == G:
+                break
+
+            # ------------------------------------------
+            # Offspring
+            # ------------------------------------------
+            [Xo, Uo] = getVal(genDes(U, rank, dist, res, P, rng))
+            [Ko, n] = calcEval(Xo, pool)
+            [Fo, CVo] = calcObj(Xo, Ko)
+            nSim = nSim + n
+
+            # ------------------------------------------
+            # Survival (parents and offspring without duplicates)
+            # ------------------------------------------
+            [X, U, K, F, CV] = [np.concatenate((X, Xo)), np.concatenate((U, Uo)), K + Ko, np.concatenate((F, Fo)),
+                                np.concatenate((CV, CVo))]
+            idx = np.unique(np.round(X, 9), axis=0, return_index=True)[1]
+            [X, U, K, F, CV] = [X[idx], U[idx], [K[i] for i in idx], F[idx], CV[idx]]
+            [rank, dist] = calcRank(F, CV)
+            idx = np.lexsort((-dist, rank))[:P]
+            [X, U, K, F, CV] = [X[idx], U[idx], [K[i] for i in idx], F[idx], CV[idx]]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    ###################################################################################################################
+    # Post-Processing
+    ###################################################################################################################
+    # ==============================================================================
+    # Cache
+    # ==============================================================================
+    os.makedirs(os.path.dirname(file), exist_ok=True)
+    with open(file, 'w') as f:
+        json.dump(cache, f)
+
+    # ==============================================================================
+    # Pareto Front (all feasible designs evaluated in the run)
+    # ==============================================================================
+    Xa = np.array(list(arch.values()))
+    Ka = [cache.get(x, fail.get(x)) for x in arch]
+    [Fa, CVa] = calcObj(Xa, Ka)
+    rank = calcRank(Fa, CVa)[0]
+    idx = np.flatnonzero((rank == 0) & (CVa <= 0))
+    idx = idx[np.argsort(Fa[idx, 0])]
+    name = sorted(set(x for i in idx for x in Ka[i] if not x.startswith('Tlim_')))
+    dataOpt = {'par': par, 'obj': obj, 'X': Xa[idx], 'F': Fa[idx] * sign, 'N': len(Xa), 'nSim': nSim,
+               'KPI': {x: np.array([Ka[i].get(x, np.nan) for i in idx]) for x in name},
+               'all': {'X': Xa, 'F': Fa * sign, 'CV': CVa}}
+
+    # ==============================================================================
+    # Saving
+    # ==============================================================================
+    if setup['Exp']['save'] == 1:
+        name = 'result_Opt_' + setup['Exp']['name'] + '_' + datetime.now().strftime("%d_%m_%Y_%H_%M_%S") + '.mat'
+        savemat(pjoin(path['resPath'], name), dataOpt)
+        print("INFO: Pareto front saved")
+
+    ###################################################################################################################
+    # MSG Out
+    ###################################################################################################################
+    if len(idx) == 0:
+        print("WARN: No feasible design found")
+    for i in range(len(idx)):
+        print("      ", dict(zip(par, np.round(dataOpt['X'][i], 3).tolist())), " -> ",
+              dict(zip(obj, np.round(dataOpt['F'][i], 3).tolist())))
+    print("DONE: Optimisation, ", len(idx), " Pareto-optimal of ", dataOpt['N'], " designs evaluated")
+
+    ###################################################################################################################
+    # Return
+    ###################################################################################################################
+    return dataOpt
+
+#######################################################################################################################
+# References
+#######################################################################################################################
+# Deb et al., A fast and elitist multiobjective genetic algorithm: NSGA-II, IEEE Transactions on Evolutionary
+# Computation, 2002
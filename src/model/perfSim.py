@@ -0,0 +1,316 @@
+#######################################################################################################################
+#######################################################################################################################
+# Title:        Python Electric Vehicle Power Toolkit (PyEVPowerKit)
+# Topic:        EV Modeling
+# File:         perfSim
+# Date:         18.03.2024
+# Author:       Dr. Pascal A. Schirmer
+# Version:      V.0.1
+# Copyright:    Pascal Schirmer
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+# Function Description
+#######################################################################################################################
+"""
+These functions implement the performance test (acceleration times and top speed) of a vehicle. Instead of simulating
+a full-load mission profile with the component loop, the wheel torque envelope of the drivetrain is calculated once
+from the full-load torque envelopes of the machines (classPSM.calc_env) including the machine and gearbox limits and
+the friction and gearbox losses. The vehicle dynamics (classVEH.calc_acc) are then integrated at full load on a flat
+road with adaptive step sizes. The integration is restarted at every event (target speeds and transitions between the
+active limits, e.g. torque to power or voltage limit), such that the kinks of the envelope are resolved exactly. The
+top speed is the root of the acceleration (or the speed limit of the machines).
+
+The DC-link voltage is the voltage at the start of the test and the machines are evaluated at the coolant temperature.
+The component limits are always used.
+
+Fnc:
+1)  getVdc:     DC-link voltage at the start of the test (see elecVeh)
+2)  calcEnv:    wheel torque envelope of the drivetrain
+3)  perfSim:    acceleration times and top speed of a vehicle
+4)  calcPerf:   loads a vehicle and calculates its performance test (worker of perfBatch)
+5)  perfBatch:  acceleration times and top speed of a batch of vehicles (list of setups, process pool)
+
+"""
+
+#######################################################################################################################
+# Import libs
+#######################################################################################################################
+# ==============================================================================
+# Internal
+# ==============================================================================
+from src.data.loadSetup import loadSetup
+from src.general.mechVehPara import mechVehPara
+from src.general.smallFnc import getTopo
+from src.model.initComp import initComp
+
+# ==============================================================================
+# External
+# ==============================================================================
+from scipy.integrate import solve_ivp
+from scipy.optimize import brentq
+from concurrent.futures import ProcessPoolExecutor
+from tqdm import tqdm
+import numpy as np
+import copy
+
+
+#######################################################################################################################
+# Additional Functions
+#######################################################################################################################
+def getVdc(setup):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function returns the DC-link voltage at the start of the test (SOC based or nominal voltage).
+    """
+
+    if setup['Exp']['lim'] == 0:
+        return 1000
+    elif setup['Exp']['Vdc'] == 3:
+        return setup['Par']['HVS']['V_max'] - (setup['Par']['HVS']['V_max'] - setup['Par']['HVS']['V_min']) * (
+                1 - setup['Exp']['SOC'])
+    else:
+        return setup['Par']['HVS']['V_nom']
+
+
+#######################################################################################################################
+# Envelope
+#######################################################################################################################
+def calcEnv(GBX, EMA, Vdc, setup):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function calculates the wheel torque envelope (motoring) of the drivetrain over the vehicle speed. Per motor
+    unit the inner torque is limited by the full-load envelope, the maximum torque, and the maximum power of the
+    machine, reduced by the friction torque (switching frequency of the inverter of the unit), and transferred to the
+    wheel including the gearbox losses.
+
+    Input:
+    1) GBX:     list of GBX instances (one per motor unit)
+    2) EMA:     list of EMA instances (one per motor unit)
+    3) Vdc:     DC-link voltage (V)
+    4) setup:   includes all simulation variables
+
+    Output:
+    1) env:     vehicle speed (m/s), wheel torque (Nm), active limit per motor unit (0: torque, 1: power, 2: voltage),
+                and speed limit (m/s)
+    """
+
+    # ==============================================================================
+    # Initialisation
+    # ==============================================================================
+    Mot = setup['Par']['Mot']
+    r = setup['Par']['VEH']['r_dyn']
+    T = setup['Exp']['Tc']
+    v_lim = min(2 * np.pi * r * EMA[u].n_max / GBX[u].i for u in range(len(Mot)))
+    v = np.linspace(0, v_lim, setup['Exp']['envN'])
+    M = np.zeros(len(v))
+    lim = np.zeros((len(v), len(Mot)), dtype=int)
+
+    # ==============================================================================
+    # Calculation
+    # ==============================================================================
+    for u in range(len(Mot)):
+        for k in range(len(v)):
+            # ------------------------------------------
+            # Speed
+            # ------------------------------------------
+            n_Whe = v[k] / (2 * np.pi * r)
+            n_Ema = n_Whe * GBX[u].i
+            w_m = 2 * np.pi * n_Ema
+
+            # ------------------------------------------
+            # Machine
+            # ------------------------------------------
+            Mi = [EMA[u].M_max, EMA[u].P_max / (w_m + 1e-9), EMA[u].calc_lim(n_Ema, np.inf, Vdc, T, setup)]
+            lim[k, u] = int(np.argmin(Mi))
+            if n_Ema != 0:
+                [_, Pv_fric, _, _] = EMA[u].calc_loss(n_Ema, 0, 0, 0, Mot[u]['INV']['fs'], T)
+                Msh = min(Mi) - Pv_fric / w_m
+            else:
+                Msh = min(Mi)
+
+            # ------------------------------------------
+            # Gearbox
+            # ------------------------------------------
+            M_Gbx = min(Msh, GBX[u].M_max, GBX[u].P_max / (w_m + 1e-9))
+            [Pv, _, _, _] = GBX[u].calc_loss(n_Ema)
+            if n_Whe != 0:
+                M[k] = M[k] + max(M_Gbx * GBX[u].i - Pv / (2 * np.pi * n_Whe), 0)
+            else:
+                M[k] = M[k] + M_Gbx * GBX[u].i
+
+    # ==============================================================================
+    # Return
+    # ==============================================================================
+    return {'v': v, 'M': M, 'lim': lim, 'v_lim': v_lim}
+
+
+#######################################################################################################################
+# Main Function
+#######################################################################################################################
+def perfSim(GBX, EMA, VEH, Vdc, setup):
+    ###################################################################################################################
+    # MSG IN
+    ###################################################################################################################
+    print("INFO: Calculating performance test")
+
+    ###################################################################################################################
+    # Initialisation
+    ###################################################################################################################
+    # ==============================================================================
+    # Envelope
+    # ==============================================================================
+    env = calcEnv(GBX, EMA, Vdc, setup)
+
+    # ==============================================================================
+    # Dynamics
+    # ==============================================================================
+    def fnc(t, x):
+        return [VEH.calc_acc(np.interp(x[0], env['v'], env['M']), x[0], 0, setup)]
+
+    ###################################################################################################################
+    # Calculation
+    ###################################################################################################################
+    # ==============================================================================
+    # Top Speed
+    # ==============================================================================
+    acc = np.array([fnc(0, [x])[0] for x in env['v']])
+    if acc[0] < 0:
+        Vmax = 0
+        print("WARN: Vehicle cannot accelerate from standstill, top speed set to zero and events skipped")
+    elif acc[-1] >= 0:
+        Vmax = env['v_lim']
+    else:
+        k = int(np.argmax(acc < 0))
+        Vmax = brentq(lambda x: fnc(0, [x])[0], env['v'][k - 1], env['v'][k])
+
+    # ==============================================================================
+    # Events
+    # ==============================================================================
+    vt = np.array(setup['Exp']['perfV']) / 3.6
+    vb = env['v'][1:][np.any(np.diff(env['lim'], axis=0) != 0, axis=1)]
+    vEnd = Vmax if acc[-1] > 0 else Vmax * setup['Exp']['perfEnd']
+    if Vmax > 0:
+        ev = np.unique(np.concatenate((vt[vt < vEnd], vb[vb < vEnd], [vEnd])))
+    else:
+        ev = np.array([])
+
+    # ==============================================================================
+    # Integration
+    # ==============================================================================
+    t = [0.0]
+    x = [0.0]
+    for v1 in ev:
+        # ------------------------------------------
+        # Event
+        # ------------------------------------------
+        def hit(tx, y, v1=v1):
+            return y[0] - v1
+        hit.terminal = True
+        hit.direction = 1
+
+        # ------------------------------------------
+        # Segment
+        # ------------------------------------------
+        out = solve_ivp(fnc, [t[-1], t[-1] + 3600], [x[-1]], events=hit, rtol=1e-6, atol=1e-6)
+        if out.status != 1:
+            break
+        t = t + list(out.t[1:-1]) + [out.t_events[0][0]]
+        x = x + list(out.y[0][1:-1]) + [v1]
+
+    ###################################################################################################################
+    # Post-Processing
+    ###################################################################################################################
+    t = np.array(t)
+    x = np.array(x)
+    dataPerf = {'v': np.array(setup['Exp']['perfV'], dtype=float),
+                't': np.array([t[np.argmin(np.abs(x - y))] if y < vEnd and np.max(x) >= y else np.nan for y in vt]),
+                'Vmax': Vmax * 3.6, 'tEnd': t[-1], 'vLim': vb * 3.6, 'time': {'t': t, 'v': x * 3.6},
+                'env': {'v': env['v'] * 3.6, 'M': env['M'], 'lim': env['lim']}}
+
+    ###################################################################################################################
+    # MSG Out
+    ###################################################################################################################
+    for i in range(len(vt)):
+        print("INFO: Acceleration 0-", setup['Exp']['perfV'][i], " km/h in ", round(dataPerf['t'][i], 3), " s")
+    if acc[0] < 0:
+        print("DONE: Top speed 0 km/h (no acceleration from standstill)")
+    elif acc[-1] >= 0:
+        print("DONE: Top speed ", round(dataPerf['Vmax'], 2), " km/h (speed limit of the machine after ",
+              round(dataPerf['tEnd'], 2), " s)")
+    else:
+        print("DONE: Top speed ", round(dataPerf['Vmax'], 2), " km/h (", round(setup['Exp']['perfEnd'] * 100),
+              " % after ", round(dataPerf['tEnd'], 2), " s)")
+
+    ###################################################################################################################
+    # Return
+    ###################################################################################################################
+    return dataPerf
+
+
+#######################################################################################################################
+# Batch
+#######################################################################################################################
+def calcPerf(setup, path):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function loads a vehicle (vehicle, component, and topology parameters) and evaluates it with perfSim.
+    """
+
+    setup = loadSetup(copy.deepcopy(setup), path)
+    setup = mechVehPara(setup)
+    setup = getTopo(setup)
+    [GBX, EMA, _, _, VEH] = initComp(setup)
+
+    return perfSim(GBX, EMA, VEH, getVdc(setup), setup)
+
+
+def perfBatch(setups, path):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function calculates the performance test for a batch of vehicles. The vehicles are independent and evaluated
+    with calcPerf distributed over a process pool (setup['Exp']['perfWorker'] of the first setup).
+
+    Input:
+    1) setups:  list of setups (setup['Par']['name'], setup['Par']['xwd'], and setup['Exp'] per vehicle)
+    2) path:    includes all path variables
+
+    Output:
+    1) dataPerf: list of performance tests (see perfSim)
+    """
+
+    # ==============================================================================
+    # Initialisation
+    # ==============================================================================
+    worker = min(setups[0]['Exp']['perfWorker'], len(setups))
+
+    # ==============================================================================
+    # Calculation
+    # ==============================================================================
+    if worker > 1:
+        with ProcessPoolExecutor(max_workers=worker) as pool:
+            dataPerf = list(tqdm(pool.map(calcPerf, setups, [path] * len(setups)), total=len(setups),
+                                 desc='Performance Tests'))
+    else:
+        dataPerf = [calcPerf(setup, path) for setup in tqdm(setups, desc='Performance Tests')]
+
+    # ==============================================================================
+    # Return
+    # ==============================================================================
+    return dataPerf
+
+#######################################################################################################################
+# References
+#######################################################################################################################
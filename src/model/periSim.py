@@ -0,0 +1,184 @@
+#######################################################################################################################
+#######################################################################################################################
+# Title:        Python Electric Vehicle Power Toolkit (PyEVPowerKit)
+# Topic:        EV Modeling
+# File:         periSim
+# Date:         18.03.2024
+# Author:       Dr. Pascal A. Schirmer
+# Version:      V.0.1
+# Copyright:    Pascal Schirmer
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+# Function Description
+#######################################################################################################################
+"""
+This function calculates the periodic steady-state of a repeated mission profile. The first simulation of the cycle
+(main) is the first pass. Every further pass simulates the coupled cycle (mechanical, electrical, thermal, and vehicle)
+starting from the end-of-cycle state of the previous pass, i.e. the losses, the DC-link voltage, and the SOC are
+re-evaluated with the temperatures of the pass. The thermal boundary state (component, HVS, and coolant temperatures at
+sample -1) is iterated as a fixed-point with Aitken acceleration every second pass. The SOC is not periodic (it decreases
+with every cycle), so every pass starts from setup['Exp']['SOC'] and the end-of-cycle SOC is part of the convergence
+check (it depends on the temperatures through the losses). The iteration stops when the residual of the end-of-cycle
+state drops below setup['Exp']['pssTol'], the last pass is returned as the periodic cycle (no additional run). For
+the decimated recording the end-of-cycle state is copied to the end of the ring buffer (setRing) and the recording
+restarts with every pass, i.e. the last pass is recorded.
+
+Inputs:     1) GBX:         list of GBX instances (one per motor unit)
+            2) EMA:         list of EMA instances (one per motor unit)
+            3) INV:         list of INV instances (one per motor unit)
+            4) HVS:         HVS instance
+            5) VEH:         VEH instance
+            6) data:        mission profile
+            7) dataTime:    internal time dependent variables of the first simulation
+            8) setup:       includes all simulation variables
+            9) OPC:         operating-point clustering (classOpc), None for the exact solution
+            10) REC:        decimated recording (classRec), None if disabled
+Outputs:    1) data:        mission profile
+            2) dataTime:    internal time dependent variables starting from the periodic steady-state
+
+"""
+
+#######################################################################################################################
+# Import libs
+#######################################################################################################################
+# ==============================================================================
+# Internal
+# ==============================================================================
+from src.model.cycSim import initVeh, cycSim
+from src.model.classRec import setRing
+
+# ==============================================================================
+# External
+# ==============================================================================
+import numpy as np
+
+
+#######################################################################################################################
+# Additional Functions
+#######################################################################################################################
+def getVec(dataTime):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function returns the thermal boundary state (component, HVS, and coolant temperatures at sample -1).
+    """
+
+    return np.concatenate((dataTime['GBX']['U']['T'][-1], dataTime['EMA']['U']['T'][-1], dataTime['INV']['U']['T'][-1],
+                           [dataTime['HVS']['T'][-1], dataTime['VEH']['Tc'][-1]]))
+
+
+def setVec(x, dataTime, setup):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function sets the thermal boundary state (component, HVS, and coolant temperatures at sample -1).
+    """
+
+    nMot = dataTime['GBX']['U']['T'].shape[1]
+    for i, comp in enumerate(['GBX', 'EMA', 'INV']):
+        dataTime[comp]['U']['T'][-1] = x[i * nMot:(i + 1) * nMot]
+    dataTime['HVS']['T'][-1] = x[3 * nMot]
+    if setup['Exp']['Cool'] == 3:
+        dataTime['VEH']['Tc'][-1] = x[3 * nMot + 1]
+
+    return dataTime
+
+
+#######################################################################################################################
+# Main Function
+#######################################################################################################################
+def periSim(GBX, EMA, INV, HVS, VEH, data, dataTime, setup, OPC=None, REC=None):
+    ###################################################################################################################
+    # MSG Out
+    ###################################################################################################################
+    print("INFO: Calculating periodic steady-state")
+
+    ###################################################################################################################
+    # Initialisation
+    ###################################################################################################################
+    # ==============================================================================
+    # Parameters
+    # ==============================================================================
+    tol = setup['Exp']['pssTol']
+    itrMax = setup['Exp']['pssIter']
+    N = len(data['t'])
+
+    # ==============================================================================
+    # Boundary state of the first pass
+    # ==============================================================================
+    [data, dataInit] = initVeh(data, setup)
+    bnd = {x: dataInit['VEH'][x][-1] for x in ['Vdc', 'SOC']}
+
+    ###################################################################################################################
+    # Calculation
+    ###################################################################################################################
+    # ==============================================================================
+    # First pass (main)
+    # ==============================================================================
+    dataTime = setRing(dataTime, N)
+    x = [getVec(dataInit), getVec(dataTime)]
+    SOC = dataTime['VEH']['SOC'][-1]
+    err = np.max(np.abs(x[1] - x[0]))
+    itr = 1
+
+    # ==============================================================================
+    # Coupled passes (fixed-point with Aitken acceleration)
+    # ==============================================================================
+    while err > tol and itr < itrMax:
+        # ------------------------------------------
+        # Aitken extrapolation (three successive states)
+        # ------------------------------------------
+        if len(x) == 3:
+            den = x[2] - 2 * x[1] + x[0]
+            x = [np.where(np.abs(den) > 1e-9, x[0] - (x[1] - x[0]) ** 2 / np.where(den == 0, 1, den), x[2])]
+
+        # ------------------------------------------
+        # Boundary state
+        # ------------------------------------------
+        dataTime = setVec(x[-1], dataTime, setup)
+        for name in bnd:
+            dataTime['VEH'][name][-1] = bnd[name]
+
+        # ------------------------------------------
+        # Cycle
+        # ------------------------------------------
+        dataTime = cycSim(GBX, EMA, INV, HVS, VEH, data, dataTime, setup, OPC, REC=REC,
+                          desc='Mission Profile (periodic pass ' + str(itr + 1) + ')')
+        dataTime = setRing(dataTime, N)
+        itr = itr + 1
+
+        # ------------------------------------------
+        # Residual (end-of-cycle temperatures in K and SOC in %)
+        # ------------------------------------------
+        x.append(getVec(dataTime))
+        err = max(np.max(np.abs(x[-1] - x[-2])), 100 * abs(dataTime['VEH']['SOC'][-1] - SOC))
+        SOC = dataTime['VEH']['SOC'][-1]
+
+    # ==============================================================================
+    # Convergence
+    # ==============================================================================
+    if err > tol:
+        print("WARN: Periodic steady-state not converged after ", itr, " passes (residual ", round(err, 4), ")")
+    else:
+        print("INFO: Periodic steady-state after ", itr, " passes (residual ", round(err, 4), ")")
+
+    ###################################################################################################################
+    # MSG Out
+    ###################################################################################################################
+    print("DONE: Periodic steady-state calculated")
+
+    ###################################################################################################################
+    # Return
+    ###################################################################################################################
+    return [data, dataTime]
+
+#######################################################################################################################
+# References
+#######################################################################################################################
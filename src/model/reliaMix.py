@@ -0,0 +1,191 @@
+#######################################################################################################################
+#######################################################################################################################
+# Title:        Python Electric Vehicle Power Toolkit (PyEVPowerKit)
+# Topic:        EV Modeling
+# File:         reliaMix
+# Date:         18.03.2024
+# Author:       Dr. Pascal A. Schirmer
+# Version:      V.0.1
+# Copyright:    Pascal Schirmer
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+# Function Description
+#######################################################################################################################
+"""
+These functions compose the lifetime of a mission mix (e.g. 40% Artemis, 40% WLTP, 20% Grossglockner) from cached
+per-cycle damage contributions without re-simulation. The damage accumulators of one repetition of a mission profile
+(Arrhenius and Prokopovic sums, rainflow histograms) are cached by saveDmg() under results/cache, keyed by the mission
+profile and the hash of the setup (see getName). reliaMix() scales the cached contributions by the number of repetitions
+of each cycle over the lifetime and evaluates the lifetime.
+
+Fnc:
+1)  saveDmg:    caches the damage accumulators of a simulated mission profile
+2)  reliaMix:   calculates the lifetime of a weighted mission mix from the cached mission profiles
+
+"""
+
+#######################################################################################################################
+# Import libs
+#######################################################################################################################
+# ==============================================================================
+# Internal
+# ==============================================================================
+from src.model.reliaSim import calcLife
+from src.data.loadSetup import loadSetup
+from src.general.mechVehPara import mechVehPara
+from src.general.smallFnc import getTopo
+from src.general.catalog import getKey
+
+# ==============================================================================
+# External
+# ==============================================================================
+from os.path import join as pjoin
+import numpy as np
+import pickle
+import copy
+import os
+
+
+#######################################################################################################################
+# Additional Functions
+#######################################################################################################################
+def getName(setup, cyc):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function returns the cache file of a mission profile. The key is the hash of the pre-processed setup (see
+    catalog.getKey) with the mission profile as data name. The lifetime criteria, the number of cycles, the Monte-Carlo
+    and caching options, and the raw sampling of the data are excluded, they do not change the damage of one repetition.
+    """
+
+    skip = ['on', 'km', 'life', 'cyc', 'cache']
+    Exp = {x: setup['Exp'][x] for x in setup['Exp'] if x not in skip and x[:2] != 'mc'}
+    Dat = {**{x: setup['Dat'][x] for x in setup['Dat'] if x not in ['fs_raw', 'Ts_raw']}, 'name': cyc}
+
+    return 'dmg_' + cyc + '_' + getKey({'Par': setup['Par'], 'Dat': Dat, 'Exp': Exp}) + '.pkl'
+
+
+#######################################################################################################################
+# Caching
+#######################################################################################################################
+def saveDmg(dataDmg, data, path, setup):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function caches the damage accumulators of one repetition of the mission profile together with the cycle
+    duration, driving time, and distance. The cache is identified by the mission profile and the hash of the setup
+    (getName) and overwritten by later runs of the same setup.
+
+    Input:
+    1) dataDmg: damage accumulators of the mission profile (see reliaSim)
+    2) data:    mission profile
+    3) path:    includes all path variables
+    4) setup:   includes all simulation variables
+    """
+
+    # ==============================================================================
+    # Initialisation
+    # ==============================================================================
+    folder = pjoin(path['resPath'], 'cache')
+    os.makedirs(folder, exist_ok=True)
+
+    # ==============================================================================
+    # Cycle
+    # ==============================================================================
+    dt = data['t'].values[1] - data['t'].values[0]
+    v = data['v'].values
+    cyc = {'T': data['t'].values[-1], 's': data['s'].values[-1], 'T_drive': np.sum(v != 0) * dt}
+
+    # ==============================================================================
+    # Saving
+    # ==============================================================================
+    with open(pjoin(folder, getName(setup, setup['Dat']['name'])), 'wb') as file:
+        pickle.dump({'dmg': dataDmg, 'cyc': cyc}, file)
+
+    print("INFO: Damage of mission profile cached")
+
+
+#######################################################################################################################
+# Mission Mix
+#######################################################################################################################
+def reliaMix(mix, setup, path):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function calculates the lifetime of a weighted mission mix from the cached mission profiles. The weights are
+    shares of the operating time and are normalised to one. The number of repetitions of each mission profile follows
+    the lifetime criteria of getCycles (driving hours, distance, and lifetime) applied to the mix.
+
+    Input:
+    1) mix:     weights of the mission profiles, e.g. {'data_Artemis_150': 0.4, 'data_WLTP': 0.4, ...}
+    2) setup:   includes all simulation variables, pre-processed as in main (loadSetup, mechVehPara, getTopo) on a
+                copy such that the cache keys of the simulated mission profiles are matched
+    3) path:    includes all path variables
+
+    Output:
+    1) dataLife: lifetime results of the mission mix
+    2) N_cyc:    number of repetitions of each mission profile
+    """
+
+    print("INFO: Calculating lifetime of mission mix")
+
+    # ==============================================================================
+    # Setup
+    # ==============================================================================
+    setup = getTopo(mechVehPara(loadSetup(copy.deepcopy(setup), path)))
+
+    # ==============================================================================
+    # Loading
+    # ==============================================================================
+    dataDmg = []
+    cyc = []
+    for name in mix:
+        try:
+            with open(pjoin(path['resPath'], 'cache', getName(setup, name)), 'rb') as file:
+                raw = pickle.load(file)
+        except FileNotFoundError:
+            raise FileNotFoundError("ERROR: No cached damage for mission profile " + name + " with this setup, "
+                                    "simulate it first")
+        dataDmg.append(raw['dmg'])
+        cyc.append(raw['cyc'])
+
+    # ==============================================================================
+    # Repetitions
+    # ==============================================================================
+    # ------------------------------------------
+    # Per hour of operation
+    # ------------------------------------------
+    w = np.array(list(mix.values()), dtype=float)
+    w = w / np.sum(w)
+    rep = np.array([w[i] * 3600 / cyc[i]['T'] for i in range(len(cyc))])
+    T_drive = np.sum(rep * np.array([x['T_drive'] for x in cyc]))
+    s = np.sum(rep * np.array([x['s'] for x in cyc]))
+
+    # ------------------------------------------
+    # Lifetime (hours of operation)
+    # ------------------------------------------
+    N1 = setup['Exp']['on'] * 3600 / T_drive
+    N2 = setup['Exp']['km'] * 1000 / s
+    N3 = setup['Exp']['life']
+    N_cyc = rep * min((N1, N2, N3))
+
+    # ==============================================================================
+    # Calculation
+    # ==============================================================================
+    dataLife = calcLife(dataDmg, N_cyc)
+
+    print("DONE: Number of cycles is equal to: ", dict(zip(mix, np.round(N_cyc, 1))))
+
+    return [dataLife, dict(zip(mix, N_cyc))]
+
+#######################################################################################################################
+# References
+#######################################################################################################################
@@ -17,15 +17,21 @@
 # Function Description
 #######################################################################################################################
 """
-This function calculates the reliability of each component
-
-Inputs:     1) GBX:         GBX instance
-            2) EMA:         EMA instance
-            3) INV:         INV instance
+This function calculates the reliability of each component. For axles with several motor units the worst unit (highest
+damage) is reported, the results of all motor units are stored under dataLife[comp]['U'][unit name]. The damage of all
+components is calculated on stacked time series and the lifetime statistics are evaluated in one batched call. The pdf
+and cdf curves are generated on access (classWei). For the decimated recording the damage is accumulated window by
+window during the simulation (initDmg, calcDmg), such that no full rate time series is needed.
+
+Inputs:     1) GBX:         list of GBX instances (one per motor unit)
+            2) EMA:         list of EMA instances (one per motor unit)
+            3) INV:         list of INV instances (one per motor unit)
             4) HVS:         HVS instance
             5) dataTime:    internal time dependent variables
             6) setup:       includes all simulation variables
+            7) dataDmg:     damage accumulated during the simulation (see classRec), None to evaluate dataTime
 Outputs:    1) dataLife:    lifetime results
+            2) dataDmg:     damage accumulators of the mission profile (one repetition)
 
 """
 
@@ -35,7 +41,7 @@ Outputs:    1) dataLife:    lifetime results
 # ==============================================================================
 # Internal
 # ==============================================================================
-from src.model.calcDmg import calcDmgArr, calcDmgPro, calcDmgCof
+from src.model.classDmg import classDmgArr, classDmgPro, classDmgCof, classWei, calcWeibull
 
 # ==============================================================================
 # External
@@ -46,328 +52,209 @@ import numpy as np
 #######################################################################################################################
 # Additional Functions
 #######################################################################################################################
+def calcLife(dataDmg, N_cyc):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function calculates the lifetime results from the damage accumulated over one or several mission profiles.
 
+    Input:
+    1) dataDmg: list of damage accumulators of the mission profiles (see reliaSim)
+    2) N_cyc:   list of repetitions of each mission profile over the lifetime
 
-#######################################################################################################################
-# Main Function
-#######################################################################################################################
-def reliaSim(GBX, EMA, INV, HVS, dataTime, setup):
-    ###################################################################################################################
-    # MSG Out
-    ###################################################################################################################
-    print("INFO: Calculating reliability")
+    Output:
+    1) dataLife: lifetime results
+    """
 
-    ###################################################################################################################
+    # ==============================================================================
     # Initialisation
-    ###################################################################################################################
     # ==============================================================================
-    # Parameters
+    name = dataDmg[0]['name']
+    COM = [x.COM for x in dataDmg[0]['Cof']]
+    key = ['L', 'D', 'F', 'beta', 'L63']
+    dataLife = {'GBX': {'F': {'Arr': {}, 'Cof': {}, 'Pro': {}}, 'R': {'Arr': {}, 'Cof': {}, 'Pro': {}}, 'U': {}},
+                'EMA': {'F': {'Arr': {}, 'Cof': {}, 'Pro': {}}, 'R': {'Arr': {}, 'Cof': {}, 'Pro': {}}, 'U': {}},
+                'INV': {'F': {'Arr': {}, 'Cof': {}, 'Pro': {}}, 'R': {'Arr': {}, 'Cof': {}, 'Pro': {}}, 'U': {}},
+                'HVS': {'Arr': {}, 'Cof': {}, 'Pro': {}}}
+
+    # ==============================================================================
+    # Damage (sum over mission profiles)
     # ==============================================================================
-    Ts = 1 / setup['Dat']['fs']
-    Vdc = dataTime['HVS']['Vdc']
+    dmg = {}
+    for i in range(len(dataDmg)):
+        val = {'Arr': np.array(dataDmg[i]['Arr'].calc_sum(N_cyc[i])),
+               'Cof': np.array([x.calc_sum(N_cyc[i]) for x in dataDmg[i]['Cof']]).T,
+               'Pro': np.array(dataDmg[i]['Pro'].calc_sum(N_cyc[i]))}
+        for model in val:
+            if i == 0:
+                dmg[model] = val[model]
+            else:
+                dmg[model][0:2] = dmg[model][0:2] + val[model][0:2]
 
     # ==============================================================================
-    # Variables
+    # Lifetime (batched over all components and models)
     # ==============================================================================
-    # ------------------------------------------
-    # GBX
-    # ------------------------------------------
-    T_GBX_F = dataTime['GBX']['F']['T']
-    V_GBX_F = np.zeros((len(T_GBX_F)))
-    T_GBX_R = dataTime['GBX']['R']['T']
-    V_GBX_R = np.zeros((len(T_GBX_F)))
+    model = ['Arr'] * len(COM) + ['Cof'] * len(COM) + ['Pro'] * len(COM)
+    out = calcWeibull(COM * 3, *[np.concatenate((dmg['Arr'][j], dmg['Cof'][j], dmg['Pro'][j])) for j in range(3)])
 
-    # ------------------------------------------
-    # EMA
-    # ------------------------------------------
-    T_EMA_F = dataTime['EMA']['F']['T']
-    V_EMA_F = dataTime['EMA']['F']['Vs']
-    T_EMA_R = dataTime['EMA']['R']['T']
-    V_EMA_R = dataTime['EMA']['R']['Vs']
+    # ==============================================================================
+    # GBX, EMA, INV (motor units and worst motor unit on axle), and HVS
+    # ==============================================================================
+    for i in range(len(model)):
+        [comp_name, ax, unit] = name[i % len(COM)]
+        res = classWei(zip(key, [val[i] for val in out]))
+        if comp_name == 'HVS':
+            dataLife['HVS'][model[i]] = res
+            continue
+        if unit is not None:
+            dataLife[comp_name]['U'].setdefault(unit, {})[model[i]] = res
+        if not dataLife[comp_name][ax][model[i]] or res['D'] > dataLife[comp_name][ax][model[i]]['D']:
+            dataLife[comp_name][ax][model[i]] = res
 
-    # ------------------------------------------
-    # INV
-    # ------------------------------------------
-    T_INV_F = dataTime['INV']['F']['T']
-    V_INV_F = Vdc
-    T_INV_R = dataTime['INV']['R']['T']
-    V_INV_R = Vdc
+    return dataLife
 
-    # ------------------------------------------
-    # HVS
-    # ------------------------------------------
-    T_HVS = dataTime['HVS']['T']
-    V_HVS = dataTime['HVS']['Vdc']
 
+def initDmg(GBX, EMA, INV, HVS, setup):
     # ==============================================================================
-    # Output
+    # Description
     # ==============================================================================
-    dataLife = {'GBX': {'F': {'Arr': {}, 'Cof': {}, 'Pro': {}}, 'R': {'Arr': {}, 'Cof': {}, 'Pro': {}}},
-                'EMA': {'F': {'Arr': {}, 'Cof': {}, 'Pro': {}}, 'R': {'Arr': {}, 'Cof': {}, 'Pro': {}}},
-                'INV': {'F': {'Arr': {}, 'Cof': {}, 'Pro': {}}, 'R': {'Arr': {}, 'Cof': {}, 'Pro': {}}},
-                'HVS': {'Arr': {}, 'Cof': {}, 'Pro': {}}}
+    """
+    This function initialises the damage accumulators of the mission profile, one series per motor unit (idle axles use
+    the axle channels) of GBX, EMA, and INV and one for the HVS.
+
+    Input:
+    1) GBX:     list of GBX instances (one per motor unit)
+    2) EMA:     list of EMA instances (one per motor unit)
+    3) INV:     list of INV instances (one per motor unit)
+    4) HVS:     HVS instance
+    5) setup:   includes all simulation variables
+
+    Output:
+    1) dataDmg: damage accumulators (names of the series, Arrhenius, Prokopovic, and Coffin-Manson)
+    """
 
-    ###################################################################################################################
-    # Calculation
-    ###################################################################################################################
     # ==============================================================================
-    # GBX
+    # Initialisation
     # ==============================================================================
-    # ------------------------------------------
-    # Front
-    # ------------------------------------------
-    [L_GBX_F_Arr, D_GBX_F_Arr, F_GBX_F_Arr, pdf_GBX_F_Arr, cdf_GBX_F_Arr, x_GBX_F_Arr] = calcDmgArr(GBX, Ts, T_GBX_F, setup)
-    [L_GBX_F_Cof, D_GBX_F_Cof, F_GBX_F_Cof, pdf_GBX_F_Cof, cdf_GBX_F_Cof, x_GBX_F_Cof] = calcDmgCof(GBX, Ts, T_GBX_F, setup)
-    [L_GBX_F_Pro, D_GBX_F_Pro, F_GBX_F_Pro, pdf_GBX_F_Pro, cdf_GBX_F_Pro, x_GBX_F_Pro] = calcDmgPro(GBX, Ts, T_GBX_F, V_GBX_F, setup)
-
-    # ------------------------------------------
-    # Rear
-    # ------------------------------------------
-    [L_GBX_R_Arr, D_GBX_R_Arr, F_GBX_R_Arr, pdf_GBX_R_Arr, cdf_GBX_R_Arr, x_GBX_R_Arr] = calcDmgArr(GBX, Ts, T_GBX_R, setup)
-    [L_GBX_R_Cof, D_GBX_R_Cof, F_GBX_R_Cof, pdf_GBX_R_Cof, cdf_GBX_R_Cof, x_GBX_R_Cof] = calcDmgCof(GBX, Ts, T_GBX_R, setup)
-    [L_GBX_R_Pro, D_GBX_R_Pro, F_GBX_R_Pro, pdf_GBX_R_Pro, cdf_GBX_R_Pro, x_GBX_R_Pro] = calcDmgPro(GBX, Ts, T_GBX_R, V_GBX_R, setup)
+    Ts = 1 / setup['Dat']['fs']
+    Mot = setup['Par']['Mot']
+    comp = {'GBX': GBX, 'EMA': EMA, 'INV': INV}
+    name = []
+    COM = []
 
     # ==============================================================================
-    # EMA
+    # Series
     # ==============================================================================
     # ------------------------------------------
-    # Front
+    # GBX, EMA, and INV (motor units on axle, idle axles use the axle channels)
     # ------------------------------------------
-    [L_EMA_F_Arr, D_EMA_F_Arr, F_EMA_F_Arr, pdf_EMA_F_Arr, cdf_EMA_F_Arr, x_EMA_F_Arr] = calcDmgArr(EMA, Ts, T_EMA_F, setup)
-    [L_EMA_F_Cof, D_EMA_F_Cof, F_EMA_F_Cof, pdf_EMA_F_Cof, cdf_EMA_F_Cof, x_EMA_F_Cof] = calcDmgCof(EMA, Ts, T_EMA_F, setup)
-    [L_EMA_F_Pro, D_EMA_F_Pro, F_EMA_F_Pro, pdf_EMA_F_Pro, cdf_EMA_F_Pro, x_EMA_F_Pro] = calcDmgPro(EMA, Ts, T_EMA_F, V_EMA_F, setup)
+    for comp_name in comp:
+        for ax in ['F', 'R']:
+            units = [u for u in range(len(Mot)) if Mot[u]['axle'] == ax]
+            for u in (units if units else [None]):
+                name.append([comp_name, ax, None if u is None else Mot[u]['name']])
+                COM.append(comp[comp_name][0 if u is None else u])
 
     # ------------------------------------------
-    # Rear
+    # HVS
     # ------------------------------------------
-    [L_EMA_R_Arr, D_EMA_R_Arr, F_EMA_R_Arr, pdf_EMA_R_Arr, cdf_EMA_R_Arr, x_EMA_R_Arr] = calcDmgArr(EMA, Ts, T_EMA_R, setup)
-    [L_EMA_R_Cof, D_EMA_R_Cof, F_EMA_R_Cof, pdf_EMA_R_Cof, cdf_EMA_R_Cof, x_EMA_R_Cof] = calcDmgCof(EMA, Ts, T_EMA_R, setup)
-    [L_EMA_R_Pro, D_EMA_R_Pro, F_EMA_R_Pro, pdf_EMA_R_Pro, cdf_EMA_R_Pro, x_EMA_R_Pro] = calcDmgPro(EMA, Ts, T_EMA_R, V_EMA_R, setup)
+    name.append(['HVS', None, None])
+    COM.append(HVS)
 
     # ==============================================================================
-    # INV
+    # Return
     # ==============================================================================
-    # ------------------------------------------
-    # Front
-    # ------------------------------------------
-    [L_INV_F_Arr, D_INV_F_Arr, F_INV_F_Arr, pdf_INV_F_Arr, cdf_INV_F_Arr, x_INV_F_Arr] = calcDmgArr(INV, Ts, T_INV_F, setup)
-    [L_INV_F_Cof, D_INV_F_Cof, F_INV_F_Cof, pdf_INV_F_Cof, cdf_INV_F_Cof, x_INV_F_Cof] = calcDmgCof(INV, Ts, T_INV_F, setup)
-    [L_INV_F_Pro, D_INV_F_Pro, F_INV_F_Pro, pdf_INV_F_Pro, cdf_INV_F_Pro, x_INV_F_Pro] = calcDmgPro(INV, Ts, T_INV_F, V_INV_F, setup)
+    return {'name': name, 'Arr': classDmgArr(COM, Ts), 'Pro': classDmgPro(COM, Ts),
+            'Cof': [classDmgCof(x, Ts) for x in COM]}
 
-    # ------------------------------------------
-    # Rear
-    # ------------------------------------------
-    [L_INV_R_Arr, D_INV_R_Arr, F_INV_R_Arr, pdf_INV_R_Arr, cdf_INV_R_Arr, x_INV_R_Arr] = calcDmgArr(INV, Ts, T_INV_R, setup)
-    [L_INV_R_Cof, D_INV_R_Cof, F_INV_R_Cof, pdf_INV_R_Cof, cdf_INV_R_Cof, x_INV_R_Cof] = calcDmgCof(INV, Ts, T_INV_R, setup)
-    [L_INV_R_Pro, D_INV_R_Pro, F_INV_R_Pro, pdf_INV_R_Pro, cdf_INV_R_Pro, x_INV_R_Pro] = calcDmgPro(INV, Ts, T_INV_R, V_INV_R, setup)
 
+def calcDmg(dataDmg, dataTime, setup, idx=slice(None)):
     # ==============================================================================
-    # HVS
+    # Description
     # ==============================================================================
-    [L_HVS_Arr, D_HVS_Arr, F_HVS_Arr, pdf_HVS_Arr, cdf_HVS_Arr, x_HVS_Arr] = calcDmgArr(HVS, Ts, T_HVS, setup)
-    [L_HVS_Cof, D_HVS_Cof, F_HVS_Cof, pdf_HVS_Cof, cdf_HVS_Cof, x_HVS_Cof] = calcDmgCof(HVS, Ts, T_HVS, setup)
-    [L_HVS_Pro, D_HVS_Pro, F_HVS_Pro, pdf_HVS_Pro, cdf_HVS_Pro, x_HVS_Pro] = calcDmgPro(HVS, Ts, T_HVS, V_HVS, setup)
+    """
+    This function feeds the temperatures and voltages of the samples idx to the damage accumulators. The samples can be
+    fed at once or in consecutive chunks (e.g. the windows of the decimated recording, see classRec).
+
+    Input:
+    1) dataDmg:     damage accumulators (see initDmg)
+    2) dataTime:    time dependent variables
+    3) setup:       includes all simulation variables
+    4) idx:         slice of the samples
+    """
 
-    ###################################################################################################################
-    # Post-Processing
-    ###################################################################################################################
     # ==============================================================================
-    # GBX
+    # Initialisation
     # ==============================================================================
-    # ------------------------------------------
-    # Front
-    # ------------------------------------------
-    # Arrhenius
-    dataLife['GBX']['F']['Arr']['L']     = L_GBX_F_Arr
-    dataLife['GBX']['F']['Arr']['D']     = D_GBX_F_Arr
-    dataLife['GBX']['F']['Arr']['F']     = F_GBX_F_Arr
-    dataLife['GBX']['F']['Arr']['pdf'] = pdf_GBX_F_Arr
-    dataLife['GBX']['F']['Arr']['cdf'] = cdf_GBX_F_Arr
-    dataLife['GBX']['F']['Arr']['x']     = x_GBX_F_Arr
-
-    # Coffin
-    dataLife['GBX']['F']['Cof']['L']     = L_GBX_F_Cof
-    dataLife['GBX']['F']['Cof']['D']     = D_GBX_F_Cof
-    dataLife['GBX']['F']['Cof']['F']     = F_GBX_F_Cof
-    dataLife['GBX']['F']['Cof']['pdf'] = pdf_GBX_F_Cof
-    dataLife['GBX']['F']['Cof']['cdf'] = cdf_GBX_F_Cof
-    dataLife['GBX']['F']['Cof']['x']     = x_GBX_F_Cof
-
-    # Prokopovic
-    dataLife['GBX']['F']['Pro']['L']     = L_GBX_F_Pro
-    dataLife['GBX']['F']['Pro']['D']     = D_GBX_F_Pro
-    dataLife['GBX']['F']['Pro']['F']     = F_GBX_F_Pro
-    dataLife['GBX']['F']['Pro']['pdf'] = pdf_GBX_F_Pro
-    dataLife['GBX']['F']['Pro']['cdf'] = cdf_GBX_F_Pro
-    dataLife['GBX']['F']['Pro']['x']     = x_GBX_F_Pro
+    unit = [x['name'] for x in setup['Par']['Mot']]
+    T = []
+    V = []
 
-    # ------------------------------------------
-    # Rear
-    # ------------------------------------------
-    # Arrhenius
-    dataLife['GBX']['R']['Arr']['L']     = L_GBX_R_Arr
-    dataLife['GBX']['R']['Arr']['D']     = D_GBX_R_Arr
-    dataLife['GBX']['R']['Arr']['F']     = F_GBX_R_Arr
-    dataLife['GBX']['R']['Arr']['pdf'] = pdf_GBX_R_Arr
-    dataLife['GBX']['R']['Arr']['cdf'] = cdf_GBX_R_Arr
-    dataLife['GBX']['R']['Arr']['x']     = x_GBX_R_Arr
-
-    # Coffin
-    dataLife['GBX']['R']['Cof']['L']     = L_GBX_R_Cof
-    dataLife['GBX']['R']['Cof']['D']     = D_GBX_R_Cof
-    dataLife['GBX']['R']['Cof']['F']     = F_GBX_R_Cof
-    dataLife['GBX']['R']['Cof']['pdf'] = pdf_GBX_R_Cof
-    dataLife['GBX']['R']['Cof']['cdf'] = cdf_GBX_R_Cof
-    dataLife['GBX']['R']['Cof']['x']     = x_GBX_R_Cof
-
-    # Prokopovic
-    dataLife['GBX']['R']['Pro']['L']     = L_GBX_R_Pro
-    dataLife['GBX']['R']['Pro']['D']     = D_GBX_R_Pro
-    dataLife['GBX']['R']['Pro']['F']     = F_GBX_R_Pro
-    dataLife['GBX']['R']['Pro']['pdf'] = pdf_GBX_R_Pro
-    dataLife['GBX']['R']['Pro']['cdf'] = cdf_GBX_R_Pro
-    dataLife['GBX']['R']['Pro']['x']     = x_GBX_R_Pro
+    # ==============================================================================
+    # Signals
+    # ==============================================================================
+    for [comp, ax, name] in dataDmg['name']:
+        # ------------------------------------------
+        # HVS
+        # ------------------------------------------
+        if comp == 'HVS':
+            T.append(dataTime['HVS']['T'][idx])
+            V.append(dataTime['HVS']['Vdc'][idx])
+            continue
+
+        # ------------------------------------------
+        # GBX, EMA, and INV
+        # ------------------------------------------
+        val = dataTime[comp][ax] if name is None else {x: y[:, unit.index(name)] for x, y in dataTime[comp]['U'].items()
+                                                         if x in ['T', 'Vs']}
+        T.append(val['T'][idx])
+        if comp == 'GBX':
+            V.append(np.zeros(len(T[-1])))
+        elif comp == 'EMA':
+            V.append(val['Vs'][idx])
+        else:
+            V.append(dataTime['HVS']['Vdc'][idx])
 
     # ==============================================================================
-    # EMA
+    # Calculation
     # ==============================================================================
     # ------------------------------------------
-    # Front
+    # Arrhenius and Prokopovic (stacked)
     # ------------------------------------------
-    # Arrhenius
-    dataLife['EMA']['F']['Arr']['L']     = L_EMA_F_Arr
-    dataLife['EMA']['F']['Arr']['D']     = D_EMA_F_Arr
-    dataLife['EMA']['F']['Arr']['F']     = F_EMA_F_Arr
-    dataLife['EMA']['F']['Arr']['pdf'] = pdf_EMA_F_Arr
-    dataLife['EMA']['F']['Arr']['cdf'] = cdf_EMA_F_Arr
-    dataLife['EMA']['F']['Arr']['x']     = x_EMA_F_Arr
-
-    # Coffin
-    dataLife['EMA']['F']['Cof']['L']     = L_EMA_F_Cof
-    dataLife['EMA']['F']['Cof']['D']     = D_EMA_F_Cof
-    dataLife['EMA']['F']['Cof']['F']     = F_EMA_F_Cof
-    dataLife['EMA']['F']['Cof']['pdf'] = pdf_EMA_F_Cof
-    dataLife['EMA']['F']['Cof']['cdf'] = cdf_EMA_F_Cof
-    dataLife['EMA']['F']['Cof']['x']     = x_EMA_F_Cof
-
-    # Prokopovic
-    dataLife['EMA']['F']['Pro']['L']     = L_EMA_F_Pro
-    dataLife['EMA']['F']['Pro']['D']     = D_EMA_F_Pro
-    dataLife['EMA']['F']['Pro']['F']     = F_EMA_F_Pro
-    dataLife['EMA']['F']['Pro']['pdf'] = pdf_EMA_F_Pro
-    dataLife['EMA']['F']['Pro']['cdf'] = cdf_EMA_F_Pro
-    dataLife['EMA']['F']['Pro']['x']     = x_EMA_F_Pro
+    dataDmg['Arr'].update(np.stack(T))
+    dataDmg['Pro'].update(np.stack(T), np.stack(V))
 
     # ------------------------------------------
-    # Rear
+    # Coffin Manson (rainflow is sequential per series)
     # ------------------------------------------
-    # Arrhenius
-    dataLife['EMA']['R']['Arr']['L']     = L_EMA_R_Arr
-    dataLife['EMA']['R']['Arr']['D']     = D_EMA_R_Arr
-    dataLife['EMA']['R']['Arr']['F']     = F_EMA_R_Arr
-    dataLife['EMA']['R']['Arr']['pdf'] = pdf_EMA_R_Arr
-    dataLife['EMA']['R']['Arr']['cdf'] = cdf_EMA_R_Arr
-    dataLife['EMA']['R']['Arr']['x']     = x_EMA_R_Arr
-
-    # Coffin
-    dataLife['EMA']['R']['Cof']['L']     = L_EMA_R_Cof
-    dataLife['EMA']['R']['Cof']['D']     = D_EMA_R_Cof
-    dataLife['EMA']['R']['Cof']['F']     = F_EMA_R_Cof
-    dataLife['EMA']['R']['Cof']['pdf'] = pdf_EMA_R_Cof
-    dataLife['EMA']['R']['Cof']['cdf'] = cdf_EMA_R_Cof
-    dataLife['EMA']['R']['Cof']['x']     = x_EMA_R_Cof
-
-    # Prokopovic
-    dataLife['EMA']['R']['Pro']['L']     = L_EMA_R_Pro
-    dataLife['EMA']['R']['Pro']['D']     = D_EMA_R_Pro
-    dataLife['EMA']['R']['Pro']['F']     = F_EMA_R_Pro
-    dataLife['EMA']['R']['Pro']['pdf'] = pdf_EMA_R_Pro
-    dataLife['EMA']['R']['Pro']['cdf'] = cdf_EMA_R_Pro
-    dataLife['EMA']['R']['Pro']['x']     = x_EMA_R_Pro
+    for i in range(len(T)):
+        dataDmg['Cof'][i].update(T[i])
 
+
+#######################################################################################################################
+# Main Function
+#######################################################################################################################
+def reliaSim(GBX, EMA, INV, HVS, dataTime, setup, dataDmg=None):
+    ###################################################################################################################
+    # MSG Out
+    ###################################################################################################################
+    print("INFO: Calculating reliability")
+
+    ###################################################################################################################
+    # Calculation
+    ###################################################################################################################
     # ==============================================================================
-    # INV
+    # Damage (all samples, unless accumulated during the simulation)
     # ==============================================================================
-    # ------------------------------------------
-    # Front
-    # ------------------------------------------
-    # Arrhenius
-    dataLife['INV']['F']['Arr']['L']     = L_INV_F_Arr
-    dataLife['INV']['F']['Arr']['D']     = D_INV_F_Arr
-    dataLife['INV']['F']['Arr']['F']     = F_INV_F_Arr
-    dataLife['INV']['F']['Arr']['pdf'] = pdf_INV_F_Arr
-    dataLife['INV']['F']['Arr']['cdf'] = cdf_INV_F_Arr
-    dataLife['INV']['F']['Arr']['x']     = x_INV_F_Arr
-
-    # Coffin
-    dataLife['INV']['F']['Cof']['L']     = L_INV_F_Cof
-    dataLife['INV']['F']['Cof']['D']     = D_INV_F_Cof
-    dataLife['INV']['F']['Cof']['F']     = F_INV_F_Cof
-    dataLife['INV']['F']['Cof']['pdf'] = pdf_INV_F_Cof
-    dataLife['INV']['F']['Cof']['cdf'] = cdf_INV_F_Cof
-    dataLife['INV']['F']['Cof']['x']     = x_INV_F_Cof
-
-    # Prokopovic
-    dataLife['INV']['F']['Pro']['L']     = L_INV_F_Pro
-    dataLife['INV']['F']['Pro']['D']     = D_INV_F_Pro
-    dataLife['INV']['F']['Pro']['F']     = F_INV_F_Pro
-    dataLife['INV']['F']['Pro']['pdf'] = pdf_INV_F_Pro
-    dataLife['INV']['F']['Pro']['cdf'] = cdf_INV_F_Pro
-    dataLife['INV']['F']['Pro']['x']     = x_INV_F_Pro
-
-    # ------------------------------------------
-    # Rear
-    # ------------------------------------------
-    # Arrhenius
-    dataLife['INV']['R']['Arr']['L']     = L_INV_R_Arr
-    dataLife['INV']['R']['Arr']['D']     = D_INV_R_Arr
-    dataLife['INV']['R']['Arr']['F']     = F_INV_R_Arr
-    dataLife['INV']['R']['Arr']['pdf'] = pdf_INV_R_Arr
-    dataLife['INV']['R']['Arr']['cdf'] = cdf_INV_R_Arr
-    dataLife['INV']['R']['Arr']['x']     = x_INV_R_Arr
-
-    # Coffin
-    dataLife['INV']['R']['Cof']['L']     = L_INV_R_Cof
-    dataLife['INV']['R']['Cof']['D']     = D_INV_R_Cof
-    dataLife['INV']['R']['Cof']['F']     = F_INV_R_Cof
-    dataLife['INV']['R']['Cof']['pdf'] = pdf_INV_R_Cof
-    dataLife['INV']['R']['Cof']['cdf'] = cdf_INV_R_Cof
-    dataLife['INV']['R']['Cof']['x']     = x_INV_R_Cof
-
-    # Prokopovic
-    dataLife['INV']['R']['Pro']['L']     = L_INV_R_Pro
-    dataLife['INV']['R']['Pro']['D']     = D_INV_R_Pro
-    dataLife['INV']['R']['Pro']['F']     = F_INV_R_Pro
-    dataLife['INV']['R']['Pro']['pdf'] = pdf_INV_R_Pro
-    dataLife['INV']['R']['Pro']['cdf'] = cdf_INV_R_Pro
-    dataLife['INV']['R']['Pro']['x']     = x_INV_R_Pro
+    if dataDmg is None:
+        dataDmg = initDmg(GBX, EMA, INV, HVS, setup)
+        calcDmg(dataDmg, dataTime, setup)
 
     # ==============================================================================
-    # HVS
+    # Lifetime
     # ==============================================================================
-    # Arrhenius
-    dataLife['HVS']['Arr']['L']     = L_HVS_Arr
-    dataLife['HVS']['Arr']['D']     = D_HVS_Arr
-    dataLife['HVS']['Arr']['F']     = F_HVS_Arr
-    dataLife['HVS']['Arr']['pdf'] = pdf_HVS_Arr
-    dataLife['HVS']['Arr']['cdf'] = cdf_HVS_Arr
-    dataLife['HVS']['Arr']['x']     = x_HVS_Arr
-
-    # Coffin
-    dataLife['HVS']['Cof']['L']     = L_HVS_Cof
-    dataLife['HVS']['Cof']['D']     = D_HVS_Cof
-    dataLife['HVS']['Cof']['F']     = F_HVS_Cof
-    dataLife['HVS']['Cof']['pdf'] = pdf_HVS_Cof
-    dataLife['HVS']['Cof']['cdf'] = cdf_HVS_Cof
-    dataLife['HVS']['Cof']['x']     = x_HVS_Cof
-
-    # Prokopovic
-    dataLife['HVS']['Pro']['L']     = L_HVS_Pro
-    dataLife['HVS']['Pro']['D']     = D_HVS_Pro
-    dataLife['HVS']['Pro']['F']     = F_HVS_Pro
-    dataLife['HVS']['Pro']['pdf'] = pdf_HVS_Pro
-    dataLife['HVS']['Pro']['cdf'] = cdf_HVS_Pro
-    dataLife['HVS']['Pro']['x']     = x_HVS_Pro
+    dataLife = calcLife([dataDmg], [setup['Exp']['cyc']])
 
     ###################################################################################################################
     # MSG Out
@@ -377,7 +264,7 @@ def reliaSim(GBX, EMA, INV, HVS, dataTime, setup):
     ###################################################################################################################
     # Return
     ###################################################################################################################
-    return dataLife
+    return [dataLife, dataDmg]
 
 #######################################################################################################################
 # References
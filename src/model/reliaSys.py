@@ -0,0 +1,221 @@
+#######################################################################################################################
+#######################################################################################################################
+# Title:        Python Electric Vehicle Power Toolkit (PyEVPowerKit)
+# Topic:        EV Modeling
+# File:         reliaSys
+# Date:         18.03.2024
+# Author:       Dr. Pascal A. Schirmer
+# Version:      V.0.1
+# Copyright:    Pascal Schirmer
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+# Function Description
+#######################################################################################################################
+"""
+This function calculates the system reliability of the drive train using Monte-Carlo simulation. Component lifetimes are
+sampled from the Weibull distributions of reliaSim (beta, L63). Each driven axle is a series system of the GBX, EMA, and
+INV of all its motor units, and the drive train is a series system of the driven axles and the HVS. The samples are
+drawn in vectorized batches distributed over a process pool. Each batch has its own seed spawned from
+setup['Exp']['mcSeed'], so the results are reproducible independently of the number of workers.
+
+Inputs:     1) dataLife:    lifetime results
+            2) dataTime:    internal time dependent variables
+            3) setup:       includes all simulation variables
+Outputs:    1) dataSys:     system lifetime results per lifetime model (Arr, Cof, Pro)
+
+"""
+
+#######################################################################################################################
+# Import libs
+#######################################################################################################################
+# ==============================================================================
+# Internal
+# ==============================================================================
+
+# ==============================================================================
+# External
+# ==============================================================================
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+
+#######################################################################################################################
+# Additional Functions
+#######################################################################################################################
+def sampleSys(beta, L63, group, N, seed, Tend, edge):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function samples one batch of drive train lifetimes and returns mergeable statistics.
+
+    Input:
+    1) beta:    Weibull shape parameters of the components
+    2) L63:     Weibull scale parameters of the components (hrs)
+    3) group:   Index of the series group (axle or HVS) of each component
+    4) N:       Number of samples
+    5) seed:    Seed sequence of the batch
+    6) Tend:    Operating time (hrs)
+    7) edge:    Bin edges of the lifetime histogram (hrs)
+
+    Output:
+    1) out:     Sum of samples, squares, failures, and first failures per component and group, lifetime histogram
+    """
+
+    # ==============================================================================
+    # Calculation
+    # ==============================================================================
+    # ------------------------------------------
+    # Component lifetimes (inverse transform)
+    # ------------------------------------------
+    rng = np.random.default_rng(seed)
+    L = L63 * np.power(-np.log(rng.random((N, len(beta)))), 1 / beta)
+
+    # ------------------------------------------
+    # Series system
+    # ------------------------------------------
+    first = np.argmin(L, axis=1)
+    L_sys = L[np.arange(N), first]
+
+    # ==============================================================================
+    # Return
+    # ==============================================================================
+    return {'N': N, 'sum': np.sum(L_sys), 'sq': np.sum(L_sys ** 2), 'fail': np.sum(L_sys <= Tend),
+            'comp': np.bincount(first, minlength=len(beta)),
+            'group': np.bincount(group[first], minlength=np.max(group) + 1),
+            'hist': np.histogram(np.maximum(L_sys, edge[0]), bins=edge)[0]}
+
+
+#######################################################################################################################
+# Main Function
+#######################################################################################################################
+def reliaSys(dataLife, dataTime, setup):
+    ###################################################################################################################
+    # MSG Out
+    ###################################################################################################################
+    print("INFO: Calculating system reliability (Monte-Carlo)")
+
+    ###################################################################################################################
+    # Initialisation
+    ###################################################################################################################
+    # ==============================================================================
+    # Parameters
+    # ==============================================================================
+    N = int(setup['Exp']['mcN'])
+    nBatch = int(np.ceil(N / 1e5))
+    nSmp = dataTime['REC']['N'] if 'REC' in dataTime else len(dataTime['VEH']['v'])
+    Tend = nSmp / setup['Dat']['fs'] * setup['Exp']['cyc'] / 3600
+    seed = np.random.SeedSequence(setup['Exp']['mcSeed']).spawn(nBatch)
+    size = [N // nBatch + (1 if i < N % nBatch else 0) for i in range(nBatch)]
+
+    # ==============================================================================
+    # Series structure
+    # ==============================================================================
+    name = []
+    comp = []
+    group = []
+    for ax in setup['Par']['axle']:
+        for unit in [x['name'] for x in setup['Par']['Mot'] if x['axle'] == ax]:
+            for comp_name in ['GBX', 'EMA', 'INV']:
+                name.append(comp_name + '_' + unit)
+                comp.append([comp_name, unit])
+                group.append(setup['Par']['axle'].index(ax))
+    name.append('HVS')
+    comp.append(['HVS', None])
+    group.append(len(setup['Par']['axle']))
+    group = np.array(group)
+
+    # ==============================================================================
+    # Output
+    # ==============================================================================
+    dataSys = {}
+
+    ###################################################################################################################
+    # Calculation
+    ###################################################################################################################
+    for model in ['Arr', 'Cof', 'Pro']:
+        # ==============================================================================
+        # Weibull parameters
+        # ==============================================================================
+        par = [dataLife['HVS'][model] if x == 'HVS' else dataLife[x]['U'][unit][model] for [x, unit] in comp]
+        beta = np.array([x['beta'] for x in par], dtype=float)
+        L63 = np.array([x['L63'] for x in par], dtype=float)
+
+        # ==============================================================================
+        # Histogram range (operating time if no component has a finite positive scale)
+        # ==============================================================================
+        fin = L63[np.isfinite(L63) & (L63 > 0)]
+        if fin.size == 0:
+            fin = np.array([Tend])
+            print("WARN: No finite lifetime for the ", model, " model, the histogram is scaled by the operating time")
+        edge = np.geomspace(np.min(fin) * 1e-4, np.max(fin) * 1e1, 1001)
+
+        # ==============================================================================
+        # Sampling (process pool)
+        # ==============================================================================
+        arg = [(beta, L63, group, size[i], seed[i], Tend, edge) for i in range(nBatch)]
+        if setup['Exp']['mcWorker'] > 1:
+            with ProcessPoolExecutor(max_workers=setup['Exp']['mcWorker']) as pool:
+                out = list(pool.map(sampleSys, *zip(*arg)))
+        else:
+            out = [sampleSys(*x) for x in arg]
+
+        # ==============================================================================
+        # Merging
+        # ==============================================================================
+        n = np.cumsum([x['N'] for x in out])
+        s = np.cumsum([x['sum'] for x in out])
+        q = np.cumsum([x['sq'] for x in out])
+        f = np.cumsum([x['fail'] for x in out])
+        hist = np.sum([x['hist'] for x in out], axis=0)
+
+        # ==============================================================================
+        # Statistics
+        # ==============================================================================
+        # ------------------------------------------
+        # Mean lifetime and failure probability
+        # ------------------------------------------
+        L = s / n
+        seL = np.sqrt(np.maximum(q / n - L ** 2, 0) / n)
+        F = f / n
+        seF = np.sqrt(F * (1 - F) / n)
+
+        # ------------------------------------------
+        # Bx lifetime (histogram quantile, infinite if the quantile lies beyond the histogram)
+        # ------------------------------------------
+        cdf = np.cumsum(hist) / n[-1]
+        Lx = np.interp(setup['Exp']['mcBx'], np.concatenate(([0], cdf)), edge, right=np.inf)
+
+        # ==============================================================================
+        # Output
+        # ==============================================================================
+        dataSys[model] = {'L': L[-1], 'Lx': Lx, 'F': F[-1], 'seL': seL[-1], 'seF': seF[-1], 'N': n[-1],
+                          'conv': {'N': n, 'L': L, 'seL': seL, 'F': F, 'seF': seF},
+                          'comp': dict(zip(name, np.sum([x['comp'] for x in out], axis=0) / n[-1])),
+                          'axle': dict(zip(setup['Par']['axle'] + ['HVS'],
+                                           np.sum([x['group'] for x in out], axis=0) / n[-1]))}
+
+        # ==============================================================================
+        # Diagnostics
+        # ==============================================================================
+        print("INFO: ", model, " mean system lifetime ", round(L[-1], 1), " hrs (rel. std. err. ",
+              round(seL[-1] / L[-1] * 100, 3), " %), failure probability ", round(F[-1] * 100, 3), " %")
+
+    ###################################################################################################################
+    # MSG Out
+    ###################################################################################################################
+    print("DONE: System reliability calculated")
+
+    ###################################################################################################################
+    # Return
+    ###################################################################################################################
+    return dataSys
+
+#######################################################################################################################
+# References
+#######################################################################################################################
@@ -0,0 +1,185 @@
+#######################################################################################################################
+#######################################################################################################################
+# Title:        Python Electric Vehicle Power Toolkit (PyEVPowerKit)
+# Topic:        EV Modeling
+# File:         runSim
+# Date:         18.03.2024
+# Author:       Dr. Pascal A. Schirmer
+# Version:      V.0.1
+# Copyright:    Pascal Schirmer
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+# Function Description
+#######################################################################################################################
+"""
+This function runs the component level simulation of a mission profile after the vehicle level simulation (see
+initVeh). It is the common pipeline of the driving simulation (main), the fleet simulation (fleetSim), and the
+sensitivity analysis (sensSim). The fidelity is selected by setup['Exp']['fid']:
+
+- 1) map-based quasi-static simulation (mapSim)
+- 2) time-domain simulation (cycSim), with operating-point clustering (opc), load spectra (hist), decimated recording
+     (rec), and periodic steady-state (pss)
+- 3) performance test (perfSim)
+- 4) forward simulation (fwdSim)
+
+The axle and total channels are derived from the motor units at the end (calcAxle). For the decimated recording the
+components are simulated in a ring buffer, the axle channels, damage, load spectra, and operating-point report are
+evaluated window by window (classRec) and the decimated time dependent variables are returned.
+
+Inputs:     1) data:        mission profile
+            2) dataTime:    time dependent variables of the vehicle level simulation
+            3) path:        includes all path variables
+            4) setup:       includes all simulation variables
+Outputs:    1) data:        mission profile
+            2) dataTime:    time dependent variables (window mean for the decimated recording, see classRec)
+            3) COM:         component instances [GBX, EMA, INV, HVS, VEH]
+            4) dataHist:    load spectra (see initHist), None if disabled
+            5) dataDmg:     damage accumulated during the decimated recording (see reliaSim), None otherwise
+
+"""
+
+#######################################################################################################################
+# Import libs
+#######################################################################################################################
+# ==============================================================================
+# Internal
+# ==============================================================================
+from src.general.smallFnc import calcAxle
+from src.model.initComp import initComp
+from src.model.cycSim import cycSim
+from src.model.periSim import periSim
+from src.model.classOpc import classOpc
+from src.model.classRec import classRec
+from src.model.classHist import initHist, calcHist
+from src.model.mapSim import mapSim
+from src.model.perfSim import perfSim
+from src.model.fwdSim import fwdSim
+
+# ==============================================================================
+# External
+# ==============================================================================
+import numpy as np
+
+
+#######################################################################################################################
+# Additional Functions
+#######################################################################################################################
+
+
+#######################################################################################################################
+# Main Function
+#######################################################################################################################
+def runSim(data, dataTime, path, setup):
+    ###################################################################################################################
+    # Initialisation
+    ###################################################################################################################
+    # ==============================================================================
+    # Components
+    # ==============================================================================
+    [GBX, EMA, INV, HVS, VEH] = initComp(setup)
+
+    # ==============================================================================
+    # Variables
+    # ==============================================================================
+    dataHist = None
+    dataDmg = None
+
+    ###################################################################################################################
+    # Calculation
+    ###################################################################################################################
+    # ==============================================================================
+    # Map-Based Simulation (fast tier)
+    # ==============================================================================
+    if setup['Exp']['fid'] == 1:
+        dataTime = mapSim(GBX, EMA, INV, HVS, data, dataTime, path, setup)
+
+    # ==============================================================================
+    # Performance Test (acceleration and top speed)
+    # ==============================================================================
+    elif setup['Exp']['fid'] == 3:
+        dataTime['PERF'] = perfSim(GBX, EMA, VEH, dataTime['VEH']['Vdc'][0], setup)
+
+    # ==============================================================================
+    # Forward Simulation (driver model)
+    # ==============================================================================
+    elif setup['Exp']['fid'] == 4:
+        dataTime['FWD'] = fwdSim(GBX, EMA, VEH, data, dataTime, setup)
+
+    # ==============================================================================
+    # Time-Domain Simulation
+    # ==============================================================================
+    else:
+        # ------------------------------------------
+        # Operating-Point Clustering
+        # ------------------------------------------
+        if setup['Exp']['opc'] == 1:
+            OPC = classOpc(EMA, setup)
+        else:
+            OPC = None
+
+        # ------------------------------------------
+        # Decimated Recording
+        # ------------------------------------------
+        if setup['Exp']['rec'] == 1:
+            REC = classRec(dataTime, len(data['t']), setup, [GBX, EMA, INV, HVS], OPC)
+        else:
+            REC = None
+
+        # ------------------------------------------
+        # Load Spectra (per window for the decimated recording)
+        # ------------------------------------------
+        if setup['Exp']['hist'] == 1 and REC is None:
+            dataHist = initHist(GBX, EMA, INV, HVS, setup)
+
+        # ------------------------------------------
+        # Iterative Simulation
+        # ------------------------------------------
+        dataTime = cycSim(GBX, EMA, INV, HVS, VEH, data, dataTime, setup, OPC, dataHist, REC)
+
+        # ------------------------------------------
+        # Periodic Steady-State
+        # ------------------------------------------
+        if setup['Exp']['pss'] == 1:
+            [data, dataTime] = periSim(GBX, EMA, INV, HVS, VEH, data, dataTime, setup, OPC, REC)
+            if dataHist is not None:
+                dataHist = initHist(GBX, EMA, INV, HVS, setup)
+                calcHist(slice(None), dataHist, dataTime, setup)
+
+        # ------------------------------------------
+        # Decimated Recording (axle channels, damage, load spectra, and report per window)
+        # ------------------------------------------
+        if REC is not None:
+            dataTime = REC.finish(dataTime)
+            [dataHist, dataDmg] = [REC.hist, REC.dmg]
+        else:
+            dataTime = calcAxle(dataTime, setup)
+            if OPC is not None:
+                OPC.calc_rep(INV, dataTime, np.arange(len(data['t'])), setup)
+
+        # ------------------------------------------
+        # Operating-Point Clustering (accuracy)
+        # ------------------------------------------
+        if OPC is not None:
+            print("INFO: Operating-point clustering used ", len(OPC.rep), " representatives for ", OPC.N,
+                  " operating points (", OPC.nEx, " solved exactly in saturated or non-smooth cells)")
+            dataTime['OPC'] = OPC.report()
+
+    # ==============================================================================
+    # Axles and Total (time-domain simulation see above)
+    # ==============================================================================
+    if setup['Exp']['fid'] != 2:
+        dataTime = calcAxle(dataTime, setup)
+
+    ###################################################################################################################
+    # Return
+    ###################################################################################################################
+    return [data, dataTime, [GBX, EMA, INV, HVS, VEH], dataHist, dataDmg]
+
+#######################################################################################################################
+# References
+#######################################################################################################################
@@ -0,0 +1,554 @@
+#######################################################################################################################
+#######################################################################################################################
+# Title:        Python Electric Vehicle Power Toolkit (PyEVPowerKit)
+# Topic:        EV Modeling
+# File:         sensSim
+# Date:         18.03.2024
+# Author:       Dr. Pascal A. Schirmer
+# Version:      V.0.1
+# Copyright:    Pascal Schirmer
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+# Function Description
+#######################################################################################################################
+"""
+These functions implement the global sensitivity analysis of the key performance indicators (KPI, see catalog) with
+respect to user-chosen parameters of setup['Par']. The parameters are varied relative to their nominal values of the
+setup file, e.g. setup['Exp']['sensPar'] = {'VEH/c_w': [0.9, 1.1], 'INV/Ea': [0.8, 1.2]}, and the outputs are KPI
+names, e.g. setup['Exp']['sensOut'] = ['eta', 'L_INV_Cof'].
+
+Methods:
+- Sobol (sensMet = 1):  Saltelli sampling (scrambled Sobol sequence, N base samples and N (d + 2) evaluations for d
+                        parameters), first-order indices (Saltelli 2010) and total indices (Jansen)
+- Morris (sensMet = 2): elementary effects of N trajectories on a 4-level grid (N (d + 1) evaluations), mean of the
+                        absolute effects (mu*), mean (mu), and standard deviation (sigma)
+
+The confidence intervals (95 %) of the indices are bootstrapped over the base samples (Sobol) or trajectories (Morris).
+The evaluations reuse unchanged simulation stages: the mission profile is loaded once, the vehicle level simulation is
+cached per worker for identical vehicle parameters, and samples which differ only in the lifetime model parameters
+share one component level simulation (only the reliability is evaluated per sample).
+
+Fnc:
+1)  getPar:     returns a parameter of the setup by its name, e.g. 'VEH/c_w'
+2)  setPar:     sets a parameter of the setup by its name
+3)  getStage:   keys of the vehicle and component level simulation stages of a setup
+4)  genSample:  samples of the parameters in the unit hypercube (Sobol or Morris)
+5)  calcSim:    vehicle and component level simulation of a sample
+6)  calcGrp:    evaluates a group of samples sharing the component level simulation
+7)  calcIdx:    sensitivity indices and bootstrapped confidence intervals
+8)  sensSim:    sensitivity analysis of the KPIs
+
+"""
+
+#######################################################################################################################
+# Import libs
+#######################################################################################################################
+# ==============================================================================
+# Internal
+# ==============================================================================
+from src.data.loadData import loadData
+from src.data.loadSetup import loadSetup
+from src.data.sampleData import sampleData
+from src.general.mechVehPara import mechVehPara
+from src.general.smallFnc import getCycles, getTopo
+from src.general.catalog import getKpi
+from src.model.initComp import initComp
+from src.model.cycSim import initVeh
+from src.model.runSim import runSim
+from src.model.reliaSim import reliaSim
+
+# ==============================================================================
+# External
+# ==============================================================================
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from os.path import join as pjoin
+from datetime import datetime
+from scipy.io import savemat
+from scipy.stats import qmc
+from tqdm import tqdm
+import numpy as np
+import hashlib
+import json
+import copy
+
+# ==============================================================================
+# Stages
+# ==============================================================================
+# Parameters of the lifetime models only (reliaSim)
+LIFE = ['Ea', 'k', 'n', 'L0', 'Nf0', 'T0', 'dT0', 'V0', 'F0', 'beta', 'CL', 'Bx']
+
+# Parameters of the vehicle level simulation (mechVehPara, mechVeh, mechWhe, elecVeh, therVeh)
+VEH = {'VEH': None, 'p_a': None, 'v_w': None, 'xwd': None, 'Mot': None, 'GBX': ['i', 'J_gbx'], 'EMA': ['J_rot'],
+       'HVS': ['V_max', 'V_min', 'V_nom']}
+
+# Inputs of the worker processes (see initSens) and cached vehicle level simulations
+glob = {}
+cache = {}
+
+
+#######################################################################################################################
+# Additional Functions
+#######################################################################################################################
+def getPar(setup, name):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function returns a parameter of the setup by its name, i.e. 'comp/name' for component parameters (e.g.
+    'VEH/c_w') and 'name' for global parameters (e.g. 'p_a').
+    """
+
+    val = setup['Par']
+    for x in name.split('/'):
+        if x not in val:
+            raise ValueError("ERROR: Parameter " + name + " of the sensitivity analysis not found in the setup")
+        val = val[x]
+
+    return val
+
+
+def setPar(setup, name, val):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function sets a parameter of the setup by its name (see getPar).
+    """
+
+    path = name.split('/')
+    par = getPar(setup, '/'.join(path[:-1])) if len(path) > 1 else setup['Par']
+    par[path[-1]] = val
+
+
+def getStage(setup):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function returns the keys (hashes of the parameters) of the vehicle and component level simulation stages,
+    samples with identical keys share the results of the stage. For the decimated recording the damage is accumulated
+    during the component level simulation, i.e. the lifetime parameters are part of its key.
+    """
+
+    # ==============================================================================
+    # Initialisation
+    # ==============================================================================
+    Par = setup['Par']
+    life = [] if setup['Exp']['fid'] == 2 and setup['Exp']['rec'] == 1 else LIFE
+    veh = {x: Par[x] if VEH[x] is None else {y: Par[x][y] for y in VEH[x]} for x in VEH if x != 'Mot'}
+    veh['Mot'] = [{x: {y: unit[x][y] for y in VEH.get(x, [])} if isinstance(unit[x], dict) else unit[x]
+                   for x in unit} for unit in Par['Mot']]
+    sim = {x: {y: Par[x][y] for y in Par[x] if y not in life} if isinstance(Par[x], dict) else Par[x] for x in Par}
+    sim['Mot'] = [{x: {y: unit[x][y] for y in unit[x] if y not in life} if isinstance(unit[x], dict) else unit[x]
+                   for x in unit} for unit in Par['Mot']]
+
+    # ==============================================================================
+    # Calculation
+    # ==============================================================================
+    key = [json.dumps(x, sort_keys=True, default=lambda y: y.tolist() if hasattr(y, 'tolist') else str(y))
+           for x in [veh, sim]]
+
+    # ==============================================================================
+    # Return
+    # ==============================================================================
+    return [hashlib.sha1(x.encode()).hexdigest() for x in key]
+
+
+def getSetup(base, x):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function returns the pre-processed setup of a sample, i.e. the nominal parameters scaled with the factors x
+    of the sample (in the order of setup['Exp']['sensPar']).
+    """
+
+    setup = copy.deepcopy(base)
+    for name, val in zip(setup['Exp']['sensPar'], x):
+        setPar(setup, name, getPar(setup, name) * val)
+
+    return getTopo(mechVehPara(setup))
+
+
+#######################################################################################################################
+# Sampling
+#######################################################################################################################
+def genSample(setup):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function returns the samples of the parameters in the unit hypercube.
+
+    Input:
+    1) setup:   includes all simulation variables
+
+    Output:
+    1) U:       samples (evaluations x parameters), Sobol: blocks of A, AB_1...AB_d, B per base sample, Morris: blocks
+                of the d + 1 points per trajectory
+    2) step:    Morris: parameter and signed step of the points 1...d of each trajectory (trajectories x d x 2)
+    """
+
+    # ==============================================================================
+    # Initialisation
+    # ==============================================================================
+    d = len(setup['Exp']['sensPar'])
+    N = int(setup['Exp']['sensN'])
+    seed = setup['Exp']['sensSeed']
+
+    # ==============================================================================
+    # Sobol (Saltelli)
+    # ==============================================================================
+    if setup['Exp']['sensMet'] == 1:
+        X = qmc.Sobol(d=2 * d, scramble=True, seed=seed).random_base2(m=int(np.ceil(np.log2(N))))
+        [A, B] = [X[:, :d], X[:, d:]]
+        AB = np.repeat(A[:, None, :], d, axis=1)
+        AB[:, np.arange(d), np.arange(d)] = B
+        U = np.concatenate((A[:, None, :], AB, B[:, None, :]), axis=1).reshape(-1, d)
+        step = None
+
+    # ==============================================================================
+    # Morris (trajectories)
+    # ==============================================================================
+    elif setup['Exp']['sensMet'] == 2:
+        p = 4
+        delta = p / (2 * (p - 1))
+        rng = np.random.default_rng(seed)
+        U = np.zeros((N, d + 1, d))
+        step = np.zeros((N, d, 2))
+        for r in range(N):
+            sign = rng.choice([-1, 1], d)
+            U[r, 0] = rng.integers(0, p // 2, d) / (p - 1) + (sign < 0) * delta
+            order = rng.permutation(d)
+            for j, i in enumerate(order):
+                U[r, j + 1] = U[r, j]
+                U[r, j + 1, i] = U[r, j, i] + sign[i] * delta
+                step[r, j] = [i, sign[i] * delta]
+        U = U.reshape(-1, d)
+
+    else:
+        raise ValueError("ERROR: Unknown sensitivity method " + str(setup['Exp']['sensMet']))
+
+    # ==============================================================================
+    # Return
+    # ==============================================================================
+    return [U, step]
+
+
+#######################################################################################################################
+# Evaluation
+#######################################################################################################################
+def initSens(data, base, path):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function stores the loaded mission profile, the nominal setup, and the paths in the worker process.
+    """
+
+    glob.update(data=data, base=base, path=path)
+    cache.clear()
+
+
+def calcVeh(setup):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function returns the vehicle level simulation of a setup, cached for identical vehicle parameters (the last
+    four stages are kept per process).
+    """
+
+    # ==============================================================================
+    # Initialisation
+    # ==============================================================================
+    key = getStage(setup)[0]
+
+    # ==============================================================================
+    # Calculation
+    # ==============================================================================
+    if key not in cache:
+        [data, dataTime] = initVeh(glob['data'].copy(), setup)
+        if len(cache) >= 4:
+            cache.pop(next(iter(cache)))
+        cache[key] = [data, dataTime]
+
+    # ==============================================================================
+    # Return
+    # ==============================================================================
+    return copy.deepcopy(cache[key])
+
+
+def calcSim(setup):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function returns the vehicle (cached, see calcVeh) and component level simulation (runSim) of a setup for
+    the fidelity of setup['Exp']['fid'] (see main).
+
+    Input:
+    1) setup:       pre-processed setup of the sample (see getSetup)
+
+    Output:
+    1) dataTime:    time dependent variables
+    2) COM:         component instances (GBX, EMA, INV, HVS, VEH)
+    3) dataDmg:     damage accumulated during the decimated recording (see runSim), None otherwise
+    """
+
+    # ==============================================================================
+    # Vehicle
+    # ==============================================================================
+    [data, dataTime] = calcVeh(setup)
+
+    # ==============================================================================
+    # Components
+    # ==============================================================================
+    [_, dataTime, COM, _, dataDmg] = runSim(data, dataTime, glob['path'], setup)
+
+    # ==============================================================================
+    # Return
+    # ==============================================================================
+    return [dataTime, COM, dataDmg]
+
+
+def calcGrp(rows):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function evaluates a group of samples sharing the component level simulation, i.e. samples which differ only
+    in the lifetime model parameters. The component level simulation runs once, the reliability per sample.
+
+    Input:
+    1) rows:    list of (index, factors) of the samples
+
+    Output:
+    1) out:     list of (index, KPIs) of the samples, KPIs in the order of setup['Exp']['sensOut']
+    """
+
+    # ==============================================================================
+    # Initialisation
+    # ==============================================================================
+    setup = getSetup(glob['base'], rows[0][1])
+    fid = setup['Exp']['fid']
+    out = []
+
+    # ==============================================================================
+    # Simulation
+    # ==============================================================================
+    [dataTime, _, dataDmg] = calcSim(setup)
+
+    # ==============================================================================
+    # Reliability and KPIs (per sample)
+    # ==============================================================================
+    for (i, x) in rows:
+        setup = getSetup(glob['base'], x)
+        if fid == 2:
+            [GBX, EMA, INV, HVS, _] = initComp(setup)
+            dataLife = reliaSim(GBX, EMA, INV, HVS, dataTime, setup, dataDmg)[0]
+        else:
+            dataLife = {}
+        kpi = getKpi(dataTime, dataLife, setup)
+        out.append((i, [kpi.get(y, np.nan) for y in setup['Exp']['sensOut']]))
+
+    # ==============================================================================
+    # Return
+    # ==============================================================================
+    return out
+
+
+#######################################################################################################################
+# Indices
+#######################################################################################################################
+def calcIdx(Y, step, setup):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function returns the sensitivity indices of one output and their bootstrapped confidence intervals (95 %).
+    Base samples (Sobol) or trajectories (Morris) with failed evaluations are dropped, the output is centered to reduce
+    the variance of the Sobol estimators.
+
+    Input:
+    1) Y:       output of the evaluations (see genSample)
+    2) step:    Morris: parameter and signed step of the trajectories (see genSample)
+    3) setup:   includes all simulation variables
+
+    Output:
+    1) res:     Sobol: first-order (S1) and total (ST) indices, Morris: mu*, mu, and sigma of the elementary effects,
+                confidence intervals as (lower, upper) x parameters ('<index>_ci')
+    """
+
+    # ==============================================================================
+    # Initialisation
+    # ==============================================================================
+    d = len(setup['Exp']['sensPar'])
+    rng = np.random.default_rng(setup['Exp']['sensSeed'])
+    Y = Y.reshape(-1, d + 2 if setup['Exp']['sensMet'] == 1 else d + 1)
+    ok = np.all(np.isfinite(Y), axis=1)
+    Y = Y - np.mean(Y[ok]) if np.any(ok) else Y
+
+    # ==============================================================================
+    # Sobol
+    # ==============================================================================
+    if setup['Exp']['sensMet'] == 1:
+        # ------------------------------------------
+        # Estimators (base samples x ... x parameters)
+        # ------------------------------------------
+        def fnc(idx):
+            [fA, fAB, fB] = [Y[idx, 0, None], Y[idx, 1:-1], Y[idx, -1, None]]
+            V = np.var(np.concatenate((fA, fB), axis=-2), axis=-2)
+            S1 = np.mean(fB * (fAB - fA), axis=-2) / V
+            ST = 0.5 * np.mean((fA - fAB) ** 2, axis=-2) / V
+            return {'S1': S1, 'ST': ST}
+
+    # ==============================================================================
+    # Morris
+    # ==============================================================================
+    else:
+        # ------------------------------------------
+        # Elementary Effects (trajectories x parameters)
+        # ------------------------------------------
+        EE = np.zeros((Y.shape[0], d))
+        for r in range(Y.shape[0]):
+            i = step[r, :, 0].astype(int)
+            EE[r, i] = np.diff(Y[r]) / step[r, :, 1]
+
+        # ------------------------------------------
+        # Estimators
+        # ------------------------------------------
+        def fnc(idx):
+            return {'mu_star': np.mean(np.abs(EE[idx]), axis=-2), 'mu': np.mean(EE[idx], axis=-2),
+                    'sigma': np.std(EE[idx], axis=-2, ddof=1)}
+
+    # ==============================================================================
+    # Calculation
+    # ==============================================================================
+    idx = np.flatnonzero(ok)
+    res = fnc(idx)
+    boot = fnc(rng.choice(idx, (setup['Exp']['sensBoot'], len(idx))))
+    for x in list(res):
+        res[x + '_ci'] = np.percentile(boot[x], [2.5, 97.5], axis=0)
+    res['N'] = len(idx)
+
+    # ==============================================================================
+    # Return
+    # ==============================================================================
+    return res
+
+
+#######################################################################################################################
+# Main Function
+#######################################################################################################################
+def sensSim(setup, path):
+    ###################################################################################################################
+    # MSG IN
+    ###################################################################################################################
+    print("----------------------------------------------------------------------------------------------------------")
+    print("Sensitivity Analysis")
+    print("----------------------------------------------------------------------------------------------------------")
+
+    ###################################################################################################################
+    # Initialisation
+    ###################################################################################################################
+    # ==============================================================================
+    # Loading (once)
+    # ==============================================================================
+    setup = loadSetup(copy.deepcopy(setup), path)
+    data = sampleData(loadData(setup, path), setup)
+    base = getCycles(data, setup)
+
+    # ==============================================================================
+    # Parameters
+    # ==============================================================================
+    par = list(base['Exp']['sensPar'])
+    out = list(base['Exp']['sensOut'])
+    lim = np.array([base['Exp']['sensPar'][x] for x in par], dtype=float)
+    met = {1: 'Sobol', 2: 'Morris'}.get(base['Exp']['sensMet'])
+    W = base['Exp']['sensWorker']
+    for x in par:
+        if not np.isscalar(getPar(base, x)):
+            raise ValueError("ERROR: Parameter " + x + " of the sensitivity analysis is not a scalar")
+
+    # ==============================================================================
+    # Samples and Stages
+    # ==============================================================================
+    [U, step] = genSample(base)
+    X = lim[:, 0] + U * (lim[:, 1] - lim[:, 0])
+    grp = {}
+    for i, x in enumerate(X):
+        grp.setdefault(getStage(getSetup(base, x))[1], []).append((i, x))
+    grp = list(grp.values())
+    print("INFO: ", met, " analysis of ", len(par), " parameters, ", len(X), " evaluations, ", len(grp),
+          " component level simulations on ", W, " worker(s)")
+
+    ###################################################################################################################
+    # Calculation
+    ###################################################################################################################
+    # ==============================================================================
+    # Evaluation
+    # ==============================================================================
+    Y = np.full((len(X), len(out)), np.nan)
+    if W <= 1:
+        initSens(data, base, path)
+        for rows in tqdm(grp, desc='Sensitivity'):
+            try:
+                for (i, y) in calcGrp(rows):
+                    Y[i] = y
+            except Exception as e:
+                print("WARN: Evaluation of ", len(rows), " sample(s) failed (", repr(e), ")")
+    else:
+        with ProcessPoolExecutor(max_workers=W, initializer=initSens, initargs=(data, base, path)) as pool:
+            fut = {pool.submit(calcGrp, rows): rows for rows in grp}
+            for f in tqdm(as_completed(fut), total=len(fut), desc='Sensitivity'):
+                try:
+                    for (i, y) in f.result():
+                        Y[i] = y
+                except Exception as e:
+                    print("WARN: Evaluation of ", len(fut[f]), " sample(s) failed (", repr(e), ")")
+
+    # ==============================================================================
+    # Indices
+    # ==============================================================================
+    dataSens = {'met': met, 'par': par, 'out': out, 'lim': lim, 'X': X, 'Y': Y, 'nSim': len(grp)}
+    for k, y in enumerate(out):
+        dataSens[y] = calcIdx(Y[:, k], step, base)
+        if dataSens[y]['N'] < len(Y) / (len(par) + 2 if met == 'Sobol' else len(par) + 1):
+            print("WARN: Output ", y, " uses ", dataSens[y]['N'], " base samples or trajectories only")
+
+    ###################################################################################################################
+    # Post-Processing
+    ###################################################################################################################
+    if setup['Exp']['save'] == 1:
+        name = 'result_Sens_' + setup['Exp']['name'] + '_' + datetime.now().strftime("%d_%m_%Y_%H_%M_%S") + '.mat'
+        savemat(pjoin(path['resPath'], name), dataSens)
+        print("INFO: Sensitivity indices saved")
+
+    ###################################################################################################################
+    # MSG Out
+    ###################################################################################################################
+    idx = ['S1', 'ST'] if met == 'Sobol' else ['mu_star', 'sigma']
+    for y in out:
+        print("INFO: Output ", y)
+        for i, x in enumerate(par):
+            print("      ", x.ljust(16), "  ".join(z + " " + str(np.round(dataSens[y][z][i], 3)) + " [" +
+                                                 str(np.round(dataSens[y][z + '_ci'][0, i], 3)) + ", " +
+                                                 str(np.round(dataSens[y][z + '_ci'][1, i], 3)) + "]" for z in idx))
+    print("DONE: Sensitivity analysis")
+
+    ###################################################################################################################
+    # Return
+    ###################################################################################################################
+    return dataSens
+
+#######################################################################################################################
+# References
+#######################################################################################################################
+# Saltelli et al., Variance based sensitivity analysis of model output, Computer Physics Communications, 2010
+# Morris, Factorial sampling plans for preliminary computational experiments, Technometrics, 1991
@@ -17,12 +17,17 @@
 # Function Description
 #######################################################################################################################
 """
-This function calculates the thermal outputs of the drive train.
+This function calculates the thermal outputs of the drive train. The thermal model of the components is discretized
+with the bilinear or the exact (first-order hold) discretization (setup['Exp']['therDis'], see calcTher). The thermal
+nodes (GBX, EMA, INV, HVS, and coolant) can be updated at their own rate (multi-rate, setup['Exp']['therFs'] in Hz, 0:
+rate of the mission profile). A node with a lower rate is updated at the end of each macro step with the losses
+averaged over the macro step (trapezoidal) using the exact discretization, in between the temperature rise over the
+coolant is held. The coolant node is updated with the averaged heat fluxes and operating conditions of the macro step.
 
 Inputs:     1) iter:        iteration number
-            2) GBX:         GBX instance
-            3) EMA:         EMA instance
-            4) INV:         INV instance
+            2) GBX:         list of GBX instances (one per motor unit)
+            3) EMA:         list of EMA instances (one per motor unit)
+            4) INV:         list of INV instances (one per motor unit)
             5) HVS:         HVS instance
             6) VEH:         VEH instance
             7) data:        mission profile
@@ -48,6 +53,20 @@ import numpy as np
 #######################################################################################################################
 # Additional Functions
 #######################################################################################################################
+def getWin(iter, N, fs, rate):
+    # ==============================================================================
+    # Description
+    # ==============================================================================
+    """
+    This function returns the macro step of a thermal node (first sample, number of samples, and update flag). The
+    node is updated at the last sample of the macro step or the last sample of the mission profile.
+    """
+
+    m = max(1, int(round(fs / rate))) if rate > 0 else 1
+    s = iter - iter % m
+    n = iter - s + 1
+
+    return [s, n, m == 1 or n == m or iter == N - 1]
 
 
 #######################################################################################################################
@@ -61,6 +80,17 @@ def therSim(iter, GBX, EMA, INV, HVS, VEH, data, dataTime, setup):
     # Parameters
     # ==============================================================================
     Ts = 1 / setup['Dat']['fs']
+    N = len(data['t'])
+    Mot = setup['Par']['Mot']
+    dis = setup['Exp']['therDis']
+    comp = {'GBX': GBX, 'EMA': EMA, 'INV': INV}
+    win = {x: getWin(iter, N, setup['Dat']['fs'], setup['Exp']['therFs'][x]) for x in setup['Exp']['therFs']}
+
+    # ==============================================================================
+    # Sample (components and HVS in the ring buffer of the recording, see classRec)
+    # ==============================================================================
+    K = len(dataTime['HVS']['T'])
+    k = iter % K
 
     # ==============================================================================
     # Variables
@@ -73,39 +103,6 @@ def therSim(iter, GBX, EMA, INV, HVS, VEH, data, dataTime, setup):
     Vol = data['Vol_C'].to_numpy()[iter - 1]
     v = data['v'].to_numpy()[iter - 1]
 
-    # ------------------------------------------
-    # GBX
-    # ------------------------------------------
-    # Front
-    Pv_Gbx_F = dataTime['GBX']['F']['Pv']
-    T_Gbx_F = dataTime['GBX']['F']['T']
-
-    # Rear
-    Pv_Gbx_R = dataTime['GBX']['R']['Pv']
-    T_Gbx_R = dataTime['GBX']['R']['T']
-
-    # ------------------------------------------
-    # EMA
-    # ------------------------------------------
-    # Front
-    Pv_Ema_F = dataTime['EMA']['F']['Pv']
-    T_Ema_F = dataTime['EMA']['F']['T']
-
-    # Rear
-    Pv_Ema_R = dataTime['EMA']['R']['Pv']
-    T_Ema_R = dataTime['EMA']['R']['T']
-
-    # ------------------------------------------
-    # INV
-    # ------------------------------------------
-    # Front
-    Pv_Inv_F = dataTime['INV']['F']['Pv']
-    T_Inv_F = dataTime['INV']['F']['T']
-
-    # Rear
-    Pv_Inv_R = dataTime['INV']['R']['Pv']
-    T_Inv_R = dataTime['INV']['R']['T']
-
     # ------------------------------------------
     # HVS
     # ------------------------------------------
@@ -116,35 +113,50 @@ def therSim(iter, GBX, EMA, INV, HVS, VEH, data, dataTime, setup):
     # Calculation
     ###################################################################################################################
     # ==============================================================================
-    # GBX
-    # ==============================================================================
-    T_GBX_F = GBX.calc_therm(Ts, T_Gbx_F[iter - 1] - Tc, Pv_Gbx_F[iter - 1], Pv_Gbx_F[iter])
-    T_GBX_R = GBX.calc_therm(Ts, T_Gbx_R[iter - 1] - Tc, Pv_Gbx_R[iter - 1], Pv_Gbx_R[iter])
-
-    # ==============================================================================
-    # EMA
-    # ==============================================================================
-    T_EMA_F = EMA.calc_therm(Ts, T_Ema_F[iter - 1] - Tc, Pv_Ema_F[iter - 1], Pv_Ema_F[iter])
-    T_EMA_R = EMA.calc_therm(Ts, T_Ema_R[iter - 1] - Tc, Pv_Ema_R[iter - 1], Pv_Ema_R[iter])
-
-    # ==============================================================================
-    # INV
+    # GBX, EMA, and INV
     # ==============================================================================
-    T_INV_F = INV.calc_therm(Ts, T_Inv_F[iter - 1] - Tc, Pv_Inv_F[iter - 1], Pv_Inv_F[iter])
-    T_INV_R = INV.calc_therm(Ts, T_Inv_R[iter - 1] - Tc, Pv_Inv_R[iter - 1], Pv_Inv_R[iter])
+    dT = {'GBX': np.zeros(len(Mot)), 'EMA': np.zeros(len(Mot)), 'INV': np.zeros(len(Mot))}
+    for name in comp:
+        Pv = dataTime[name]['U']['Pv']
+        T = dataTime[name]['U']['T']
+        [s, n, upd] = win[name]
+        for u in range(len(Mot)):
+            if n == 1 and upd:
+                dT[name][u] = comp[name][u].calc_therm(Ts, T[k - 1, u] - Tc, Pv[k - 1, u], Pv[k, u], dis)
+            elif upd:
+                idx = np.arange(s - 1, iter + 1) % K
+                P = np.mean(0.5 * (Pv[idx[:-1], u] + Pv[idx[1:], u]))
+                dT[name][u] = comp[name][u].calc_therm(n * Ts, T[k - 1, u] - Tc, P, P, 2)
+            else:
+                dT[name][u] = T[k - 1, u] - Tc
 
     # ==============================================================================
     # HVS
     # ==============================================================================
-    T_HVS = HVS.calc_therm(Ts, T_Hvs[iter - 1] - Tc, Pv_Hvs[iter - 1], Pv_Hvs[iter])
+    [s, n, upd] = win['HVS']
+    if n == 1 and upd:
+        T_HVS = HVS.calc_therm(Ts, T_Hvs[k - 1] - Tc, Pv_Hvs[k - 1], Pv_Hvs[k], dis)
+    elif upd:
+        idx = np.arange(s - 1, iter + 1) % K
+        P = np.mean(0.5 * (Pv_Hvs[idx[:-1]] + Pv_Hvs[idx[1:]]))
+        T_HVS = HVS.calc_therm(n * Ts, T_Hvs[k - 1] - Tc, P, P, 2)
+    else:
+        T_HVS = T_Hvs[k - 1] - Tc
 
     # ==============================================================================
     # VEH
     # ==============================================================================
-    if setup['Exp']['Cool'] == 3:
-        [Tc, dQ] = VEH.calc_cool(Pv_Hvs[iter - 1], Pv_Inv_F[iter - 1] + Pv_Inv_R[iter - 1],
-                                 Pv_Ema_F[iter - 1] + Pv_Ema_R[iter - 1], Pv_Gbx_F[iter - 1] + Pv_Gbx_R[iter - 1],
-                                 v, Vol, Ta, Tc, Ts)
+    [s, n, upd] = win['VEH']
+    if setup['Exp']['Cool'] == 3 and upd:
+        idx = np.arange(s - 1, iter)
+        Pv = {}
+        for name in comp:
+            Pv[name] = np.mean(np.sum(dataTime[name]['U']['Pv'][idx % K], axis=1))
+        if n > 1:
+            [Ta, Vol, v] = [np.mean(data[x].to_numpy().ravel()[idx]) for x in ['T_A', 'Vol_C', 'v']]
+        [Tc, dQ] = VEH.calc_cool(np.mean(Pv_Hvs[idx % K]), Pv['INV'], Pv['EMA'], Pv['GBX'], v, Vol, Ta, Tc, n * Ts)
+    elif setup['Exp']['Cool'] == 3:
+        dQ = dataTime['VEH']['dQ'][iter - 1]
     else:
         dQ = 0
         Tc = dataTime['VEH']['Tc'][iter]
@@ -153,30 +165,15 @@ def therSim(iter, GBX, EMA, INV, HVS, VEH, data, dataTime, setup):
     # Post-Processing
     ###################################################################################################################
     # ==============================================================================
-    # EMA
-    # ==============================================================================
-    dataTime['GBX']['F']['T'][iter] = T_GBX_F + Tc
-    dataTime['GBX']['R']['T'][iter] = T_GBX_R + Tc
-    dataTime['GBX']['T']['T'][iter] = np.max((T_GBX_F, T_GBX_R)) + Tc
-
-    # ==============================================================================
-    # EMA
-    # ==============================================================================
-    dataTime['EMA']['F']['T'][iter] = T_EMA_F + Tc
-    dataTime['EMA']['R']['T'][iter] = T_EMA_R + Tc
-    dataTime['EMA']['T']['T'][iter] = np.max((T_EMA_F, T_EMA_R)) + Tc
-
-    # ==============================================================================
-    # INV
+    # GBX, EMA, and INV
     # ==============================================================================
-    dataTime['INV']['F']['T'][iter] = T_INV_F + Tc
-    dataTime['INV']['R']['T'][iter] = T_INV_R + Tc
-    dataTime['INV']['T']['T'][iter] = np.max((T_INV_F, T_INV_R)) + Tc
+    for name in comp:
+        dataTime[name]['U']['T'][k] = dT[name] + Tc
 
     # ==============================================================================
     # HVS
     # ==============================================================================
-    dataTime['HVS']['T'][iter] = T_HVS + Tc
+    dataTime['HVS']['T'][k] = T_HVS + Tc
 
     # ==============================================================================
     # VEH
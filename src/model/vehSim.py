@@ -56,24 +56,37 @@ def vehSim(iter, VEH, data, dataTime, setup):
     # ==============================================================================
     ang = data['ang'].values[iter]
 
+    # ==============================================================================
+    # Sample (components in the ring buffer of the recording, see classRec)
+    # ==============================================================================
+    k = iter % len(dataTime['HVS']['T'])
+
+    # ==============================================================================
+    # Motor Units
+    # ==============================================================================
+    Mot = setup['Par']['Mot']
+    i = np.array([unit['GBX']['i'] for unit in Mot])
+
     # ==============================================================================
     # Variables
     # ==============================================================================
     v = dataTime['VEH']['v'][iter]
-    M_EMA = dataTime['EMA']['T']['Msh'][iter]
+    M_EMA = np.sum(dataTime['EMA']['U']['Msh'][k])
+    M_WHE = np.sum(dataTime['EMA']['U']['Msh'][k] * i)
+    eta = np.mean(dataTime['GBX']['U']['eta'][k])
 
     ###################################################################################################################
     # Pre-Processing
     ###################################################################################################################
     if M_EMA > 0:
-        M = M_EMA * setup['Par']['GBX']['i'] * dataTime['GBX']['T']['eta'][iter]
-    elif M_EMA < 0 and dataTime['GBX']['T']['eta'][iter] > 0.1:
+        M = M_WHE * eta
+    elif M_EMA < 0 and eta > 0.1:
         if setup['Par']['xwd'] == 'FWD':
-            M = M_EMA * setup['Par']['GBX']['i'] / dataTime['GBX']['T']['eta'][iter] / setup['Par']['VEH']['d_b']
+            M = M_WHE / eta / setup['Par']['VEH']['d_b']
         elif setup['Par']['xwd'] == 'RWD':
-            M = M_EMA * setup['Par']['GBX']['i'] / dataTime['GBX']['T']['eta'][iter] / (1 - setup['Par']['VEH']['d_b'])
+            M = M_WHE / eta / (1 - setup['Par']['VEH']['d_b'])
         else:
-            M = M_EMA * setup['Par']['GBX']['i'] / dataTime['GBX']['T']['eta'][iter]
+            M = M_WHE / eta
     else:
         M = 0
 
@@ -89,53 +102,26 @@ def vehSim(iter, VEH, data, dataTime, setup):
     # GBX
     # ==============================================================================
     # ------------------------------------------
-    # Init
-    # ------------------------------------------
-    M_GBX = M / setup['Par']['GBX']['i']
-
-    # ------------------------------------------
-    # Accelerating
-    # ------------------------------------------
-    if M_EMA > 0:
-        if setup['Par']['xwd'] == 'RWD':
-            dataTime['GBX']['T']['M'][iter] = M_GBX
-            dataTime['GBX']['F']['M'][iter] = 0
-            dataTime['GBX']['R']['M'][iter] = M_GBX
-        elif setup['Par']['xwd'] == 'FWD':
-            dataTime['GBX']['T']['M'][iter] = M_GBX
-            dataTime['GBX']['F']['M'][iter] = M_GBX
-            dataTime['GBX']['R']['M'][iter] = 0
-        else:
-            dataTime['GBX']['T']['M'][iter] = M_GBX
-            dataTime['GBX']['F']['M'][iter] = M_GBX * setup['Par']['VEH']['d_a']
-            dataTime['GBX']['R']['M'][iter] = M_GBX * (1 - setup['Par']['VEH']['d_a'])
-
-    # ------------------------------------------
-    # Breaking
+    # Axle Distribution
     # ------------------------------------------
+    if setup['Par']['xwd'] == 'RWD':
+        frac = {'F': 0, 'R': 1}
+    elif setup['Par']['xwd'] == 'FWD':
+        frac = {'F': 1, 'R': 0}
+    elif M_EMA > 0:
+        frac = {'F': setup['Par']['VEH']['d_a'], 'R': 1 - setup['Par']['VEH']['d_a']}
     else:
-        if setup['Par']['xwd'] == 'RWD':
-            dataTime['GBX']['T']['M'][iter] = M_GBX
-            dataTime['GBX']['F']['M'][iter] = 0
-            dataTime['GBX']['R']['M'][iter] = M_GBX
-        elif setup['Par']['xwd'] == 'FWD':
-            dataTime['GBX']['T']['M'][iter] = M_GBX
-            dataTime['GBX']['F']['M'][iter] = M_GBX
-            dataTime['GBX']['R']['M'][iter] = 0
-        else:
-            dataTime['GBX']['T']['M'][iter] = M_GBX
-            dataTime['GBX']['F']['M'][iter] = M_GBX * setup['Par']['VEH']['d_b']
-            dataTime['GBX']['R']['M'][iter] = M_GBX * (1 - setup['Par']['VEH']['d_b'])
+        frac = {'F': setup['Par']['VEH']['d_b'], 'R': 1 - setup['Par']['VEH']['d_b']}
 
     # ------------------------------------------
-    # Power
+    # Torque and Power
     # ------------------------------------------
-    dataTime['GBX']['T']['Pout'][iter] = 2 * np.pi * dataTime['EMA']['T']['n'][iter] * dataTime['GBX']['T']['M'][iter]
-    dataTime['GBX']['F']['Pout'][iter] = 2 * np.pi * dataTime['EMA']['F']['n'][iter] * dataTime['GBX']['F']['M'][iter]
-    dataTime['GBX']['R']['Pout'][iter] = 2 * np.pi * dataTime['EMA']['R']['n'][iter] * dataTime['GBX']['R']['M'][iter]
-    dataTime['GBX']['T']['Pin'][iter] = dataTime['GBX']['T']['Pout'][iter] + dataTime['GBX']['T']['Pv'][iter]
-    dataTime['GBX']['F']['Pin'][iter] = dataTime['GBX']['F']['Pout'][iter] + dataTime['GBX']['F']['Pv'][iter]
-    dataTime['GBX']['R']['Pin'][iter] = dataTime['GBX']['R']['Pout'][iter] + dataTime['GBX']['R']['Pv'][iter]
+    for u in range(len(Mot)):
+        M_GBX = M * frac[Mot[u]['axle']] * Mot[u]['share'] / i[u]
+        P_GBX = 2 * np.pi * dataTime['EMA']['U']['n'][k, u] * M_GBX
+        dataTime['GBX']['U']['M'][k, u] = M_GBX
+        dataTime['GBX']['U']['Pout'][k, u] = P_GBX
+        dataTime['GBX']['U']['Pin'][k, u] = P_GBX + dataTime['GBX']['U']['Pv'][k, u]
 
     # ==============================================================================
     # Vehicle
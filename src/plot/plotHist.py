@@ -0,0 +1,128 @@
+#######################################################################################################################
+#######################################################################################################################
+# Title:        Python Electric Vehicle Power Toolkit (PyEVPowerKit)
+# Topic:        EV Modeling
+# File:         plotHist
+# Date:         18.03.2024
+# Author:       Dr. Pascal A. Schirmer
+# Version:      V.0.1
+# Copyright:    Pascal Schirmer
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+# Function Description
+#######################################################################################################################
+"""
+This function plots the load spectra (residence histograms, see classHist) of the first motor unit on the plotted axle.
+Inputs:     1) dataLife:    lifetime results including the load spectra ('HIST')
+            2) setup:       includes all simulation variables
+Outputs:    None
+"""
+
+#######################################################################################################################
+# Import libs
+#######################################################################################################################
+# ==============================================================================
+# Internal
+# ==============================================================================
+
+# ==============================================================================
+# External
+# ==============================================================================
+import matplotlib.pyplot as plt
+from matplotlib.colors import LogNorm
+import numpy as np
+
+#######################################################################################################################
+# Additional Functions
+#######################################################################################################################
+
+
+#######################################################################################################################
+# Main Function
+#######################################################################################################################
+def plotHist(dataLife, setup):
+    ###################################################################################################################
+    # MSG IN
+    ###################################################################################################################
+    print("INFO: Plotting Load Spectra")
+
+    ###################################################################################################################
+    # Initialisation
+    ###################################################################################################################
+    axis = setup['Exp']['plotAxis']
+    u = next((i for i, x in enumerate(setup['Par']['Mot']) if x['axle'] == axis), 0)
+    hist = dataLife['HIST']
+    res = [('EMA', 'nM', 'n (1/s)', 'M (Nm)'), ('GBX', 'nM', 'n (1/s)', 'M (Nm)'), ('INV', 'IT', 'Is (A)', 'T (degC)'),
+           ('HVS', 'IT', 'Idc (A)', 'T (degC)')]
+
+    ###################################################################################################################
+    # Figure Creation
+    ###################################################################################################################
+    fig, axs = plt.subplots(2, 3)
+
+    ###################################################################################################################
+    # Calculation
+    ###################################################################################################################
+    # ==============================================================================
+    # Residence
+    # ==============================================================================
+    for k, (comp, name, xlabel, ylabel) in enumerate(res):
+        x = hist[comp][name]
+        i = 0 if comp == 'HVS' else u
+        H = np.ma.masked_equal(x['H'][i].T, 0)
+        ax = axs[k // 2, k % 2]
+        if H.count() > 0:
+            img = ax.pcolormesh(x['edges'][0, i], x['edges'][1, i], H, norm=LogNorm(), shading='flat')
+            fig.colorbar(img, ax=ax, label='t (sec)')
+        ax.set_title(comp + ' Residence')
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        ax.grid(True)
+
+    # ==============================================================================
+    # Time at Temperature
+    # ==============================================================================
+    for comp in ['GBX', 'EMA']:
+        x = hist[comp]['T']
+        axs[0, 2].stairs(x['H'][u], x['edges'][0, u], label=comp)
+    for comp in ['INV', 'HVS']:
+        x = hist[comp]['IT']
+        i = 0 if comp == 'HVS' else u
+        axs[0, 2].stairs(np.sum(x['H'][i], axis=0), x['edges'][1, i], label=comp)
+    axs[0, 2].set_title('Time at Temperature')
+    axs[0, 2].set_xlabel('T (degC)')
+    axs[0, 2].set_ylabel('t (sec)')
+    axs[0, 2].legend()
+    axs[0, 2].grid(True)
+
+    # ==============================================================================
+    # Time at Current
+    # ==============================================================================
+    for comp in ['INV', 'HVS']:
+        x = hist[comp]['IT']
+        i = 0 if comp == 'HVS' else u
+        axs[1, 2].stairs(np.sum(x['H'][i], axis=1), x['edges'][0, i], label=comp)
+    axs[1, 2].set_title('Time at Current')
+    axs[1, 2].set_xlabel('I (A)')
+    axs[1, 2].set_ylabel('t (sec)')
+    axs[1, 2].legend()
+    axs[1, 2].grid(True)
+
+    ###################################################################################################################
+    # Post-Processing
+    ###################################################################################################################
+    plt.suptitle('Load Spectra of the Drive Train: ' + str(setup['Dat']['name']), size=18)
+
+    ###################################################################################################################
+    # Return
+    ###################################################################################################################
+    return []
+
+#######################################################################################################################
+# References
+#######################################################################################################################
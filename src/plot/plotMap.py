@@ -0,0 +1,99 @@
+#######################################################################################################################
+#######################################################################################################################
+# Title:        Python Electric Vehicle Power Toolkit (PyEVPowerKit)
+# Topic:        EV Modeling
+# File:         plotMap
+# Date:         18.03.2024
+# Author:       Dr. Pascal A. Schirmer
+# Version:      V.0.1
+# Copyright:    Pascal Schirmer
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+#######################################################################################################################
+
+#######################################################################################################################
+# Function Description
+#######################################################################################################################
+"""
+This function plots the efficiency maps of the machine, the inverter, and the combined drive (see genMap) over speed
+and torque for one DC-link voltage and temperature of the map.
+
+Inputs:     1) dataMap:     efficiency maps (genMap)
+            2) setup:       includes all simulation variables
+            3) iV:          index of the DC-link voltage of the map
+            4) iT:          index of the temperature of the map
+Outputs:    None
+
+"""
+
+#######################################################################################################################
+# Import libs
+#######################################################################################################################
+# ==============================================================================
+# Internal
+# ==============================================================================
+
+# ==============================================================================
+# External
+# ==============================================================================
+import matplotlib.pyplot as plt
+import numpy as np
+
+
+#######################################################################################################################
+# Additional Functions
+#######################################################################################################################
+
+
+#######################################################################################################################
+# Main Function
+#######################################################################################################################
+def plotMap(dataMap, setup, iV=0, iT=0):
+    ###################################################################################################################
+    # MSG IN
+    ###################################################################################################################
+    print("INFO: Plotting Efficiency Maps")
+
+    ###################################################################################################################
+    # Initialisation
+    ###################################################################################################################
+    [n, M] = np.meshgrid(dataMap['n'] * 60, dataMap['M'], indexing='ij')
+    eta = {'EMA': dataMap['EMA']['eta'][iV, iT] * 100, 'INV': dataMap['INV']['eta'][iV, iT] * 100,
+           'Drive': dataMap['EMA']['eta'][iV, iT] * dataMap['INV']['eta'][iV, iT] * 100}
+    Pv = {'EMA': dataMap['EMA']['Pv'][iV, iT], 'INV': dataMap['INV']['Pv'][iV, iT],
+          'Drive': dataMap['EMA']['Pv'][iV, iT] + dataMap['INV']['Pv'][iV, iT]}
+    lvl = [50, 70, 80, 85, 88, 90, 92, 94, 95, 96, 97, 98, 99, 100]
+
+    ###################################################################################################################
+    # Plotting
+    ###################################################################################################################
+    fig, axs = plt.subplots(1, 3, sharey=True)
+
+    for i, name in enumerate(eta):
+        # Efficiency
+        cs = axs[i].contourf(n, M, np.clip(eta[name], lvl[0], lvl[-1]), levels=lvl, cmap='viridis')
+        fig.colorbar(cs, ax=axs[i], label='Eta (%)')
+
+        # Losses
+        cl = axs[i].contour(n, M, Pv[name] / 1000, levels=8, colors='k', linewidths=0.5)
+        axs[i].clabel(cl, fmt='%.1f kW', fontsize=8)
+
+        # Axis
+        axs[i].grid(True)
+        axs[i].set_xlabel('n (rpm)')
+        axs[i].set_title(name + ' Efficiency')
+
+    axs[0].set_ylabel('M (Nm)')
+
+    # Layout adjustments
+    fig.suptitle("Efficiency Maps (Vdc = " + str(dataMap['Vdc'][iV]) + " V, T = " + str(dataMap['T'][iT]) + " degC)",
+                 size=18)
+    plt.subplots_adjust(hspace=0.35, wspace=0.35, left=0.075, right=0.925, top=0.85, bottom=0.1)
+
+    return []
+
+#######################################################################################################################
+# References
+#######################################################################################################################
@@ -42,6 +42,7 @@ from src.plot.plotPWR import plotPWR
 from src.plot.plotHVS import plotHVS
 from src.plot.plotMax import plotMax
 from src.plot.plotRelia import plotRelia
+from src.plot.plotHist import plotHist
 
 # ==============================================================================
 # External
@@ -129,6 +130,12 @@ def plotting(data, dataTime, dataLife, setup):
     if setup['Exp']['plot'] == 3:
         plotRelia(dataLife, setup)
 
+    # ==============================================================================
+    # Load Spectra
+    # ==============================================================================
+    if setup['Exp']['plot'] == 3 and 'HIST' in dataLife:
+        plotHist(dataLife, setup)
+
     # ==============================================================================
     # Max Overview
     # ==============================================================================
@@ -70,9 +70,81 @@ setup['Exp']['life'] = 131400
 setup['Exp']['SOC'] = 1                                                                                                  # Starting SOC value of the HVS (p.u.)
 setup['Exp']['Vdc'] = 3                                                                                                  # 1) constant nominal voltage, 2) measured voltage, 3) SOC based
 setup['Exp']['Cool'] = 3                                                                                                 # 1) constant coolant temperature, 2) measured coolant temperature, 3) calculated coolant temperature
+setup['Exp']['therDis'] = 1                                                                                              # 1) bilinear (Tustin) thermal discretization, 2) exact (first-order hold) discretization for coarse time steps
+setup['Exp']['therFs'] = {'GBX': 0, 'EMA': 0, 'INV': 0, 'HVS': 0, 'VEH': 0}                                              # update rate of the thermal nodes (Hz), 0) rate of the mission profile, macro steps use averaged losses
 setup['Exp']['Tc'] = 30                                                                                                  # Constant coolant temperature (degC)
 setup['Exp']['Ta'] = 20                                                                                                  # Constant ambient temperature (degC)
 setup['Exp']['lim'] = 1                                                                                                  # 0) component limits are not used (using Vdc=1000V), 1) component limits enforced, 2) enforce only voltage
+setup['Exp']['env'] = 1                                                                                                  # 0) torque limited by derating the solver, 1) torque clipped to the full-load envelope before solving
+setup['Exp']['envN'] = 101                                                                                               # number of speed nodes of the full-load torque envelope
+setup['Exp']['envDv'] = 10                                                                                               # DC-link voltage step of the stored full-load torque envelopes (V)
+setup['Exp']['envDt'] = 10                                                                                               # temperature step of the stored full-load torque envelopes (K)
+setup['Exp']['pss'] = 0                                                                                                  # 0) cycle starts at coolant temperature, 1) periodic steady-state (thermally settled start)
+setup['Exp']['pssTol'] = 0.01                                                                                            # tolerance of the periodic steady-state end-of-cycle state (temperatures in K, SOC in %)
+setup['Exp']['pssIter'] = 20                                                                                             # maximum number of coupled cycle passes of the periodic steady-state
+setup['Exp']['opc'] = 0                                                                                                  # 0) exact electrical solution, 1) operating-point clustering (machine solved at grid representatives)
+setup['Exp']['opcDn'] = 5                                                                                                # grid step of the machine speed (1/s)
+setup['Exp']['opcDm'] = 10                                                                                               # grid step of the machine torque (Nm)
+setup['Exp']['opcDv'] = 20                                                                                               # grid step of the DC-link voltage (V)
+setup['Exp']['opcDt'] = 20                                                                                               # grid step of the machine temperature (K)
+setup['Exp']['opcRep'] = 0                                                                                               # 0) sampled accuracy report (about 200 samples), 1) full accuracy report, energy and loss error versus the exact solution
+setup['Exp']['fid'] = 2                                                                                                  # 1) map-based quasi-static (energy consumption only, maps cached in \results\cache), 2) time-domain simulation, 3) performance test (acceleration and top speed), 4) forward simulation (driver model)
+setup['Exp']['mapN'] = 41                                                                                                # number of map nodes per axis (speed and torque) of the map-based simulation
+setup['Exp']['mapVdc'] = []                                                                                              # DC-link voltages of the efficiency maps (V), empty: nominal voltage
+setup['Exp']['mapT'] = []                                                                                                # temperatures of the efficiency maps (degC), empty: coolant temperature
+setup['Exp']['mapWorker'] = 4                                                                                            # number of worker processes of the efficiency map generation (1: sequential)
+setup['Exp']['mapRef'] = 0                                                                                               # 0) uniform map grid, 1) adaptive quadtree refinement of the efficiency maps
+setup['Exp']['mapTol'] = 0.01                                                                                            # tolerance of the adaptive refinement (p.u.), max. relative interpolation error of the EMA and INV input power and losses
+setup['Exp']['perfV'] = [50, 100, 150]                                                                                   # target speeds of the performance test (km/h), acceleration times from standstill
+setup['Exp']['perfEnd'] = 0.99                                                                                           # end of the performance test (p.u. of the top speed)
+setup['Exp']['perfWorker'] = 4                                                                                           # number of worker processes of the performance test batch (1: sequential)
+setup['Exp']['drvKp'] = 0.5                                                                                              # proportional gain of the driver model of the forward simulation (1/s)
+setup['Exp']['drvKi'] = 0.05                                                                                             # integral gain of the driver model of the forward simulation (1/s2)
+setup['Exp']['drvTol'] = 2                                                                                               # speed tolerance of the forward simulation (km/h), cycle is followed if the error stays below
+
+# ------------------------------------------
+# Reliability
+# ------------------------------------------
+setup['Exp']['mc'] = 0                                                                                                   # 0) system Monte-Carlo lifetime disabled, 1) enabled
+setup['Exp']['mcN'] = 1e6                                                                                                # number of Monte-Carlo samples of the drive-train lifetime
+setup['Exp']['mcBx'] = 0.1                                                                                               # failure quantile of the system lifetime (p.u.)
+setup['Exp']['mcSeed'] = 0                                                                                               # seed of the Monte-Carlo sampling
+setup['Exp']['mcWorker'] = 4                                                                                             # number of worker processes (1: sequential)
+setup['Exp']['cache'] = 0                                                                                                # 0) no caching, 1) per-cycle damage cached in \results\cache for mission mixes (reliaMix)
+setup['Exp']['hist'] = 0                                                                                                 # 0) load spectra disabled, 1) residence histograms (speed-torque, current-temperature) saved with the lifetime
+setup['Exp']['histN'] = 50                                                                                               # number of bins per axis of the load spectra
+
+# ------------------------------------------
+# Fleet
+# ------------------------------------------
+setup['Exp']['fleetDir'] = ''                                                                                            # folder of the trips of the fleet (relative to \data), all .xlsx files are simulated (startFleet)
+setup['Exp']['fleetWorker'] = 4                                                                                          # number of worker processes of the fleet simulation (1: sequential)
+setup['Exp']['fleetDt'] = 0.1                                                                                            # resolution of the temperature quantile sketches of the fleet report (K)
+setup['Exp']['fleetQ'] = [0.5, 0.95, 0.99]                                                                               # temperature quantiles of the fleet report (p.u.)
+
+# ------------------------------------------
+# Sensitivity
+# ------------------------------------------
+setup['Exp']['sensPar'] = {}                                                                                             # parameters and ranges relative to the setup file, e.g. {'VEH/c_w': [0.9, 1.1], 'INV/Ea': [0.8, 1.2]} (startSens)
+setup['Exp']['sensOut'] = ['eta']                                                                                        # outputs of the sensitivity analysis (KPI names of the run catalog, e.g. 'eta', 'Tmax_INV', 'L_INV_Cof')
+setup['Exp']['sensMet'] = 1                                                                                              # 1) Sobol indices (Saltelli sampling), 2) Morris elementary effects
+setup['Exp']['sensN'] = 64                                                                                               # number of base samples (Sobol, rounded up to a power of two) or trajectories (Morris)
+setup['Exp']['sensBoot'] = 1000                                                                                          # number of bootstrap resamples of the confidence intervals (95 %)
+setup['Exp']['sensWorker'] = 4                                                                                           # number of worker processes of the sensitivity analysis (1: sequential)
+setup['Exp']['sensSeed'] = 0                                                                                             # seed of the sampling and bootstrapping
+
+# ------------------------------------------
+# Optimisation
+# ------------------------------------------
+setup['Exp']['optPar'] = {}                                                                                              # design parameters and bounds [lower, upper, step (0: continuous)], e.g. {'GBX/i': [7, 11, 0], 'INV/nSw': [1, 3, 1]} (startOpt)
+setup['Exp']['optObj'] = ['eta', 'cost']                                                                                 # objectives (KPI names of the run catalog or 'cost'), minimised or maximised with a leading '-', e.g. '-L_INV_Cof'
+setup['Exp']['optCost'] = {}                                                                                             # cost proxy as weights of the design parameters, e.g. {'HVS/E_bat': 1, 'INV/nSw': 20}
+setup['Exp']['optCon'] = {}                                                                                              # constraints on KPIs, e.g. {'t_100': ['<', 6.5], 'SOC': ['>', 0.2]}
+setup['Exp']['optTher'] = 1                                                                                              # 0) no thermal constraint, 1) peak temperatures below the component limits (time-domain simulation only)
+setup['Exp']['optPop'] = 16                                                                                              # population size of the optimisation (designs per generation)
+setup['Exp']['optGen'] = 10                                                                                              # number of generations of the optimisation
+setup['Exp']['optWorker'] = 4                                                                                            # number of worker processes of the optimisation (1: sequential)
+setup['Exp']['optSeed'] = 0                                                                                              # seed of the optimisation
 
 # ------------------------------------------
 # Plotting
@@ -84,6 +156,8 @@ setup['Exp']['plotAxis'] = 'R'
 # Saving
 # ------------------------------------------
 setup['Exp']['save'] = 0                                                                                                 # 0) files are not saved, 2) files are saved in \results
+setup['Exp']['rec'] = 0                                                                                                  # 0) results stored at the sampling rate, 1) decimated recording (window mean, min, and max)
+setup['Exp']['recFs'] = 1                                                                                                # output rate of the decimated recording (Hz), windows of fs/recFs samples
 
 # ==============================================================================
 # Data
@@ -97,6 +171,7 @@ setup['Dat']['fs'] = 10
 # Architecture
 # ------------------------------------------
 setup['Par']['xwd'] = 'RWD'                                                                                              # Number of wheels connected to the drive-train: 1) RWD, 2) FWD, 3) AWD
+setup['Par']['Mot'] = []                                                                                                 # Motor units, e.g. [{'axle': 'R', 'share': 0.5, 'INV': {'nSw': 2}}, ...], empty: one unit per driven axle
 
 # ------------------------------------------
 # Physical